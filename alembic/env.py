@@ -23,6 +23,19 @@ config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 target_metadata = Base.metadata
 
+# Objetos criados apenas pelas migrações, sem mapeamento nos modelos
+OBJETOS_NAO_MAPEADOS = {"busca", "ix_itens_busca"}
+
+
+def include_object(objeto, nome, tipo, refletido, comparado_com) -> bool:
+    """
+    Impede que o autogenerate remova objetos não mapeados nos modelos.
+    """
+    return not (
+        refletido and comparado_com is None and
+        nome in OBJETOS_NAO_MAPEADOS
+    )
+
 
 def run_migrations_offline() -> None:
     """
@@ -34,6 +47,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -52,7 +66,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,64 @@
+"""Criação das tabelas
+
+Revision ID: 2f6a4ac670d4
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6a4ac670d4'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'itens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(), nullable=False),
+        sa.Column('descricao', sa.String(), nullable=False),
+        sa.Column('preco', sa.Float(), nullable=False),
+        sa.Column('categoria', sa.String(), nullable=False),
+        sa.Column('url_imagem', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_itens_id'), 'itens', ['id'], unique=False)
+    op.create_table(
+        'pedidos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('preco_total', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pedidos_id'), 'pedidos', ['id'], unique=False)
+    op.create_table(
+        'pedido_itens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('pedido_id', sa.Integer(), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['itens.id'], ),
+        sa.ForeignKeyConstraint(['pedido_id'], ['pedidos.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_pedido_itens_id'), 'pedido_itens', ['id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pedido_itens_id'), table_name='pedido_itens')
+    op.drop_table('pedido_itens')
+    op.drop_index(op.f('ix_pedidos_id'), table_name='pedidos')
+    op.drop_table('pedidos')
+    op.drop_index(op.f('ix_itens_id'), table_name='itens')
+    op.drop_table('itens')
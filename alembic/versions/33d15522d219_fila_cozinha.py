@@ -0,0 +1,50 @@
+"""Enum de status dos pedidos e índice parcial da fila da cozinha
+
+Revision ID: 33d15522d219
+Revises: f54ea5b6ab1c
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '33d15522d219'
+down_revision: Union[str, None] = 'f54ea5b6ab1c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUS_PEDIDO = sa.Enum(
+    'PRE-PEDIDO', 'PENDENTE', 'ENTREGUE', 'CANCELADO', name='status_pedido'
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    STATUS_PEDIDO.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        'pedidos', 'status',
+        type_=STATUS_PEDIDO,
+        existing_nullable=False,
+        postgresql_using='status::status_pedido'
+    )
+    op.create_index(
+        'ix_pedidos_ativos', 'pedidos', ['id'], unique=False,
+        postgresql_where=sa.text("status IN ('PRE-PEDIDO', 'PENDENTE')")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pedidos_ativos', table_name='pedidos')
+    op.alter_column(
+        'pedidos', 'status',
+        type_=sa.String(),
+        existing_type=STATUS_PEDIDO,
+        existing_nullable=False,
+        postgresql_using='status::text'
+    )
+    STATUS_PEDIDO.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""Resumo das categorias do cardápio
+
+Revision ID: 5c3a9e71d2b8
+Revises: 8e1f4c27a9d3
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c3a9e71d2b8'
+down_revision: Union[str, None] = '8e1f4c27a9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'categorias_resumo',
+        sa.Column('categoria', sa.String(), nullable=False),
+        sa.Column('quantidade_itens', sa.Integer(), nullable=False),
+        sa.Column('preco_minimo', sa.Float(), nullable=False),
+        sa.Column('preco_maximo', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('categoria')
+    )
+    # Resume as categorias dos itens já cadastrados
+    op.execute(
+        'INSERT INTO categorias_resumo '
+        '(categoria, quantidade_itens, preco_minimo, preco_maximo) '
+        'SELECT categoria_normalizada, count(*), min(preco), max(preco) '
+        'FROM itens GROUP BY categoria_normalizada'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('categorias_resumo')
@@ -0,0 +1,62 @@
+"""Nome e preço em centavos registrados nas linhas dos pedidos
+
+Revision ID: 66b115ca80fd
+Revises: 33d15522d219
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '66b115ca80fd'
+down_revision: Union[str, None] = '33d15522d219'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'pedido_itens', sa.Column('nome', sa.String(), nullable=True)
+    )
+    op.add_column(
+        'pedido_itens',
+        sa.Column('preco_unitario_centavos', sa.Integer(), nullable=True)
+    )
+    # Registra o nome e o preço atuais dos itens nos pedidos existentes
+    op.execute(
+        'UPDATE pedido_itens SET nome = itens.nome, '
+        'preco_unitario_centavos = round(itens.preco * 100) '
+        'FROM itens WHERE itens.id = pedido_itens.item_id'
+    )
+    op.alter_column('pedido_itens', 'nome', nullable=False)
+    op.alter_column(
+        'pedido_itens', 'preco_unitario_centavos', nullable=False
+    )
+    op.add_column(
+        'pedido_itens',
+        sa.Column(
+            'subtotal_centavos', sa.Integer(),
+            sa.Computed(
+                'quantidade * preco_unitario_centavos', persisted=True
+            ),
+            nullable=True
+        )
+    )
+    # Recalcula os totais em centavos, sem erros de arredondamento
+    op.execute(
+        'UPDATE pedidos SET preco_total = ('
+        'SELECT coalesce(sum(subtotal_centavos), 0) / 100.0 '
+        'FROM pedido_itens WHERE pedido_itens.pedido_id = pedidos.id)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('pedido_itens', 'subtotal_centavos')
+    op.drop_column('pedido_itens', 'preco_unitario_centavos')
+    op.drop_column('pedido_itens', 'nome')
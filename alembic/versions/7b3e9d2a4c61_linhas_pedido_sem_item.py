@@ -0,0 +1,48 @@
+"""Linhas dos pedidos permanecem quando o item é removido
+
+Revision ID: 7b3e9d2a4c61
+Revises: d41b7f08e6c5
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d2a4c61'
+down_revision: Union[str, None] = 'd41b7f08e6c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'pedido_itens', 'item_id', existing_type=sa.Integer(), nullable=True
+    )
+    op.drop_constraint(
+        'pedido_itens_item_id_fkey', 'pedido_itens', type_='foreignkey'
+    )
+    op.create_foreign_key(
+        'pedido_itens_item_id_fkey', 'pedido_itens', 'itens',
+        ['item_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'pedido_itens_item_id_fkey', 'pedido_itens', type_='foreignkey'
+    )
+    op.create_foreign_key(
+        'pedido_itens_item_id_fkey', 'pedido_itens', 'itens',
+        ['item_id'], ['id']
+    )
+    # Linhas de itens removidos não cabem na coluna obrigatória
+    op.execute('DELETE FROM pedido_itens WHERE item_id IS NULL')
+    op.alter_column(
+        'pedido_itens', 'item_id', existing_type=sa.Integer(), nullable=False
+    )
@@ -0,0 +1,67 @@
+"""Data dos pedidos, categoria nas linhas e resumos de vendas diárias
+
+Revision ID: 8e1f4c27a9d3
+Revises: 66b115ca80fd
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1f4c27a9d3'
+down_revision: Union[str, None] = '66b115ca80fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Os pedidos existentes não têm data: recebem a data da migração
+    op.add_column(
+        'pedidos',
+        sa.Column(
+            'criado_em', sa.DateTime(timezone=True), nullable=False,
+            server_default=sa.func.now()
+        )
+    )
+    op.alter_column('pedidos', 'criado_em', server_default=None)
+
+    op.add_column(
+        'pedido_itens', sa.Column('categoria', sa.String(), nullable=True)
+    )
+    op.execute(
+        'UPDATE pedido_itens SET categoria = itens.categoria_normalizada '
+        'FROM itens WHERE itens.id = pedido_itens.item_id'
+    )
+    op.alter_column('pedido_itens', 'categoria', nullable=False)
+
+    # Preenchidos pelo comando python -m src.menu.sales
+    op.create_table(
+        'vendas_diarias_itens',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('receita_centavos', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dia', 'item_id')
+    )
+    op.create_table(
+        'vendas_diarias_categorias',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('categoria', sa.String(), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('receita_centavos', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dia', 'categoria')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('vendas_diarias_categorias')
+    op.drop_table('vendas_diarias_itens')
+    op.drop_column('pedido_itens', 'categoria')
+    op.drop_column('pedidos', 'criado_em')
@@ -0,0 +1,29 @@
+"""Variantes das imagens dos itens
+
+Revision ID: abaeeefeb666
+Revises: cd622f3205b6
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'abaeeefeb666'
+down_revision: Union[str, None] = 'cd622f3205b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # URLs das variantes por tamanho e formato, preenchidas após o envio
+    op.add_column('itens', sa.Column('imagens', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('itens', 'imagens')
@@ -0,0 +1,48 @@
+"""Categoria normalizada e índices de busca por categoria
+
+Revision ID: b9e4ef71906b
+Revises: 2f6a4ac670d4
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4ef71906b'
+down_revision: Union[str, None] = '2f6a4ac670d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column(
+        'itens',
+        sa.Column(
+            'categoria_normalizada',
+            sa.String(),
+            sa.Computed('lower(trim(categoria))', persisted=True),
+        )
+    )
+    op.create_index(
+        'ix_itens_categoria_normalizada', 'itens',
+        ['categoria_normalizada'], unique=False
+    )
+    op.create_index(
+        'ix_itens_categoria_normalizada_trgm', 'itens',
+        ['categoria_normalizada'], unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'categoria_normalizada': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_itens_categoria_normalizada_trgm', table_name='itens')
+    op.drop_index('ix_itens_categoria_normalizada', table_name='itens')
+    op.drop_column('itens', 'categoria_normalizada')
@@ -0,0 +1,47 @@
+"""Busca textual em nome e descrição dos itens
+
+Revision ID: cc0b9cfd22af
+Revises: b9e4ef71906b
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cc0b9cfd22af'
+down_revision: Union[str, None] = 'b9e4ef71906b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.execute(
+        'CREATE TEXT SEARCH CONFIGURATION portugues_sem_acento '
+        '(COPY = portuguese)'
+    )
+    op.execute(
+        'ALTER TEXT SEARCH CONFIGURATION portugues_sem_acento '
+        'ALTER MAPPING FOR hword, hword_part, word '
+        'WITH unaccent, portuguese_stem'
+    )
+    op.execute(
+        "ALTER TABLE itens ADD COLUMN busca tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('portugues_sem_acento', "
+        "coalesce(nome, '')), 'A') || "
+        "setweight(to_tsvector('portugues_sem_acento', "
+        "coalesce(descricao, '')), 'B')"
+        ") STORED"
+    )
+    op.execute('CREATE INDEX ix_itens_busca ON itens USING gin (busca)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP INDEX ix_itens_busca')
+    op.execute('ALTER TABLE itens DROP COLUMN busca')
+    op.execute('DROP TEXT SEARCH CONFIGURATION portugues_sem_acento')
@@ -0,0 +1,55 @@
+"""Índices e restrição única em pedido_itens
+
+Revision ID: cd622f3205b6
+Revises: cc0b9cfd22af
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cd622f3205b6'
+down_revision: Union[str, None] = 'cc0b9cfd22af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Junta linhas duplicadas do mesmo item no mesmo pedido antes de
+    # criar a restrição única, somando as quantidades na linha mais antiga
+    op.execute(
+        'UPDATE pedido_itens SET quantidade = duplicados.total '
+        'FROM ('
+        '    SELECT min(id) AS id, sum(quantidade) AS total '
+        '    FROM pedido_itens '
+        '    GROUP BY pedido_id, item_id '
+        '    HAVING count(*) > 1'
+        ') AS duplicados '
+        'WHERE pedido_itens.id = duplicados.id'
+    )
+    op.execute(
+        'DELETE FROM pedido_itens AS repetido '
+        'USING pedido_itens AS original '
+        'WHERE repetido.pedido_id = original.pedido_id '
+        'AND repetido.item_id = original.item_id '
+        'AND repetido.id > original.id'
+    )
+    op.create_unique_constraint(
+        'uq_pedido_itens_pedido_item', 'pedido_itens',
+        ['pedido_id', 'item_id']
+    )
+    op.create_index(
+        'ix_pedido_itens_item_id', 'pedido_itens', ['item_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pedido_itens_item_id', table_name='pedido_itens')
+    op.drop_constraint(
+        'uq_pedido_itens_pedido_item', 'pedido_itens', type_='unique'
+    )
@@ -0,0 +1,43 @@
+"""Chaves de idempotência dos pedidos
+
+Revision ID: d41b7f08e6c5
+Revises: 5c3a9e71d2b8
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41b7f08e6c5'
+down_revision: Union[str, None] = '5c3a9e71d2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'chaves_idempotencia',
+        sa.Column('chave', sa.String(), nullable=False),
+        sa.Column('impressao', sa.String(), nullable=False),
+        sa.Column('pedido_id', sa.Integer(), nullable=True),
+        sa.Column('criado_em', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('chave')
+    )
+    op.create_index(
+        op.f('ix_chaves_idempotencia_criado_em'), 'chaves_idempotencia',
+        ['criado_em'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_chaves_idempotencia_criado_em'),
+        table_name='chaves_idempotencia'
+    )
+    op.drop_table('chaves_idempotencia')
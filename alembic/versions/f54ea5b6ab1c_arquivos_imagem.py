@@ -0,0 +1,38 @@
+"""Contagem de referências dos arquivos de imagem
+
+Revision ID: f54ea5b6ab1c
+Revises: abaeeefeb666
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f54ea5b6ab1c'
+down_revision: Union[str, None] = 'abaeeefeb666'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'arquivos_imagem',
+        sa.Column('caminho', sa.String(), nullable=False),
+        sa.Column('referencias', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('caminho')
+    )
+    # Conta as referências das imagens já cadastradas
+    op.execute(
+        'INSERT INTO arquivos_imagem (caminho, referencias) '
+        'SELECT url_imagem, count(*) FROM itens GROUP BY url_imagem'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('arquivos_imagem')
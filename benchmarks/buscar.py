@@ -0,0 +1,78 @@
+"""
+Benchmark da busca textual de itens (``search_items``).
+
+No PostgreSQL mede a consulta sobre a coluna tsvector com índice GIN; nos
+demais bancos, o índice invertido em memória.
+
+Uso:
+    python -m benchmarks.buscar --itens 100000
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+# Imports de terceiros
+from sqlalchemy import insert
+
+# Imports locais
+from benchmarks.dados import CATEGORIAS, criar_schema
+from core.database import SessionLocal, engine
+from src.menu.crud import search_items
+from src.menu.models import ItemModel
+
+PALAVRAS = [
+    "frango", "carne", "peixe", "queijo", "tomate", "limão", "açaí",
+    "chocolate", "batata", "arroz", "feijão", "salada", "molho", "picanha",
+    "camarão", "cebola", "alho", "manjericão", "milho", "bacon",
+]
+BUSCAS = ["frango", "limao", "queijo bacon", "camarão alho", "inexistente"]
+
+
+async def main(quantidade: int, repeticoes: int):
+    await criar_schema()
+
+    async with SessionLocal() as db:
+        for inicio in range(0, quantidade, 10_000):
+            await db.execute(
+                insert(ItemModel),
+                [
+                    {
+                        "nome": " ".join(random.sample(PALAVRAS, 2)),
+                        "descricao": " ".join(random.sample(PALAVRAS, 6)),
+                        "preco": round(random.uniform(5, 80), 2),
+                        "categoria": random.choice(CATEGORIAS),
+                        "url_imagem": "static/images/item.png",
+                    }
+                    for _ in range(min(10_000, quantidade - inicio))
+                ]
+            )
+        await db.commit()
+
+    print(f"banco: {engine.dialect.name}")
+
+    for texto in BUSCAS:
+        tempos = []
+        for _ in range(repeticoes):
+            async with SessionLocal() as db:
+                inicio = time.perf_counter()
+                await search_items(db, texto)
+                tempos.append((time.perf_counter() - inicio) * 1000)
+
+        print(
+            f"{texto:<16} mediana {statistics.median(tempos):>8.2f} ms   "
+            f"máx {max(tempos):>8.2f} ms"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--itens", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.itens, args.repeticoes))
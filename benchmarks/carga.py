@@ -0,0 +1,235 @@
+"""
+Teste de carga das rotas principais de ``/cardapio``.
+
+Popula o banco configurado em ``DATABASE_URL`` (PostgreSQL ou SQLite) com
+um cardápio e um histórico de pedidos sintéticos e executa, para cada
+cenário, ``--requisicoes`` requisições com ``--concorrencia`` clientes
+simultâneos, informando a vazão e os percentis p50/p95/p99 da latência.
+
+Por padrão as requisições são feitas à aplicação no próprio processo
+(ASGI, sem rede). Com ``--url`` são feitas a um servidor em execução, que
+deve usar o mesmo banco de ``DATABASE_URL``.
+
+A carga é reproduzível: os dados e as requisições usam ``--semente``.
+Com ``--saida`` os resultados são gravados em JSON, para comparar
+execuções.
+
+Uso:
+    python -m benchmarks.carga --concorrencia 20 --requisicoes 2000
+    python -m benchmarks.carga --cenarios fazer_pedido atualizar_pedido \\
+        --url http://localhost:8080 --sem-popular
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import time
+
+# Imports de terceiros
+import httpx
+
+# Imports locais
+from benchmarks.dados import (criar_schema, popular_itens,
+                              popular_itens_pedidos, popular_pedidos,
+                              recalcular_totais)
+from core.database import SessionLocal, engine
+from src.menu.schemas import StatusPedido
+
+
+class Carga:
+    """
+    Gera as requisições dos cenários a partir dos dados populados.
+
+    A popularidade dos itens segue uma distribuição de Zipf: poucos itens
+    aparecem na maior parte dos pedidos, como em um cardápio real.
+    """
+    def __init__(self, itens: int, pedidos: int, semente: int):
+        self.aleatorio = random.Random(semente)
+        self.itens = list(range(1, itens + 1))
+        self.pesos = [1 / posicao for posicao in self.itens]
+        self.pedidos = pedidos
+
+    def itens_pedido(self) -> list[int]:
+        return self.aleatorio.choices(
+            self.itens, self.pesos, k=self.aleatorio.randint(1, 6)
+        )
+
+    def pedido_existente(self) -> int:
+        return self.aleatorio.randint(1, self.pedidos)
+
+    def fazer_pedido(self) -> tuple:
+        return (
+            "POST", "/cardapio/fazer_pedido",
+            {
+                "params": {"status": StatusPedido.PENDENTE.value},
+                "json": {"itens": self.itens_pedido()},
+            }
+        )
+
+    def obter_cardapio(self) -> tuple:
+        return "GET", "/cardapio/obter_cardapio", {}
+
+    def obter_detalhes_pedido(self) -> tuple:
+        return (
+            "GET",
+            f"/cardapio/obter_detalhes_pedido/{self.pedido_existente()}",
+            {}
+        )
+
+    def atualizar_pedido(self) -> tuple:
+        return (
+            "PUT", f"/cardapio/atualizar_pedido/{self.pedido_existente()}",
+            {"json": {"itens": self.itens_pedido()}}
+        )
+
+
+CENARIOS = [
+    "fazer_pedido", "obter_cardapio", "obter_detalhes_pedido",
+    "atualizar_pedido",
+]
+
+
+async def popular(itens: int, pedidos: int, por_pedido: int, semente: int):
+    """
+    Recria o schema e insere o cardápio e o histórico de pedidos.
+    """
+    random.seed(semente)
+    await criar_schema()
+
+    async with SessionLocal() as db:
+        ids = await popular_itens(db, itens)
+        await popular_pedidos(db, pedidos)
+        await popular_itens_pedidos(
+            db, pedidos, ids, min(por_pedido, itens), quantidade_maxima=3
+        )
+        await recalcular_totais(db)
+
+
+async def executar(
+        cliente: httpx.AsyncClient,
+        gerar,
+        requisicoes: int,
+        concorrencia: int
+) -> dict:
+    """
+    Executa ``requisicoes`` requisições geradas por ``gerar`` com
+    ``concorrencia`` clientes simultâneos.
+
+    Returns:
+        dict: Vazão, erros e percentis da latência (ms).
+    """
+    restantes = itertools.count()
+    latencias = []
+    erros = 0
+
+    async def cliente_simulado():
+        nonlocal erros
+        while next(restantes) < requisicoes:
+            metodo, url, argumentos = gerar()
+            inicio = time.perf_counter()
+            try:
+                resposta = await cliente.request(metodo, url, **argumentos)
+            except Exception:
+                # Falhas de conexão ou exceções da aplicação (ASGI)
+                erros += 1
+                continue
+
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if resposta.status_code >= 400:
+                erros += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente_simulado() for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+
+    percentis = statistics.quantiles(latencias, n=100, method="inclusive")
+
+    return {
+        "requisicoes": len(latencias),
+        "erros": erros,
+        "vazao": len(latencias) / duracao,
+        "p50": percentis[49],
+        "p95": percentis[94],
+        "p99": percentis[98],
+    }
+
+
+async def main(args):
+    if not args.sem_popular:
+        await popular(args.itens, args.pedidos, args.por_pedido, args.semente)
+
+    if args.url:
+        cliente = httpx.AsyncClient(
+            base_url=args.url,
+            limits=httpx.Limits(max_connections=args.concorrencia),
+            timeout=60,
+        )
+    else:
+        # Importada aqui para usar o banco de DATABASE_URL já populado
+        from main import app
+
+        cliente = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://carga", timeout=60,
+        )
+
+    carga = Carga(args.itens, args.pedidos, args.semente)
+    resultados = {}
+
+    print(
+        f"{'cenário':<22} {'req':>6} {'erros':>6} {'req/s':>8} "
+        f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}"
+    )
+
+    async with cliente:
+        for cenario in args.cenarios:
+            gerar = getattr(carga, cenario)
+
+            # Aquecimento (conexões, cache do cardápio)
+            await executar(cliente, gerar, args.concorrencia * 2,
+                           args.concorrencia)
+
+            resultado = await executar(
+                cliente, gerar, args.requisicoes, args.concorrencia
+            )
+            resultados[cenario] = resultado
+
+            print(
+                f"{cenario:<22} {resultado['requisicoes']:>6} "
+                f"{resultado['erros']:>6} {resultado['vazao']:>8.1f} "
+                f"{resultado['p50']:>9.2f} {resultado['p95']:>9.2f} "
+                f"{resultado['p99']:>9.2f}"
+            )
+
+    await engine.dispose()
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(
+                {"parametros": vars(args), "resultados": resultados},
+                arquivo, indent=2, ensure_ascii=False
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS,
+                        default=CENARIOS)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    parser.add_argument("--requisicoes", type=int, default=1000)
+    parser.add_argument("--itens", type=int, default=200)
+    parser.add_argument("--pedidos", type=int, default=50_000)
+    parser.add_argument("--por-pedido", type=int, default=4)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--url", help="URL de um servidor em execução")
+    parser.add_argument("--sem-popular", action="store_true",
+                        help="Usa os dados já existentes no banco")
+    parser.add_argument("--saida", help="Arquivo JSON com os resultados")
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""
+Benchmark da busca por categoria em um cardápio grande: ``ilike '%...%'``
+na coluna original x busca exata e aproximada em categoria_normalizada.
+
+No PostgreSQL imprime também o plano de execução de cada consulta.
+
+Uso:
+    python -m benchmarks.categoria --itens 100000
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import statistics
+import time
+
+# Imports de terceiros
+from sqlalchemy import select, text
+
+# Imports locais
+from benchmarks.dados import criar_schema, popular_itens
+from core.database import SessionLocal, engine
+from src.menu.models import ItemModel
+
+# Muitas categorias distintas, como em um catálogo de várias lojas
+CATEGORIAS = [f"Categoria {indice:03d}" for indice in range(500)]
+
+
+async def medir(db, nome: str, consulta, repeticoes: int):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        (await db.scalars(consulta)).all()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    print(f"{nome:<28} {statistics.median(tempos):>10.2f} ms")
+
+    if engine.dialect.name == "postgresql":
+        sql = consulta.compile(
+            engine.sync_engine, compile_kwargs={"literal_binds": True}
+        )
+        plano = await db.execute(text(f"EXPLAIN ANALYZE {sql}"))
+        for linha in plano.scalars():
+            print(f"    {linha}")
+
+
+async def main(quantidade: int, repeticoes: int):
+    await criar_schema()
+
+    async with SessionLocal() as db:
+        await popular_itens(db, quantidade, CATEGORIAS)
+
+        if engine.dialect.name == "postgresql":
+            await db.execute(text("ANALYZE itens"))
+
+        await medir(
+            db, "ilike na coluna original",
+            select(ItemModel).where(
+                ItemModel.categoria.ilike("%categoria 123%")
+            ),
+            repeticoes
+        )
+        await medir(
+            db, "exata (B-tree)",
+            select(ItemModel).where(
+                ItemModel.categoria_normalizada == "categoria 123"
+            ),
+            repeticoes
+        )
+        await medir(
+            db, "aproximada (trigramas)",
+            select(ItemModel).where(
+                ItemModel.categoria_normalizada.contains("goria 123")
+            ),
+            repeticoes
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--itens", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.itens, args.repeticoes))
@@ -0,0 +1,168 @@
+"""
+Utilitários compartilhados pelos benchmarks: criação do schema, carga de
+dados sintéticos e contagem de comandos SQL emitidos.
+"""
+# Imports do sistema
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+# Imports de terceiros
+from sqlalchemy import event, insert, select, text
+
+# Imports locais
+from core.database import Base, engine
+from src.menu.models import (ItemModel, PedidoItensModel, PedidoModel,
+                             to_cents, utc_now)
+from src.menu.schemas import StatusPedido
+
+CATEGORIAS = ["Bebidas", "Lanches", "Pratos", "Sobremesas", "Porções"]
+
+
+async def criar_schema():
+    """
+    Recria todas as tabelas do banco configurado em DATABASE_URL.
+    """
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.drop_all)
+        await conexao.run_sync(Base.metadata.create_all)
+
+
+async def popular_itens(
+        db, quantidade: int, categorias: list[str] = CATEGORIAS,
+        lote: int = 10_000
+) -> list[int]:
+    """
+    Insere ``quantidade`` itens sintéticos no cardápio, em lotes de
+    ``lote`` linhas.
+
+    Returns:
+        list: IDs dos itens inseridos.
+    """
+    ids = []
+
+    for inicio in range(0, quantidade, lote):
+        ids.extend(
+            await db.scalars(
+                insert(ItemModel).returning(ItemModel.id),
+                [
+                    {
+                        "nome": f"Item {indice}",
+                        "descricao": f"Descrição do item {indice}",
+                        "preco": round(random.uniform(5, 80), 2),
+                        "categoria": random.choice(categorias),
+                        "url_imagem": f"static/images/item_{indice}.png",
+                    }
+                    for indice in range(
+                        inicio, min(inicio + lote, quantidade)
+                    )
+                ]
+            )
+        )
+    await db.commit()
+
+    return ids
+
+
+async def popular_pedidos(
+        db, quantidade: int, lote: int = 10_000, status: list[str] = None,
+        dias: int = 1
+):
+    """
+    Insere ``quantidade`` pedidos sintéticos, em lotes de ``lote`` linhas,
+    com status sorteados de ``status`` (padrão: todos) e datas sorteadas
+    entre os últimos ``dias`` dias.
+    """
+    status = status or StatusPedido.list()
+    agora = utc_now()
+
+    for inicio in range(0, quantidade, lote):
+        await db.execute(
+            insert(PedidoModel),
+            [
+                {
+                    "status": random.choice(status),
+                    "preco_total": round(random.uniform(10, 300), 2),
+                    "criado_em": agora - timedelta(
+                        seconds=random.uniform(0, dias * 86_400)
+                    ),
+                }
+                for _ in range(min(lote, quantidade - inicio))
+            ]
+        )
+    await db.commit()
+
+
+async def popular_itens_pedidos(
+        db, pedidos: int, itens: list[int], por_pedido: int = 5,
+        lote: int = 10_000, quantidade_maxima: int = 1
+):
+    """
+    Associa ``por_pedido`` itens distintos a cada um dos pedidos com ID de
+    1 a ``pedidos``, com quantidades de 1 a ``quantidade_maxima``.
+    """
+    cardapio = {
+        item.id: item
+        for item in await db.execute(
+            select(
+                ItemModel.id,
+                ItemModel.nome,
+                ItemModel.categoria_normalizada,
+                ItemModel.preco
+            )
+        )
+    }
+    linhas = (
+        {
+            "pedido_id": pedido_id,
+            "item_id": item_id,
+            "quantidade": random.randint(1, quantidade_maxima),
+            "nome": cardapio[item_id].nome,
+            "categoria": cardapio[item_id].categoria_normalizada,
+            "preco_unitario_centavos": to_cents(cardapio[item_id].preco),
+        }
+        for pedido_id in range(1, pedidos + 1)
+        for item_id in random.sample(itens, por_pedido)
+    )
+
+    while True:
+        parte = [linha for _, linha in zip(range(lote), linhas)]
+        if not parte:
+            break
+        await db.execute(insert(PedidoItensModel), parte)
+    await db.commit()
+
+
+async def recalcular_totais(db):
+    """
+    Recalcula o preço total de todos os pedidos a partir dos seus itens.
+    """
+    await db.execute(text(
+        "UPDATE pedidos SET preco_total = ("
+        "    SELECT coalesce(sum(subtotal_centavos), 0) / 100.0"
+        "    FROM pedido_itens"
+        "    WHERE pedido_itens.pedido_id = pedidos.id"
+        ")"
+    ))
+    await db.commit()
+
+
+@contextmanager
+def contar_comandos():
+    """
+    Conta os comandos SQL enviados ao banco dentro do bloco.
+    """
+    contador = {"comandos": 0}
+
+    def antes_de_executar(*_):
+        contador["comandos"] += 1
+
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", antes_de_executar
+    )
+    try:
+        yield contador
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", antes_de_executar
+        )
@@ -0,0 +1,75 @@
+"""
+Benchmark de ``get_detail_order`` conforme a tabela pedido_itens cresce.
+
+Com ``--sem-indices`` (apenas PostgreSQL), remove a restrição única e o
+índice de item_id antes de medir, reproduzindo o schema anterior.
+
+Uso:
+    python -m benchmarks.detalhes_pedido --tamanhos 10000 100000 500000
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+# Imports de terceiros
+from sqlalchemy import text
+
+# Imports locais
+from benchmarks.dados import (criar_schema, popular_itens,
+                              popular_itens_pedidos, popular_pedidos)
+from core.database import SessionLocal, engine
+from src.menu.crud import get_detail_order
+
+ITENS_POR_PEDIDO = 5
+
+
+async def main(tamanhos: list[int], repeticoes: int, sem_indices: bool):
+    print(f"{'linhas':>10} {'mediana (ms)':>13} {'p95 (ms)':>9}")
+
+    for tamanho in tamanhos:
+        pedidos = tamanho // ITENS_POR_PEDIDO
+
+        await criar_schema()
+
+        async with SessionLocal() as db:
+            if sem_indices and engine.dialect.name == "postgresql":
+                await db.execute(text(
+                    "ALTER TABLE pedido_itens "
+                    "DROP CONSTRAINT uq_pedido_itens_pedido_item"
+                ))
+                await db.execute(text("DROP INDEX ix_pedido_itens_item_id"))
+
+            itens = await popular_itens(db, 200)
+            await popular_pedidos(db, pedidos)
+            await popular_itens_pedidos(db, pedidos, itens, ITENS_POR_PEDIDO)
+
+            if engine.dialect.name == "postgresql":
+                await db.execute(text("ANALYZE"))
+
+        tempos = []
+        for _ in range(repeticoes):
+            async with SessionLocal() as db:
+                pedido_id = random.randint(1, pedidos)
+                inicio = time.perf_counter()
+                await get_detail_order(db, pedido_id)
+                tempos.append((time.perf_counter() - inicio) * 1000)
+
+        percentis = statistics.quantiles(tempos, n=100)
+        print(f"{tamanho:>10} {percentis[49]:>13.2f} {percentis[94]:>9.2f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[10_000, 100_000, 500_000]
+    )
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--sem-indices", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.tamanhos, args.repeticoes, args.sem_indices))
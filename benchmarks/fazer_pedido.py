@@ -0,0 +1,56 @@
+"""
+Microbenchmark de ``place_order``: latência e número de comandos SQL em
+função da quantidade de itens distintos no pedido.
+
+Uso:
+    python -m benchmarks.fazer_pedido --repeticoes 50
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import statistics
+import time
+
+# Imports locais
+from benchmarks.dados import contar_comandos, criar_schema, popular_itens
+from core.database import SessionLocal, engine
+from src.menu.crud import place_order
+from src.menu.schemas import PedidoClienteInput, StatusPedido
+
+TAMANHOS = [1, 5, 15, 50, 100]
+
+
+async def main(repeticoes: int):
+    await criar_schema()
+
+    async with SessionLocal() as db:
+        ids = await popular_itens(db, max(TAMANHOS))
+
+    print(f"{'itens':>6} {'comandos':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+
+    for tamanho in TAMANHOS:
+        pedido = PedidoClienteInput(itens=ids[:tamanho])
+        tempos = []
+
+        for _ in range(repeticoes):
+            async with SessionLocal() as db:
+                with contar_comandos() as contador:
+                    inicio = time.perf_counter()
+                    await place_order(db, pedido, StatusPedido.PENDENTE)
+                    tempos.append((time.perf_counter() - inicio) * 1000)
+
+        percentis = statistics.quantiles(tempos, n=100)
+        print(
+            f"{tamanho:>6} {contador['comandos']:>9} "
+            f"{percentis[49]:>9.2f} {percentis[94]:>9.2f}"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.repeticoes))
@@ -0,0 +1,103 @@
+"""
+Benchmark da fila da cozinha conforme o histórico de pedidos cresce.
+
+Mantém uma quantidade fixa de pedidos ativos (PRE-PEDIDO/PENDENTE) e, a
+cada etapa, acrescenta pedidos entregues e cancelados, medindo a fila da
+cozinha (``get_kitchen_queue``, índice parcial) e a listagem filtrada por
+status de ``get_all_orders``. No PostgreSQL também exibe o plano de
+execução da fila.
+
+Uso:
+    python -m benchmarks.fila_cozinha --ativos 200 \\
+        --historico 10000 100000 500000
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import statistics
+import time
+
+# Imports de terceiros
+from sqlalchemy import text
+
+# Imports locais
+from benchmarks.dados import criar_schema, popular_pedidos
+from core.database import SessionLocal, engine
+from src.menu.crud import get_all_orders, get_kitchen_queue
+from src.menu.models import STATUS_ATIVOS
+from src.menu.schemas import StatusPedido
+
+# Pedidos que já saíram da fila
+STATUS_HISTORICO = [StatusPedido.ENTREGUE.value, StatusPedido.CANCELADO.value]
+
+
+async def cronometrar(funcao, repeticoes: int) -> float:
+    """
+    Executa ``funcao`` com uma sessão nova e retorna a mediana em ms.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        async with SessionLocal() as db:
+            inicio = time.perf_counter()
+            await funcao(db)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+    return statistics.median(tempos)
+
+
+async def main(ativos: int, historico: list[int], repeticoes: int):
+    await criar_schema()
+
+    async with SessionLocal() as db:
+        await popular_pedidos(db, ativos, status=list(STATUS_ATIVOS))
+
+    print(
+        f"{'histórico':>10} {'fila (ms)':>10} "
+        f"{'por status (ms)':>16}"
+    )
+
+    inseridos = 0
+    for total in sorted(historico):
+        async with SessionLocal() as db:
+            await popular_pedidos(
+                db, total - inseridos, status=STATUS_HISTORICO
+            )
+        inseridos = total
+
+        if engine.dialect.name == "postgresql":
+            async with engine.connect() as conexao:
+                await conexao.execute(text("ANALYZE pedidos"))
+
+        fila = await cronometrar(
+            lambda db: get_kitchen_queue(db, 100), repeticoes
+        )
+        por_status = await cronometrar(
+            lambda db: get_all_orders(db, 100, status=StatusPedido.PENDENTE),
+            repeticoes
+        )
+        print(f"{total:>10} {fila:>10.2f} {por_status:>16.2f}")
+
+    if engine.dialect.name == "postgresql":
+        async with engine.connect() as conexao:
+            plano = await conexao.execute(text(
+                "EXPLAIN ANALYZE SELECT id, status, preco_total "
+                "FROM pedidos WHERE status IN ('PRE-PEDIDO', 'PENDENTE') "
+                "ORDER BY id LIMIT 101"
+            ))
+            print("\n" + "\n".join(linha for linha, in plano))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--ativos", type=int, default=200)
+    parser.add_argument("--historico", type=int, nargs="+",
+                        default=[10_000, 100_000, 500_000])
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.ativos, args.historico, args.repeticoes))
@@ -0,0 +1,86 @@
+"""
+Benchmark do cadastro de itens em lote.
+
+Compara o tempo para cadastrar ``--itens`` itens um a um com
+``create_item`` (uma transação por item, como em chamadas sucessivas a
+``cadastrar_item``) e de uma vez com ``import_items`` (COPY no PostgreSQL,
+executemany nos demais bancos), no banco configurado em ``DATABASE_URL``.
+
+Os itens usam uma imagem já armazenada, para medir apenas o banco.
+
+Uso:
+    python -m benchmarks.importar_itens --itens 500
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import time
+
+# Imports locais
+from benchmarks.dados import CATEGORIAS, contar_comandos, criar_schema
+from core.database import SessionLocal, engine
+from src.menu.crud import create_item, import_items
+from src.menu.images import armazenamento, remove_image
+from src.menu.schemas import ItemImportacao
+
+CHAVE_IMAGEM = "images/" + "0" * 64 + ".png"
+
+
+def gerar_itens(quantidade: int) -> list[ItemImportacao]:
+    return [
+        ItemImportacao(
+            nome=f"Item {indice}",
+            descricao=f"Descrição do item {indice}",
+            preco=10 + indice % 50,
+            categoria=CATEGORIAS[indice % len(CATEGORIAS)],
+            imagem=CHAVE_IMAGEM,
+        )
+        for indice in range(quantidade)
+    ]
+
+
+async def um_a_um(itens: list[ItemImportacao]):
+    for item in itens:
+        async with SessionLocal() as db:
+            await create_item(
+                db, item.nome, item.descricao, item.preco, item.categoria,
+                arquivo=None, chave_imagem=item.imagem
+            )
+
+
+async def em_lote(itens: list[ItemImportacao]):
+    async with SessionLocal() as db:
+        await import_items(
+            db, itens, {CHAVE_IMAGEM: armazenamento.locate(CHAVE_IMAGEM)}
+        )
+
+
+async def main(quantidade: int):
+    await armazenamento.put_bytes(CHAVE_IMAGEM, b"imagem", "image/png")
+    itens = gerar_itens(quantidade)
+
+    try:
+        for nome, funcao in (("um a um", um_a_um), ("em lote", em_lote)):
+            await criar_schema()
+
+            with contar_comandos() as contador:
+                inicio = time.perf_counter()
+                await funcao(itens)
+                duracao = time.perf_counter() - inicio
+
+            print(
+                f"{nome:<10} {duracao * 1000:>10.1f} ms "
+                f"{quantidade / duracao:>10.0f} itens/s "
+                f"{contador['comandos']:>8} comandos"
+            )
+    finally:
+        await remove_image(armazenamento.locate(CHAVE_IMAGEM))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--itens", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.itens))
@@ -0,0 +1,94 @@
+"""
+Benchmark do custo da instrumentação de métricas.
+
+Mede o tempo médio por requisição de uma rota trivial com e sem o
+``MetricsMiddleware`` e o tempo médio por consulta (``SELECT 1``) no banco
+configurado em ``DATABASE_URL`` com e sem os eventos de ``core.metrics``.
+
+Uso:
+    python -m benchmarks.metricas --requisicoes 5000 --consultas 5000
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import time
+
+# Imports de terceiros
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+
+# Imports locais
+from core.database import engine
+from core.metrics import MetricsMiddleware, instrument_engine
+
+
+def criar_app(instrumentada: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/itens/{item_id}")
+    async def obter(item_id: int):
+        return {"id": item_id}
+
+    if instrumentada:
+        app.add_middleware(MetricsMiddleware)
+
+    return app
+
+
+async def medir_requisicoes(nome: str, app: FastAPI, total: int) -> float:
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+            transport=transporte, base_url="http://benchmark"
+    ) as cliente:
+        # Aquecimento
+        await cliente.get("/itens/1")
+
+        inicio = time.perf_counter()
+        for indice in range(total):
+            await cliente.get(f"/itens/{indice}")
+        duracao = time.perf_counter() - inicio
+
+    media = duracao / total * 1e6
+    print(f"requisições {nome:<16} {media:>8.1f} µs/requisição")
+
+    return media
+
+
+async def medir_consultas(nome: str, total: int) -> float:
+    async with engine.connect() as conexao:
+        await conexao.execute(text("SELECT 1"))
+
+        inicio = time.perf_counter()
+        for _ in range(total):
+            await conexao.execute(text("SELECT 1"))
+        duracao = time.perf_counter() - inicio
+
+    media = duracao / total * 1e6
+    print(f"consultas   {nome:<16} {media:>8.1f} µs/consulta")
+
+    return media
+
+
+async def main(requisicoes: int, consultas: int):
+    sem = await medir_requisicoes("sem métricas", criar_app(False),
+                                  requisicoes)
+    com = await medir_requisicoes("com métricas", criar_app(True),
+                                  requisicoes)
+    print(f"custo do middleware: {com - sem:.1f} µs/requisição\n")
+
+    sem = await medir_consultas("sem métricas", consultas)
+    instrument_engine(engine.sync_engine)
+    com = await medir_consultas("com métricas", consultas)
+    print(f"custo dos eventos: {com - sem:.1f} µs/consulta")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    parser.add_argument("--consultas", type=int, default=5000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requisicoes, args.consultas))
@@ -0,0 +1,80 @@
+"""
+Benchmark da listagem de pedidos: leitura completa da tabela (como o
+antigo ``get_all_orders``) x páginas por chave (keyset) no início, no
+meio e no fim do histórico.
+
+Uso:
+    python -m benchmarks.obter_pedidos --pedidos 200000
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import statistics
+import time
+
+# Imports de terceiros
+from sqlalchemy import func, select
+
+# Imports locais
+from benchmarks.dados import criar_schema, popular_pedidos
+from core.database import SessionLocal, engine
+from src.menu.crud import get_all_orders
+from src.menu.models import PedidoModel
+from src.menu.schemas import StatusPedido
+
+
+async def cronometrar(nome: str, funcao, repeticoes: int):
+    """
+    Executa ``funcao`` com uma sessão nova e imprime a mediana em ms.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        async with SessionLocal() as db:
+            inicio = time.perf_counter()
+            await funcao(db)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+    print(f"{nome:<32} {statistics.median(tempos):>10.2f} ms")
+
+
+async def main(quantidade: int, repeticoes: int):
+    await criar_schema()
+
+    async with SessionLocal() as db:
+        await popular_pedidos(db, quantidade)
+        ultimo_id = await db.scalar(select(func.max(PedidoModel.id)))
+
+    async def tabela_completa(db):
+        (await db.scalars(select(PedidoModel))).all()
+
+    await cronometrar("tabela completa", tabela_completa, repeticoes)
+
+    for nome, cursor in [
+        ("primeira página", None),
+        ("página do meio", ultimo_id // 2),
+        ("última página", ultimo_id - 50),
+    ]:
+        await cronometrar(
+            nome,
+            lambda db, cursor=cursor: get_all_orders(db, 50, cursor),
+            repeticoes
+        )
+
+    await cronometrar(
+        "página filtrada por status",
+        lambda db: get_all_orders(
+            db, 50, ultimo_id // 2, StatusPedido.ENTREGUE
+        ),
+        repeticoes
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pedidos", type=int, default=200_000)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.pedidos, args.repeticoes))
@@ -0,0 +1,92 @@
+"""
+Benchmark de vazão concorrente: sessão síncrona x sessão assíncrona.
+
+Simula N requisições simultâneas dentro do mesmo event loop, como acontece
+nas rotas ``async def`` do uvicorn. Cada requisição executa uma consulta
+com latência artificial (``pg_sleep``) no PostgreSQL configurado em
+``DATABASE_URL``.
+
+Uso:
+    python -m benchmarks.sessao_assincrona --concorrencia 50 --latencia 0.01
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import time
+
+# Imports de terceiros
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Imports locais
+from core.config import settings
+from core.database import SessionLocal, engine
+
+CONSULTA = text("SELECT pg_sleep(:latencia)")
+
+
+async def requisicao_sincrona(fabrica, latencia: float):
+    """
+    Reproduz o comportamento antigo: sessão síncrona dentro de async def.
+    """
+    with fabrica() as db:
+        db.execute(CONSULTA, {"latencia": latencia})
+
+
+async def requisicao_assincrona(latencia: float):
+    """
+    Reproduz o comportamento atual: AsyncSession de core.database.
+    """
+    async with SessionLocal() as db:
+        await db.execute(CONSULTA, {"latencia": latencia})
+
+
+async def medir(nome: str, fabrica_requisicao, total: int, concorrencia: int):
+    """
+    Executa ``total`` requisições limitadas a ``concorrencia`` simultâneas.
+    """
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def executar():
+        async with semaforo:
+            await fabrica_requisicao()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(executar() for _ in range(total)))
+    duracao = time.perf_counter() - inicio
+
+    print(
+        f"{nome:<12} {total} requisições em {duracao:.2f}s "
+        f"-> {total / duracao:.1f} req/s"
+    )
+
+
+async def main(total: int, concorrencia: int, latencia: float):
+    engine_sincrono = create_engine(
+        settings.DATABASE_URL, pool_size=concorrencia
+    )
+    fabrica_sincrona = sessionmaker(bind=engine_sincrono)
+
+    await medir(
+        "síncrono",
+        lambda: requisicao_sincrona(fabrica_sincrona, latencia),
+        total, concorrencia
+    )
+    await medir(
+        "assíncrono",
+        lambda: requisicao_assincrona(latencia),
+        total, concorrencia
+    )
+
+    engine_sincrono.dispose()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=200)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    parser.add_argument("--latencia", type=float, default=0.01)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.total, args.concorrencia, args.latencia))
@@ -0,0 +1,101 @@
+"""
+Benchmark de envios simultâneos de imagens grandes: gravação síncrona
+dentro do event loop (comportamento anterior) x ``save_upload``.
+
+Além do tempo total, mede o maior atraso do event loop durante os envios,
+que é o tempo em que nenhuma outra requisição seria atendida.
+
+Uso:
+    python -m benchmarks.upload_imagens --envios 20 --tamanho-mb 4
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import io
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# Imports de terceiros
+from fastapi import UploadFile
+
+# Imports locais
+from src.menu.images import save_upload
+from src.menu.storage import LocalStorage
+
+
+async def gravacao_sincrona(arquivo: UploadFile, diretorio: Path):
+    """
+    Reproduz o comportamento anterior: leitura e escrita inteiras, no loop.
+    """
+    diretorio.mkdir(exist_ok=True)
+    with open(diretorio / arquivo.filename, "wb+") as objeto_arquivo:
+        objeto_arquivo.write(arquivo.file.read())
+
+
+async def gravacao_streaming(arquivo: UploadFile, diretorio: Path):
+    """
+    Grava com ``save_upload`` em um armazenamento local no diretório.
+    """
+    await save_upload(arquivo, LocalStorage(diretorio))
+
+
+async def monitorar_loop(atrasos: list, parar: asyncio.Event):
+    """
+    Registra o atraso de um tique de 1 ms do event loop.
+    """
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(0.001)
+        atrasos.append(time.perf_counter() - inicio - 0.001)
+
+
+async def medir(nome: str, gravar, envios: int, conteudo: bytes, pasta: Path):
+    atrasos = []
+    parar = asyncio.Event()
+    monitor = asyncio.create_task(monitorar_loop(atrasos, parar))
+
+    inicio = time.perf_counter()
+    # O índice no início do conteúdo evita que os envios sejam deduplicados
+    await asyncio.gather(*(
+        gravar(
+            UploadFile(
+                file=io.BytesIO(indice.to_bytes(4, "big") + conteudo),
+                filename=f"{indice}.png"
+            ),
+            pasta / nome
+        )
+        for indice in range(envios)
+    ))
+    duracao = time.perf_counter() - inicio
+
+    parar.set()
+    await monitor
+
+    print(
+        f"{nome:<10} total {duracao * 1000:>8.1f} ms   "
+        f"maior bloqueio do loop {max(atrasos, default=0) * 1000:>8.1f} ms"
+    )
+
+
+async def main(envios: int, tamanho_mb: int):
+    conteudo = b"\x00" * (tamanho_mb * 1024 * 1024)
+    pasta = Path(tempfile.mkdtemp())
+
+    try:
+        await medir("síncrono", gravacao_sincrona, envios, conteudo, pasta)
+        await medir(
+            "streaming", gravacao_streaming, envios, conteudo, pasta
+        )
+    finally:
+        shutil.rmtree(pasta)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--envios", type=int, default=20)
+    parser.add_argument("--tamanho-mb", type=int, default=4)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.envios, args.tamanho_mb))
@@ -0,0 +1,123 @@
+"""
+Benchmark dos relatórios de vendas conforme o histórico de pedidos cresce.
+
+Para cada tamanho, gera pedidos distribuídos pelos últimos ``--dias``
+dias, recalcula os resumos (``rebuild_sales``, o backfill) e compara os
+itens mais vendidos dos últimos ``--periodo`` dias lidos do resumo por dia
+e item (``get_top_items``) com a mesma agregação feita sobre os pedidos.
+
+Uso:
+    python -m benchmarks.vendas --pedidos 10000 100000 500000
+"""
+# Imports do sistema
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+
+# Imports de terceiros
+from sqlalchemy import func, select, text
+
+# Imports locais
+from benchmarks.dados import (criar_schema, popular_itens,
+                              popular_itens_pedidos, popular_pedidos)
+from core.database import SessionLocal, engine
+from src.menu.crud import get_top_items, rebuild_sales
+from src.menu.models import PedidoItensModel, PedidoModel, utc_now
+from src.menu.schemas import StatusPedido
+
+ITENS_POR_PEDIDO = 4
+
+
+async def top_items_from_orders(db, periodo: int):
+    """
+    Itens mais vendidos agregando diretamente os pedidos do período.
+    """
+    receita = func.sum(PedidoItensModel.subtotal_centavos)
+    return (
+        await db.execute(
+            select(
+                PedidoItensModel.item_id,
+                func.sum(PedidoItensModel.quantidade),
+                receita
+            )
+            .join(PedidoModel, PedidoModel.id == PedidoItensModel.pedido_id)
+            .where(
+                PedidoModel.status != StatusPedido.CANCELADO.value,
+                PedidoModel.criado_em >= utc_now() - timedelta(days=periodo)
+            )
+            .group_by(PedidoItensModel.item_id)
+            .order_by(receita.desc())
+            .limit(10)
+        )
+    ).all()
+
+
+async def cronometrar(funcao, repeticoes: int) -> float:
+    """
+    Executa ``funcao`` com uma sessão nova e retorna a mediana em ms.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        async with SessionLocal() as db:
+            inicio = time.perf_counter()
+            await funcao(db)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+    return statistics.median(tempos)
+
+
+async def main(tamanhos: list[int], dias: int, periodo: int,
+               repeticoes: int):
+    print(
+        f"{'pedidos':>10} {'backfill (ms)':>14} "
+        f"{'resumo (ms)':>12} {'pedidos (ms)':>13}"
+    )
+
+    for pedidos in tamanhos:
+        await criar_schema()
+
+        async with SessionLocal() as db:
+            itens = await popular_itens(db, 200)
+            await popular_pedidos(db, pedidos, dias=dias)
+            await popular_itens_pedidos(db, pedidos, itens, ITENS_POR_PEDIDO)
+
+            if engine.dialect.name == "postgresql":
+                await db.execute(text("ANALYZE"))
+
+        async with SessionLocal() as db:
+            inicio = time.perf_counter()
+            await rebuild_sales(db)
+            backfill = (time.perf_counter() - inicio) * 1000
+
+        desde = (utc_now() - timedelta(days=periodo)).date()
+        resumo = await cronometrar(
+            lambda db: get_top_items(db, inicio=desde), repeticoes
+        )
+        varredura = await cronometrar(
+            lambda db: top_items_from_orders(db, periodo), repeticoes
+        )
+        print(
+            f"{pedidos:>10} {backfill:>14.1f} "
+            f"{resumo:>12.2f} {varredura:>13.2f}"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pedidos", type=int, nargs="+",
+                        default=[10_000, 100_000, 500_000])
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--periodo", type=int, default=30)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(args.pedidos, args.dias, args.periodo, args.repeticoes)
+    )
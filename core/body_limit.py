@@ -0,0 +1,150 @@
+# Imports do sistema
+from typing import Optional
+
+# Imports de terceiros
+from fastapi import FastAPI
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.routing import Match, Router
+
+# Imports locais
+from core.config import settings
+
+# Folga para o envelope multipart (delimitadores, cabeçalhos das partes e
+# campos de texto) além do limite dos arquivos enviados
+MARGEM_MULTIPART = 64 * 1024
+
+METODOS_COM_CORPO = {"POST", "PUT", "PATCH"}
+
+
+def body_limit(configuracao: str):
+    """
+    Declara a configuração com o tamanho máximo, em bytes, dos arquivos
+    enviados a uma rota; requisições maiores são recusadas com 413 antes
+    de o corpo ser lido (veja BodyLimitMiddleware).
+
+    Deve ser aplicado abaixo do decorador da rota::
+
+        @router.post("/cadastrar_item")
+        @body_limit("MAX_UPLOAD_SIZE")
+        async def cadastrar_item(...):
+
+    Args:
+        configuracao (str): Nome da configuração com o limite (lida a cada
+            requisição).
+    """
+    def decorador(funcao):
+        funcao.limite_corpo = configuracao
+        return funcao
+
+    return decorador
+
+
+def too_large(limite: int) -> JSONResponse:
+    """
+    Resposta para corpos acima do limite da rota, no formato de
+    APIException.
+    """
+    return JSONResponse(
+        status_code=413,
+        content={
+            "status": "error",
+            "message": "Requisição muito grande.",
+            "code": 413,
+            "description": (
+                f"O corpo da requisição excede o tamanho máximo de "
+                f"{limite} bytes."
+            ),
+            "data": {}
+        }
+    )
+
+
+class BodyLimitMiddleware:
+    """
+    Middleware ASGI que limita o corpo das rotas declaradas com body_limit.
+
+    Recusa de imediato as requisições cujo Content-Length excede o limite e
+    conta os bytes recebidos durante a leitura (corpos sem Content-Length
+    ou com um valor menor que o real), interrompendo-a assim que o limite é
+    excedido, antes de o Starlette gravar o restante do multipart em disco.
+    """
+    def __init__(self, app, roteador: Router):
+        self.app = app
+        self.roteador = roteador
+
+    def limit(self, scope) -> Optional[int]:
+        """
+        Limite do corpo da rota da requisição, ou None se não houver.
+        """
+        for rota in self.roteador.routes:
+            correspondencia, _ = rota.matches(scope)
+            if correspondencia == Match.FULL:
+                configuracao = getattr(
+                    getattr(rota, "endpoint", None), "limite_corpo", None
+                )
+                if configuracao is None:
+                    return None
+                return getattr(settings, configuracao) + MARGEM_MULTIPART
+
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (
+                scope["method"] not in METODOS_COM_CORPO
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limite = self.limit(scope)
+        if limite is None:
+            await self.app(scope, receive, send)
+            return
+
+        tamanho = Headers(scope=scope).get("content-length", "")
+        if tamanho.isdigit() and int(tamanho) > limite:
+            await too_large(limite)(scope, receive, send)
+            return
+
+        recebidos = 0
+        iniciada = False
+        recusada = False
+
+        async def receive_limited():
+            nonlocal recebidos, recusada
+            if recusada:
+                return {"type": "http.disconnect"}
+
+            mensagem = await receive()
+            if mensagem["type"] == "http.request":
+                recebidos += len(mensagem.get("body", b""))
+
+                # A rota recebe uma desconexão e a resposta dela é
+                # descartada
+                if recebidos > limite:
+                    recusada = True
+                    if not iniciada:
+                        await too_large(limite)(scope, receive, send)
+                    return {"type": "http.disconnect"}
+
+            return mensagem
+
+        async def send_unless_refused(mensagem):
+            nonlocal iniciada
+            if recusada:
+                return
+            if mensagem["type"] == "http.response.start":
+                iniciada = True
+            await send(mensagem)
+
+        await self.app(scope, receive_limited, send_unless_refused)
+
+
+def setup_body_limit(app: FastAPI):
+    """
+    Ativa o limite do corpo das rotas declaradas com body_limit.
+
+    Args:
+        app (FastAPI): Aplicação.
+    """
+    app.add_middleware(BodyLimitMiddleware, roteador=app.router)
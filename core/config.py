@@ -1,5 +1,6 @@
 # Imports do sistema
 import os
+from typing import Optional
 
 # Imports de terceiros
 from dotenv import load_dotenv
@@ -12,6 +13,9 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '../env/.env'))
 class Settings(BaseSettings):
     # Development
     DEBUG: bool = False
+    # Com DEBUG, falha (QueryBudgetExceeded) quando uma rota excede o seu
+    # orçamento de comandos SQL, em vez de apenas registrá-lo no log
+    QUERY_BUDGET_STRICT: bool = False
 
     # Database
     POSTGRES_USER: str = os.getenv("POSTGRES_USER")
@@ -25,6 +29,78 @@ class Settings(BaseSettings):
                                   f"{DATABASE_HOST}:{DATABASE_PORT}/{POSTGRES_DB}"
                                   )
 
+    # Pool de conexões (por worker): conexões mantidas e excedentes
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Espera máxima por uma conexão livre do pool (segundos)
+    DB_POOL_TIMEOUT: float = 30
+    # Recria conexões mais antigas que isso (segundos; -1 desativa)
+    DB_POOL_RECYCLE: int = 1800
+    # Testa a conexão antes de usá-la (detecta conexões mortas após failover)
+    DB_POOL_PRE_PING: bool = True
+    # Espera registrada como lenta na obtenção de uma conexão (segundos)
+    DB_POOL_SLOW_CHECKOUT: float = 1.0
+    # Tempo limite para conectar (segundos) e de cada comando (ms; 0 desativa)
+    DB_CONNECT_TIMEOUT: int = 10
+    DB_STATEMENT_TIMEOUT: int = 0
+    # Compatível com pgbouncer em pool_mode=transaction: desativa os
+    # prepared statements em cache e os parâmetros de sessão na conexão
+    DB_PGBOUNCER: bool = False
+
+    # Métricas do Prometheus em /metrics
+    METRICS_ENABLED: bool = True
+
+    # Eventos de pedidos (SSE/WebSocket): eventos pendentes por conexão; a
+    # conexão que não os consome a tempo é encerrada
+    ORDER_EVENTS_QUEUE_SIZE: int = 100
+    # Conexão direta ao PostgreSQL usada no LISTEN dos eventos (padrão:
+    # DATABASE_URL); necessária com DB_PGBOUNCER, pois o pgbouncer em
+    # pool_mode=transaction não repassa as notificações
+    ORDER_EVENTS_DATABASE_URL: Optional[str] = None
+
+    # Fuso horário que define o dia de cada pedido nos resumos de vendas
+    # (ex.: America/Sao_Paulo; padrão: UTC)
+    SALES_TIMEZONE: Optional[str] = None
+
+    # Validade das chaves de idempotência de fazer_pedido (segundos) e
+    # quantas são mantidas em memória por worker
+    IDEMPOTENCY_TTL: int = 24 * 60 * 60
+    IDEMPOTENCY_CACHE_SIZE: int = 10_000
+
+    # Cache do cardápio (segundos); 0 desativa o cache e os filtros por
+    # categoria passam a consultar o banco
+    MENU_CACHE_TTL: int = 60
+
+    # Tamanho máximo das imagens enviadas (bytes); requisições maiores são
+    # recusadas antes da leitura do corpo
+    MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024
+    # Linhas aceitas por arquivo na importação de itens em lote
+    IMPORT_MAX_ROWS: int = 10_000
+    # Tamanho máximo dos arquivos da importação em lote, somados o arquivo
+    # dos itens e o pacote de imagens (bytes)
+    IMPORT_MAX_SIZE: int = 100 * 1024 * 1024
+    # Threads dedicadas à gravação de imagens
+    UPLOAD_THREADS: int = 4
+
+    # Armazenamento das imagens: local, s3 ou memory
+    STORAGE_BACKEND: str = "local"
+    # Envio direto das imagens ao armazenamento (imagens/url_envio)
+    DIRECT_UPLOADS: bool = True
+    # Chave que assina os envios diretos recebidos pela API (backends local
+    # e memory); obrigatória com DIRECT_UPLOADS nesses backends e igual em
+    # todos os workers
+    STORAGE_SECRET: Optional[str] = None
+    # Validade das URLs de envio direto (segundos)
+    PRESIGNED_EXPIRATION: int = 900
+    # Bucket compatível com S3 (AWS S3, MinIO etc.)
+    S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY: Optional[str] = None
+    S3_SECRET_KEY: Optional[str] = None
+    # URL pública do bucket (ex.: CDN); padrão: endpoint/bucket
+    S3_PUBLIC_URL: Optional[str] = None
+
     class Config:
         env_file = os.path.join(os.path.dirname(__file__), '../env/.env')
         env_file_encoding = 'utf-8'
@@ -1,24 +1,207 @@
+# Imports do sistema
+import logging
+import threading
+import time
+import uuid
+
 # Imports de terceiros
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # Imports locais
 from core.config import settings
 
-# Criar o engine de conexão
-engine = create_engine(settings.DATABASE_URL)
+# Drivers assíncronos usados para cada dialeto suportado
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Limites (segundos) dos intervalos de espera por conexões do pool
+LIMITES_ESPERA = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
+
+
+def get_async_url(url: str) -> str:
+    """
+    Converte a URL de conexão para o driver assíncrono correspondente.
+
+    Args:
+        url (str): URL de conexão do banco de dados.
+    Returns:
+        str: URL de conexão com o driver assíncrono.
+    """
+    dialeto, separador, resto = url.partition("://")
+
+    # Mantém a URL caso um driver já tenha sido especificado
+    if "+" in dialeto:
+        return url
+
+    return f"{ASYNC_DRIVERS.get(dialeto, dialeto)}{separador}{resto}"
+
+
+class CheckoutWait:
+    """
+    Histograma do tempo de espera para obter uma conexão do pool.
+
+    Os intervalos são cumulativos (como no Prometheus): ``intervalos[i]``
+    conta as esperas menores ou iguais a ``LIMITES_ESPERA[i]``.
+    """
+    def __init__(self, limites: tuple = LIMITES_ESPERA):
+        self.limites: tuple = limites
+        self.intervalos: list[int] = [0] * len(limites)
+        self.quantidade: int = 0
+        self.soma: float = 0.0
+        self.maximo: float = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, segundos: float):
+        """
+        Registra uma espera.
+
+        Args:
+            segundos (float): Tempo de espera, em segundos.
+        """
+        with self._lock:
+            self.quantidade += 1
+            self.soma += segundos
+            self.maximo = max(self.maximo, segundos)
+            for indice, limite in enumerate(self.limites):
+                if segundos <= limite:
+                    self.intervalos[indice] += 1
+
+        if segundos >= settings.DB_POOL_SLOW_CHECKOUT:
+            logger.warning(
+                "Espera de %.3f s por uma conexão do pool; considere "
+                "aumentar DB_POOL_SIZE/DB_MAX_OVERFLOW", segundos
+            )
+
+
+espera_checkout = CheckoutWait()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool de conexões que mede o tempo de espera de cada checkout pela fila
+    do pool.
+
+    A abertura de novas conexões (conexão e TLS) é descontada: apenas a
+    espera por uma conexão livre indica um pool pequeno demais.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Tempo gasto abrindo conexões em cada checkout em andamento, pela
+        # greenlet que o executa
+        self._aberturas: dict = {}
+
+    def _do_get(self):
+        atual = getcurrent()
+
+        # Chamada recursiva do próprio _do_get: já está sendo medida
+        if atual in self._aberturas:
+            return super()._do_get()
+
+        self._aberturas[atual] = 0.0
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            abertura = self._aberturas.pop(atual)
+            espera_checkout.observe(
+                time.perf_counter() - inicio - abertura
+            )
+
+    def _create_connection(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            atual = getcurrent()
+            if atual in self._aberturas:
+                self._aberturas[atual] += time.perf_counter() - inicio
+
+
+def unique_statement_name() -> str:
+    """
+    Nome único para cada prepared statement (modo pgbouncer).
+    """
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def enable_foreign_keys(conexao_dbapi, registro):
+    """
+    Ativa as chaves estrangeiras em cada nova conexão do SQLite, que as
+    ignora por padrão (ex.: ON DELETE SET NULL de pedido_itens.item_id).
+    """
+    cursor = conexao_dbapi.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def engine_options(url: str) -> dict:
+    """
+    Monta as opções do engine (pool e conexão) a partir das configurações.
+
+    Para o SQLite mantém as opções padrão do SQLAlchemy.
+
+    Args:
+        url (str): URL de conexão com o driver assíncrono.
+    Returns:
+        dict: Argumentos para create_async_engine.
+    """
+    if not url.startswith("postgresql"):
+        return {}
+
+    argumentos_conexao = {"timeout": settings.DB_CONNECT_TIMEOUT}
+
+    if settings.DB_PGBOUNCER:
+        # Em pool_mode=transaction cada transação pode usar uma conexão
+        # diferente do servidor: prepared statements não podem ser
+        # reaproveitados nem ter nomes repetidos, e o pgbouncer recusa
+        # parâmetros de sessão desconhecidos na conexão (o statement_timeout
+        # deve ser configurado no usuário: ALTER ROLE ... SET)
+        argumentos_conexao.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=unique_statement_name,
+        )
+    elif settings.DB_STATEMENT_TIMEOUT:
+        argumentos_conexao["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)
+        }
+
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": argumentos_conexao,
+    }
+
+
+URL_ASSINCRONA = get_async_url(settings.DATABASE_URL)
+
+# Criar o engine assíncrono de conexão
+engine = create_async_engine(URL_ASSINCRONA, **engine_options(URL_ASSINCRONA))
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", enable_foreign_keys)
 
-# Criar uma fábrica de sessões
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Criar uma fábrica de sessões assíncronas
+SessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
+)
 
 # Base para os modelos
 Base = declarative_base()
 
 
 # Função para obter uma sessão de banco de dados
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
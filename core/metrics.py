@@ -0,0 +1,241 @@
+# Imports do sistema
+import os
+import time
+
+# Imports de terceiros
+from fastapi import FastAPI
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest)
+from prometheus_client.core import GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Imports locais
+from core.database import engine, espera_checkout
+
+# Rótulo das requisições que não correspondem a nenhuma rota da API, para
+# não criar uma série por URL (ex.: arquivos em /static, 404)
+ROTA_NAO_MAPEADA = "nao_mapeada"
+
+# Operações SQL rotuladas; as demais são agrupadas em "OUTRA"
+OPERACOES_SQL = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY"}
+
+DURACAO_REQUISICOES = Histogram(
+    "http_request_duration_seconds",
+    "Duração das requisições HTTP, por rota.",
+    ["method", "route", "status"],
+)
+REQUISICOES_EM_ANDAMENTO = Gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DURACAO_CONSULTAS = Histogram(
+    "db_query_duration_seconds",
+    "Duração das consultas SQL, por operação.",
+    ["operation"],
+    buckets=(
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+        1.0, 2.5, 5.0,
+    ),
+)
+ERROS_CONSULTAS = Counter(
+    "db_query_errors_total",
+    "Consultas SQL que terminaram em erro, por operação.",
+    ["operation"],
+)
+
+# Séries já rotuladas por operação, evitando o custo de labels() a cada
+# consulta
+SERIES_CONSULTAS = {
+    operacao: DURACAO_CONSULTAS.labels(operacao)
+    for operacao in (*OPERACOES_SQL, "OUTRA")
+}
+
+
+def sql_operation(comando: str) -> str:
+    """
+    Extrai a operação (primeira palavra) de um comando SQL.
+
+    Args:
+        comando (str): Comando SQL.
+    Returns:
+        str: Operação em maiúsculas, ou "OUTRA".
+    """
+    partes = comando.split(None, 1)
+    operacao = partes[0].upper() if partes else ""
+
+    return operacao if operacao in OPERACOES_SQL else "OUTRA"
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    """
+    Marca o início da consulta no contexto de execução.
+    """
+    context._inicio_consulta = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context,
+                         executemany):
+    """
+    Registra a duração da consulta.
+    """
+    SERIES_CONSULTAS[sql_operation(statement)].observe(
+        time.perf_counter() - context._inicio_consulta
+    )
+
+
+def handle_error(contexto):
+    """
+    Conta as consultas que terminaram em erro.
+    """
+    if contexto.statement:
+        ERROS_CONSULTAS.labels(sql_operation(contexto.statement)).inc()
+
+
+def instrument_engine(motor: Engine):
+    """
+    Registra os eventos do engine que medem as consultas SQL.
+
+    Args:
+        motor (Engine): Engine síncrono (``AsyncEngine.sync_engine``).
+    """
+    event.listen(motor, "before_cursor_execute", before_cursor_execute)
+    event.listen(motor, "after_cursor_execute", after_cursor_execute)
+    event.listen(motor, "handle_error", handle_error)
+
+
+class PoolCollector:
+    """
+    Exporta o estado do pool de conexões e o histograma de espera por
+    conexões (core.database.espera_checkout), lidos apenas na coleta.
+
+    Args:
+        motor (Engine): Engine síncrono (``AsyncEngine.sync_engine``).
+        rotulos (dict): Rótulos fixos das métricas (ex.: pid do worker).
+    """
+    def __init__(self, motor: Engine, rotulos: dict[str, str] = None):
+        self.pool = motor.pool
+        self.rotulos: dict[str, str] = rotulos or {}
+
+    def collect(self):
+        """
+        Lê o estado atual do pool (chamado pelo Prometheus a cada coleta).
+        """
+        nomes, valores = list(self.rotulos), list(self.rotulos.values())
+
+        for nome, descricao, metodo in (
+            ("db_pool_size", "Tamanho do pool de conexões.", "size"),
+            ("db_pool_checked_out", "Conexões em uso.", "checkedout"),
+            ("db_pool_checked_in", "Conexões livres no pool.", "checkedin"),
+            ("db_pool_overflow", "Conexões excedentes abertas.", "overflow"),
+        ):
+            if hasattr(self.pool, metodo):
+                metrica = GaugeMetricFamily(nome, descricao, labels=nomes)
+                # overflow() é negativo enquanto o pool não está cheio
+                metrica.add_metric(
+                    valores, max(getattr(self.pool, metodo)(), 0)
+                )
+                yield metrica
+
+        espera = espera_checkout
+        metrica = HistogramMetricFamily(
+            "db_pool_checkout_wait_seconds",
+            "Espera por uma conexão livre do pool (sem a abertura de "
+            "novas conexões).",
+            labels=nomes,
+        )
+        metrica.add_metric(
+            valores,
+            buckets=[
+                *zip(map(str, espera.limites), espera.intervalos),
+                ("+Inf", espera.quantidade),
+            ],
+            sum_value=espera.soma,
+        )
+        yield metrica
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede a duração e a quantidade de requisições em
+    andamento, rotulando-as pelo modelo da rota (ex.:
+    /cardapio/obter_item/{item_id}).
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        status = 500
+
+        async def send_status(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        em_andamento = REQUISICOES_EM_ANDAMENTO.labels(metodo)
+        em_andamento.inc()
+        inicio = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            em_andamento.dec()
+            rota = scope.get("route")
+            DURACAO_REQUISICOES.labels(
+                metodo,
+                rota.path if rota is not None else ROTA_NAO_MAPEADA,
+                status,
+            ).observe(time.perf_counter() - inicio)
+
+
+async def metrics(request: Request) -> Response:
+    """
+    Exporta as métricas no formato do Prometheus.
+
+    Com PROMETHEUS_MULTIPROC_DIR definido (vários workers do gunicorn),
+    agrega as métricas de todos os processos. O pool de conexões é de cada
+    processo: nesse caso, as suas métricas são as do worker que atendeu a
+    coleta, rotuladas com o pid.
+    """
+    registro = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registro = CollectorRegistry()
+        MultiProcessCollector(registro)
+        registro.register(
+            PoolCollector(engine.sync_engine, {"pid": str(os.getpid())})
+        )
+
+    return Response(
+        generate_latest(registro), media_type=CONTENT_TYPE_LATEST
+    )
+
+
+def setup_metrics(app: FastAPI):
+    """
+    Ativa as métricas: instrumenta o engine, registra o coletor do pool,
+    adiciona o middleware e expõe o endpoint /metrics.
+
+    Args:
+        app (FastAPI): Aplicação.
+    """
+    instrument_engine(engine.sync_engine)
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        REGISTRY.register(PoolCollector(engine.sync_engine))
+
+    app.add_middleware(MetricsMiddleware)
+    # Rota da API (e não do Starlette), para que o middleware a rotule
+    # como /metrics
+    app.add_api_route("/metrics", metrics, include_in_schema=False)
@@ -0,0 +1,203 @@
+# Imports do sistema
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+# Imports de terceiros
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+# Imports locais
+from core.config import settings
+from core.database import engine
+
+# Execuções do mesmo formato de comando, na mesma requisição, a partir das
+# quais o comando é apontado como possível N+1
+LIMITE_REPETICOES = 3
+
+# Listas de parâmetros (IN (?, ?, ?), VALUES (...), (...)) de tamanhos
+# diferentes têm o mesmo formato
+PADRAO_PARAMETROS = re.compile(
+    r"\(\s*(?:\?|\$\d+|%\(\w+\)s)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s))*\s*\)"
+    r"(?:\s*,\s*\(\s*(?:\?|\$\d+|%\(\w+\)s)"
+    r"(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s))*\s*\))*"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Rota executou mais comandos SQL do que o orçamento declarado.
+
+    Herda de AssertionError para falhar os testes que a provocarem.
+    """
+
+
+class QueryCounter:
+    """
+    Contagem dos comandos SQL executados em uma requisição, por formato.
+    """
+    def __init__(self):
+        self.total: int = 0
+        self.formatos: Counter = Counter()
+
+    def record(self, comando: str):
+        """
+        Registra a execução de um comando.
+
+        Args:
+            comando (str): Comando SQL, com os parâmetros não expandidos.
+        """
+        self.total += 1
+        self.formatos[statement_shape(comando)] += 1
+
+    def repeated(self, limite: int = LIMITE_REPETICOES) -> dict[str, int]:
+        """
+        Formatos executados ``limite`` vezes ou mais.
+
+        Returns:
+            dict: Quantidade de execuções por formato.
+        """
+        return {
+            formato: quantidade
+            for formato, quantidade in self.formatos.items()
+            if quantidade >= limite
+        }
+
+
+# Contador da requisição atual (None fora de uma requisição)
+consultas_requisicao: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "consultas_requisicao", default=None
+)
+
+
+def statement_shape(comando: str) -> str:
+    """
+    Normaliza um comando SQL para comparar o seu formato: espaços e listas
+    de parâmetros de qualquer tamanho são unificados.
+
+    Args:
+        comando (str): Comando SQL.
+    Returns:
+        str: Formato do comando.
+    """
+    return PADRAO_PARAMETROS.sub("(?)", " ".join(comando.split()))
+
+
+def query_budget(limite: int):
+    """
+    Declara a quantidade máxima de comandos SQL de uma rota.
+
+    Deve ser aplicado abaixo do decorador da rota::
+
+        @router.get("/obter_item/{item_id}")
+        @query_budget(1)
+        async def obter_item(...):
+
+    Args:
+        limite (int): Quantidade máxima de comandos por requisição.
+    """
+    def decorador(funcao):
+        funcao.orcamento_consultas = limite
+        return funcao
+
+    return decorador
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    """
+    Conta o comando na requisição atual.
+    """
+    contador = consultas_requisicao.get()
+    if contador is not None:
+        contador.record(statement)
+
+
+def check_budget(scope: dict, contador: QueryCounter):
+    """
+    Aponta os comandos repetidos (possível N+1) e verifica o orçamento da
+    rota.
+
+    Args:
+        scope (dict): Escopo ASGI da requisição.
+        contador (QueryCounter): Comandos executados na requisição.
+    Raises:
+        QueryBudgetExceeded: Se o orçamento foi excedido e
+        QUERY_BUDGET_STRICT estiver ativo.
+    """
+    rota = scope.get("route")
+    caminho = getattr(rota, "path", scope["path"])
+
+    for formato, quantidade in contador.repeated().items():
+        logger.warning(
+            "Possível N+1 em %s %s: comando executado %d vezes: %s",
+            scope["method"], caminho, quantidade, formato
+        )
+
+    orcamento = getattr(
+        getattr(rota, "endpoint", None), "orcamento_consultas", None
+    )
+    if orcamento is None or contador.total <= orcamento:
+        return
+
+    mensagem = (
+        f"{scope['method']} {caminho} executou {contador.total} comandos "
+        f"SQL (orçamento: {orcamento})"
+    )
+    if settings.QUERY_BUDGET_STRICT:
+        raise QueryBudgetExceeded(mensagem)
+
+    logger.error(mensagem)
+
+
+class QueryBudgetMiddleware:
+    """
+    Middleware ASGI que conta os comandos SQL de cada requisição, informa
+    o total no cabeçalho X-Query-Count e verifica o orçamento da rota
+    (veja query_budget).
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        contador = QueryCounter()
+        token = consultas_requisicao.set(contador)
+
+        async def send_count(mensagem):
+            if mensagem["type"] == "http.response.start":
+                MutableHeaders(scope=mensagem).append(
+                    "X-Query-Count", str(contador.total)
+                )
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, send_count)
+        finally:
+            consultas_requisicao.reset(token)
+
+        check_budget(scope, contador)
+
+
+def setup_query_budget(app: FastAPI, motor: Engine = None):
+    """
+    Ativa a contagem de comandos SQL por requisição.
+
+    Args:
+        app (FastAPI): Aplicação.
+        motor (Engine): Engine síncrono (padrão: o de core.database).
+    """
+    event.listen(
+        motor or engine.sync_engine, "before_cursor_execute",
+        before_cursor_execute
+    )
+    app.add_middleware(QueryBudgetMiddleware)
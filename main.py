@@ -1,11 +1,15 @@
 # Imports de terceiros
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
 
 # Imports locais
+from core.body_limit import setup_body_limit
+from core.config import settings
 from core.exceptions import APIException
+from core.metrics import setup_metrics
+from core.query_budget import setup_query_budget
+from src.menu.images import ImmutableStaticFiles
 from src.menu.routers import router as cardapio_router
 
 # Inicialização do FastAPI
@@ -15,8 +19,13 @@ app = FastAPI(
 )
 
 
-# Monta a pasta 'static' para servir arquivos estáticos
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Monta a pasta 'static' para servir arquivos estáticos (criada pelo
+# armazenamento local no primeiro envio de imagem)
+app.mount(
+    "/static",
+    ImmutableStaticFiles(directory="static", check_dir=False),
+    name="static"
+)
 
 # Middlewares
 app.add_middleware(
@@ -30,6 +39,17 @@ app.add_middleware(
 # Rotas/Controles
 app.include_router(cardapio_router)
 
+# Tamanho máximo do corpo das rotas de envio de arquivos
+setup_body_limit(app)
+
+# Métricas do Prometheus
+if settings.METRICS_ENABLED:
+    setup_metrics(app)
+
+# Contagem de comandos SQL por requisição e orçamento por rota
+if settings.DEBUG:
+    setup_query_budget(app)
+
 
 # Manipulador de exceções para APIException
 @app.exception_handler(APIException)
@@ -0,0 +1,244 @@
+# Imports do sistema
+import csv
+import io
+import json
+import mimetypes
+import zipfile
+from typing import Iterator, Optional
+
+# Imports de terceiros
+from anyio import to_thread
+from fastapi import UploadFile
+from pydantic import ValidationError
+
+# Imports locais
+from core.config import settings
+from core.exceptions import APIException
+from src.menu.images import (PADRAO_CHAVE, armazenamento, buffer_limited,
+                             claim_upload, image_key, image_suffix,
+                             limitador_uploads, store_buffered, too_large)
+from src.menu.schemas import (ErroImportacao, FormatoExportacao,
+                              ItemImportacao, RelatorioImportacao)
+
+# Erros detalhados no relatório da importação; os demais são apenas
+# contados
+LIMITE_ERROS = 100
+
+
+def read_rows(origem, formato: FormatoExportacao) -> Iterator[tuple]:
+    """
+    Lê as linhas de um arquivo de itens em CSV (com cabeçalho) ou NDJSON,
+    uma por vez.
+
+    Args:
+        origem: Arquivo aberto para leitura binária.
+        formato (FormatoExportacao): Formato do arquivo.
+    Yields:
+        tuple: Número da linha no arquivo e os campos (dict), ou a mensagem
+        de erro (str) se a linha não puder ser lida.
+    """
+    texto = io.TextIOWrapper(origem, encoding="utf-8-sig", newline="")
+
+    try:
+        if formato == FormatoExportacao.CSV:
+            leitor = csv.DictReader(texto)
+            for campos in leitor:
+                yield leitor.line_num, campos
+            return
+
+        for numero, linha in enumerate(texto, start=1):
+            if not linha.strip():
+                continue
+
+            try:
+                campos = json.loads(linha)
+            except ValueError:
+                yield numero, "JSON inválido."
+                continue
+
+            if not isinstance(campos, dict):
+                yield numero, "A linha deve ser um objeto JSON."
+                continue
+
+            yield numero, campos
+    except UnicodeDecodeError:
+        yield 0, "O arquivo deve estar em UTF-8."
+    finally:
+        # Devolve o arquivo ao UploadFile, que o fecha
+        texto.detach()
+
+
+def validation_message(erro: ValidationError) -> str:
+    """
+    Resume os erros de validação de uma linha.
+    """
+    return "; ".join(
+        f"{'.'.join(map(str, detalhe['loc']))}: {detalhe['msg']}"
+        for detalhe in erro.errors()
+    )
+
+
+class MenuImport:
+    """
+    Importação de itens do cardápio em lote, a partir de um arquivo CSV ou
+    NDJSON e, opcionalmente, de um pacote .zip com as imagens.
+
+    As linhas são validadas uma a uma durante a leitura; as imagens só são
+    gravadas no armazenamento depois da validação de todo o arquivo.
+    """
+    def __init__(
+            self,
+            arquivo: UploadFile,
+            formato: FormatoExportacao = None,
+            imagens: UploadFile = None
+    ):
+        if formato is None:
+            formato = (
+                FormatoExportacao.CSV
+                if (arquivo.filename or "").lower().endswith(".csv")
+                else FormatoExportacao.NDJSON
+            )
+
+        self.arquivo: UploadFile = arquivo
+        self.formato: FormatoExportacao = formato
+        self.pacote: Optional[zipfile.ZipFile] = None
+        if imagens:
+            try:
+                self.pacote = zipfile.ZipFile(imagens.file)
+            except zipfile.BadZipFile:
+                raise APIException(
+                    code=400,
+                    description="O pacote de imagens não é um .zip válido.",
+                    message="Pacote de imagens inválido."
+                )
+
+        # Linhas válidas: número da linha e item
+        self.itens: list[tuple[int, ItemImportacao]] = []
+        self.erros: list[ErroImportacao] = []
+        self.linhas_com_erro: int = 0
+
+    def error(self, linha: int, mensagem: str):
+        """
+        Registra o erro de uma linha.
+        """
+        self.linhas_com_erro += 1
+        if len(self.erros) < LIMITE_ERROS:
+            self.erros.append(ErroImportacao(linha=linha, mensagem=mensagem))
+
+    def _validate_rows(self):
+        for linha, campos in read_rows(self.arquivo.file, self.formato):
+            if isinstance(campos, str):
+                self.error(linha, campos)
+                continue
+
+            if len(self.itens) + self.linhas_com_erro >= (
+                    settings.IMPORT_MAX_ROWS
+            ):
+                self.error(
+                    linha,
+                    f"O arquivo excede {settings.IMPORT_MAX_ROWS} linhas."
+                )
+                break
+
+            try:
+                self.itens.append(
+                    (linha, ItemImportacao.model_validate(campos))
+                )
+            except ValidationError as erro:
+                self.error(linha, validation_message(erro))
+
+    async def validate(self):
+        """
+        Valida as linhas do arquivo e as imagens referenciadas.
+
+        A leitura roda em uma thread, sem bloquear o event loop. Linhas
+        com erro são descartadas e registradas em ``erros``.
+        """
+        await to_thread.run_sync(self._validate_rows)
+
+        invalidas = {}
+        for nome in {item.imagem for _, item in self.itens}:
+            mensagem = await self._check_image(nome)
+            if mensagem:
+                invalidas[nome] = mensagem
+
+        if invalidas:
+            validos = []
+            for linha, item in self.itens:
+                if item.imagem in invalidas:
+                    self.error(linha, invalidas[item.imagem])
+                else:
+                    validos.append((linha, item))
+            self.itens = validos
+
+        self.erros.sort(key=lambda erro: erro.linha)
+
+    async def _check_image(self, nome: str) -> Optional[str]:
+        """
+        Verifica se a imagem está no pacote ou já está armazenada.
+
+        Returns:
+            str: Mensagem de erro, ou None se a imagem é válida.
+        """
+        if self.pacote is not None and nome in self.pacote.NameToInfo:
+            if self.pacote.getinfo(nome).file_size > (
+                    settings.MAX_UPLOAD_SIZE
+            ):
+                return too_large().description
+            return None
+
+        if PADRAO_CHAVE.fullmatch(nome):
+            tamanho = await armazenamento.size(nome)
+            if tamanho is not None and tamanho <= settings.MAX_UPLOAD_SIZE:
+                return None
+
+        return f"Imagem {nome} não encontrada no pacote nem no armazenamento."
+
+    async def store_images(self) -> dict[str, str]:
+        """
+        Grava no armazenamento as imagens do pacote usadas pelas linhas
+        válidas (cada arquivo uma única vez) e confirma as já armazenadas.
+
+        Returns:
+            dict: Referência gravada no banco para cada imagem.
+        """
+        referencias = {}
+
+        for nome in dict.fromkeys(item.imagem for _, item in self.itens):
+            if self.pacote is None or nome not in self.pacote.NameToInfo:
+                referencias[nome] = await claim_upload(nome)
+                continue
+
+            copia = await to_thread.run_sync(
+                self._buffer_entry, nome, limiter=limitador_uploads
+            )
+            if copia is None:
+                raise too_large()
+
+            temporario, sha256 = copia
+            referencias[nome] = await store_buffered(
+                temporario,
+                image_key(sha256, image_suffix(nome)),
+                mimetypes.guess_type(nome)[0]
+            )
+
+        return referencias
+
+    def _buffer_entry(self, nome: str):
+        # O ZipFile não deve ser lido por várias threads ao mesmo tempo:
+        # as imagens são copiadas uma por vez
+        with self.pacote.open(nome) as origem:
+            return buffer_limited(origem, settings.MAX_UPLOAD_SIZE)
+
+    def report(self, importados: int = 0) -> RelatorioImportacao:
+        """
+        Relatório da importação.
+
+        Args:
+            importados (int): Itens gravados no banco.
+        """
+        return RelatorioImportacao(
+            importados=importados,
+            linhas_com_erro=self.linhas_com_erro,
+            erros=self.erros
+        )
@@ -0,0 +1,174 @@
+# Imports do sistema
+import asyncio
+import time
+
+# Imports de terceiros
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Imports locais
+from core.config import settings
+from src.menu.models import ItemModel, normalize_category
+from src.menu.schemas import MenuItem
+from src.menu.search import InvertedIndex
+
+# Quantidade máxima de respostas serializadas mantidas por snapshot
+LIMITE_RESPOSTAS = 256
+
+
+class MenuSnapshot:
+    """
+    Cópia imutável do cardápio em memória.
+    """
+    def __init__(self, versao: int, itens: list[MenuItem]):
+        self.versao: int = versao
+        self.carregado_em: float = time.monotonic()
+        self.itens: list[MenuItem] = itens
+        self.itens_por_id: dict[int, MenuItem] = {
+            item.id: item for item in itens
+        }
+        # Índice pela categoria normalizada, para os filtros por categoria
+        self.itens_por_categoria: dict[str, list[MenuItem]] = {}
+        for item in itens:
+            self.itens_por_categoria.setdefault(
+                normalize_category(item.categoria), []
+            ).append(item)
+        # Respostas já serializadas, indexadas pela categoria filtrada
+        self.respostas: dict[str, tuple[bytes, str]] = {}
+        # Índice de busca textual, criado apenas na primeira busca
+        self._indice_busca: InvertedIndex = None
+
+    @property
+    def indice_busca(self) -> InvertedIndex:
+        """
+        Índice invertido sobre nome e descrição dos itens.
+        """
+        if self._indice_busca is None:
+            self._indice_busca = InvertedIndex(self.itens)
+
+        return self._indice_busca
+
+    def filtrar(self, categoria: str = None) -> list[MenuItem]:
+        """
+        Retorna os itens das categorias que contêm o texto informado,
+        inclusive a categoria exata (como o antigo ilike '%...%').
+
+        A comparação é feita com os nomes das categorias, e não item a
+        item; se apenas uma categoria corresponder, usa o índice em
+        memória.
+
+        Args:
+            categoria (str): Categoria para filtrar os itens do cardápio.
+        Returns:
+            list: Lista de itens do cardápio.
+        """
+        if not categoria:
+            return list(self.itens)
+
+        normalizada = normalize_category(categoria)
+        categorias = [
+            nome for nome in self.itens_por_categoria if normalizada in nome
+        ]
+
+        # Caminho rápido: uma única categoria
+        if len(categorias) == 1:
+            return list(self.itens_por_categoria[categorias[0]])
+
+        return [
+            item for item in self.itens
+            if normalize_category(item.categoria) in categorias
+        ]
+
+    def guardar_resposta(self, chave: str, resposta: tuple[bytes, str]):
+        """
+        Memoriza uma resposta serializada, respeitando LIMITE_RESPOSTAS.
+        """
+        if len(self.respostas) < LIMITE_RESPOSTAS:
+            self.respostas[chave] = resposta
+
+
+class MenuCache:
+    """
+    Cache versionado do cardápio com expiração (TTL) e invalidação
+    explícita.
+
+    Cada processo mantém a sua própria cópia. A invalidação feita pelas
+    escritas vale para o processo atual; nos demais workers o TTL limita
+    o tempo em que um cardápio desatualizado pode ser servido.
+    """
+    def __init__(self, ttl: float):
+        self.ttl: float = ttl
+        self.versao: int = 0
+        self._snapshot: MenuSnapshot = None
+        self._lock = asyncio.Lock()
+
+    def _valido(self, snapshot: MenuSnapshot) -> bool:
+        return (
+            snapshot is not None and
+            snapshot.versao == self.versao and
+            time.monotonic() - snapshot.carregado_em < self.ttl
+        )
+
+    async def get(self, db: AsyncSession) -> MenuSnapshot:
+        """
+        Retorna o cardápio em cache, recarregando-o do banco se necessário.
+
+        Args:
+            db (AsyncSession): Sessão assíncrona do banco de dados.
+        Returns:
+            MenuSnapshot: Cópia atual do cardápio.
+        """
+        snapshot = self._snapshot
+        if self._valido(snapshot):
+            return snapshot
+
+        # Apenas uma requisição recarrega o cardápio por vez
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._valido(snapshot):
+                return snapshot
+
+            versao = self.versao
+            itens = (await db.scalars(select(ItemModel))).all()
+            snapshot = MenuSnapshot(
+                versao, [MenuItem(**item.__dict__) for item in itens]
+            )
+
+            # Descarta a carga se o cardápio mudou durante a consulta
+            if versao == self.versao:
+                self._snapshot = snapshot
+
+            return snapshot
+
+    def invalidate(self):
+        """
+        Incrementa a versão do cardápio, descartando a cópia em cache.
+        """
+        self.versao += 1
+        self._snapshot = None
+
+
+menu_cache = MenuCache(ttl=settings.MENU_CACHE_TTL)
+
+
+def etag_match(if_none_match: str, etag: str) -> bool:
+    """
+    Verifica se o cabeçalho If-None-Match corresponde ao ETag informado.
+
+    Args:
+        if_none_match (str): Valor do cabeçalho If-None-Match.
+        etag (str): ETag atual do recurso.
+    Returns:
+        bool: True se o cliente já possui a versão atual.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # A comparação do If-None-Match é fraca: ignora o prefixo W/
+    return any(
+        valor.strip().removeprefix("W/") == etag
+        for valor in if_none_match.split(",")
+    )
@@ -1,50 +1,218 @@
 # Imports do sistema
+import csv
+import hashlib
+import io
+import json
 from collections import Counter
-from pathlib import Path
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Mapping, Optional
+from zoneinfo import ZoneInfo
 
 # Imports de terceiros
 from fastapi import File, UploadFile
-from sqlalchemy.orm import Session
+from sqlalchemy import (Float, bindparam, cast, delete, insert, literal_column,
+                        null, or_, select, text, update)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 
 # Imports locais
-from src.menu.models import ItemModel, PedidoItensModel, PedidoModel
-from src.menu.schemas import (DetalhePedido, MenuItem, PedidoClienteInput,
-                              PedidoClienteOutput, StatusPedido)
+from core.config import settings
+from core.database import SessionLocal
+from core.schemas import SuccessResponse
+from src.menu.cache import menu_cache
+from src.menu.events import publish_order_event
+from src.menu.images import (create_variants, ensure_stored, obtain_image,
+                             remove_image, remove_variants, storage_key)
+from src.menu.models import (CONFIG_BUSCA, STATUS_ATIVOS, ArquivoImagemModel,
+                             CategoriaResumoModel, ChaveIdempotenciaModel,
+                             ItemModel, PedidoItensModel, PedidoModel,
+                             VendaDiariaCategoriaModel, VendaDiariaItemModel,
+                             normalize_category, to_cents, utc_now)
+from src.menu.schemas import (CategoriaResumo, DetalhePedido,
+                              FormatoExportacao, ItemImportacao, MenuItem,
+                              PaginaPedidos, PedidoClienteInput,
+                              PedidoClienteOutput, StatusPedido,
+                              TipoEventoPedido, VendaCategoria, VendaDiaria,
+                              VendaItem)
+
+LOTE_EXPORTACAO = 1000  # Linhas lidas por vez na exportação de pedidos
+
+# Colunas dos arquivos de importação e exportação de itens
+COLUNAS_ITENS = ["nome", "descricao", "preco", "categoria", "imagem"]
+
+# Colunas gravadas pela importação de itens
+COLUNAS_IMPORTACAO = ["nome", "descricao", "preco", "categoria", "url_imagem",
+                      "imagens"]
+
+# Colunas das linhas dos pedidos usadas nos resumos de vendas
+COLUNAS_VENDAS = (
+    PedidoItensModel.item_id,
+    PedidoItensModel.nome,
+    PedidoItensModel.categoria,
+    PedidoItensModel.quantidade,
+    PedidoItensModel.preco_unitario_centavos,
+)
+
+
+async def get_menu_payload(
+        db: AsyncSession,
+        categoria: str = None
+):
+    """
+    Retorna a resposta já serializada do cardápio e o seu ETag.
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent  # Raiz do projeto
-IMAGES_DIR = BASE_DIR / "static" / "images"  # Diretório das imagens
+    A serialização é feita uma única vez por versão do cardápio e
+    categoria; as chamadas seguintes reutilizam os mesmos bytes. Com o
+    cache desativado (MENU_CACHE_TTL = 0), a categoria é consultada
+    diretamente no banco por get_items_by_category.
 
+    Args:
+        categoria (str): Categoria para filtrar os itens do cardápio.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+    Returns:
+        tuple: Corpo JSON da resposta e ETag, ou None se não houver itens.
+    """
+    if categoria and menu_cache.ttl <= 0:
+        # Sem cache: consulta apenas a categoria, pelo índice do banco
+        return serialize_menu(await get_items_by_category(db, categoria))
 
-def get_menu(
-        db: Session,
-        categoria: str = None
+    # Obtém o cardápio do cache em memória
+    menu = await menu_cache.get(db)
+
+    chave = normalize_category(categoria) if categoria else ""
+    resposta = menu.respostas.get(chave)
+
+    if resposta is None:
+        resposta = serialize_menu(menu.filtrar(categoria))
+
+        if resposta is None:
+            return None
+
+        menu.guardar_resposta(chave, resposta)
+
+    return resposta
+
+
+def serialize_menu(itens: list[MenuItem]):
+    """
+    Serializa a resposta do cardápio e calcula o seu ETag.
+
+    Args:
+        itens (list): Itens do cardápio.
+    Returns:
+        tuple: Corpo JSON da resposta e ETag, ou None se não houver itens.
+    """
+    if not itens:
+        return None
+
+    corpo = SuccessResponse(
+        data=itens,
+        message="Cardápio obtido com sucesso.",
+    ).model_dump_json().encode()
+    etag = f'"{hashlib.sha256(corpo).hexdigest()[:32]}"'
+
+    return corpo, etag
+
+
+async def get_items_by_category(
+        db: AsyncSession,
+        categoria: str
 ):
     """
-    Retorna o cardápio completo ou filtrado por categoria.
+    Busca no banco os itens das categorias que contêm o texto informado
+    (inclusive a categoria exata), como o antigo ilike '%...%', na coluna
+    categoria_normalizada. No PostgreSQL o LIKE é atendido pelo índice de
+    trigramas.
 
     Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
         categoria (str): Categoria para filtrar os itens do cardápio.
-        db (Session): Sessão do banco de dados.
     Returns:
         list: Lista de itens do cardápio.
     """
-    # Verifica se a categoria foi fornecida
+    itens = (
+        await db.scalars(
+            select(ItemModel)
+            .where(
+                ItemModel.categoria_normalizada.contains(
+                    normalize_category(categoria), autoescape=True
+                )
+            )
+            .order_by(ItemModel.id)
+        )
+    ).all()
+
+    return [MenuItem(**item.__dict__) for item in itens]
+
+
+async def search_items(
+        db: AsyncSession,
+        texto: str,
+        categoria: str = None,
+        pagina: int = 1,
+        limite: int = 20
+):
+    """
+    Busca itens pelo nome e pela descrição, ordenados por relevância.
+
+    No PostgreSQL usa a coluna tsvector itens.busca (português, sem
+    acentos) e o seu índice GIN; nos demais bancos usa o índice invertido
+    em memória do cardápio em cache.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        texto (str): Texto da busca.
+        categoria (str): Categoria para filtrar os itens (exata).
+        pagina (int): Número da página, a partir de 1.
+        limite (int): Quantidade máxima de itens na página.
+    Returns:
+        list: Lista de itens do cardápio.
+    """
+    inicio = (pagina - 1) * limite
+
+    if db.bind.dialect.name != "postgresql":
+        menu = await menu_cache.get(db)
+        itens = menu.indice_busca.search(texto)
+
+        if categoria:
+            normalizada = normalize_category(categoria)
+            itens = [
+                item for item in itens
+                if normalize_category(item.categoria) == normalizada
+            ]
+
+        return itens[inicio:inicio + limite]
+
+    busca = literal_column("itens.busca")
+    consulta_texto = func.websearch_to_tsquery(
+        literal_column(f"'{CONFIG_BUSCA}'::regconfig"), texto
+    )
+    relevancia = func.ts_rank(busca, consulta_texto)
+
+    consulta = select(ItemModel).where(busca.op("@@")(consulta_texto))
+
     if categoria:
-        # Filtra os itens do cardápio pela categoria
-        menu = db.query(ItemModel).filter(
-            ItemModel.categoria.ilike(f"%{categoria.lower()}%")
-        ).all()
-    else:
-        # Retorna todos os itens do cardápio
-        menu = db.query(ItemModel).all()
+        consulta = consulta.where(
+            ItemModel.categoria_normalizada == normalize_category(categoria)
+        )
 
-    # Converte os itens do cardápio para o formato desejado
-    return [MenuItem(**item.__dict__) for item in menu]
+    itens = (
+        await db.scalars(
+            consulta
+            .order_by(relevancia.desc(), ItemModel.id)
+            .offset(inicio)
+            .limit(limite)
+        )
+    ).all()
 
+    return [MenuItem(**item.__dict__) for item in itens]
 
-def get_item_by_id(
-        db: Session,
+
+async def get_item_by_id(
+        db: AsyncSession,
         item_id: int
 ):
     """
@@ -52,42 +220,284 @@ def get_item_by_id(
 
     Args:
         item_id (int): ID do item.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         MenuItem: Item do cardápio.
     """
-    # Busca o item pelo ID no banco de dados
-    item = db.query(ItemModel).filter(ItemModel.id == item_id).first()
+    # Busca o item pelo ID no cache do cardápio
+    menu = await menu_cache.get(db)
 
-    # Verifica se o item foi encontrado
-    if not item:
-        return None
+    return menu.itens_por_id.get(item_id)
 
-    # Converte o item para o formato desejado
-    return MenuItem(**item.__dict__)
+
+async def get_all_orders(
+        db: AsyncSession,
+        limite: int = 50,
+        cursor: int = None,
+        status: StatusPedido = None,
+        id_inicial: int = None,
+        id_final: int = None
+):
+    """
+    Retorna uma página de pedidos usando paginação por chave (keyset).
+
+    Os pedidos são ordenados pelo ID; a próxima página começa após o
+    último ID retornado, sem OFFSET, então o custo não cresce com o
+    histórico de pedidos.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        limite (int): Quantidade máxima de pedidos na página.
+        cursor (int): ID do último pedido da página anterior.
+        status (StatusPedido): Filtra os pedidos pelo status.
+        id_inicial (int): Menor ID de pedido (inclusivo).
+        id_final (int): Maior ID de pedido (inclusivo).
+    Returns:
+        PaginaPedidos: Pedidos da página e o cursor da próxima página.
+    """
+    consulta = select(
+        PedidoModel.id, PedidoModel.status, PedidoModel.preco_total
+    )
+
+    # Aplica os filtros informados
+    if cursor is not None:
+        consulta = consulta.where(PedidoModel.id > cursor)
+    if status is not None:
+        consulta = consulta.where(PedidoModel.status == status.value)
+    if id_inicial is not None:
+        consulta = consulta.where(PedidoModel.id >= id_inicial)
+    if id_final is not None:
+        consulta = consulta.where(PedidoModel.id <= id_final)
+
+    return await fetch_order_page(db, consulta, limite)
 
 
-def get_all_orders(db: Session):
+async def get_kitchen_queue(
+        db: AsyncSession,
+        limite: int = 100,
+        cursor: int = None,
+        status: StatusPedido = None
+):
     """
-    Retorna todos os pedidos realizados.
+    Retorna a fila da cozinha: os pedidos ativos (PRE-PEDIDO e PENDENTE)
+    na ordem de chegada, paginados pelo ID.
+
+    A consulta usa o índice parcial ix_pedidos_ativos, que contém apenas
+    os pedidos ativos; o custo não cresce com o histórico de pedidos
+    entregues e cancelados.
 
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        limite (int): Quantidade máxima de pedidos na página.
+        cursor (int): ID do último pedido da página anterior.
+        status (StatusPedido): Filtra por um dos status ativos.
     Returns:
-        list: Lista de pedidos.
+        PaginaPedidos: Pedidos da página e o cursor da próxima página.
     """
-    # Busca todos os pedidos no banco de dados
-    pedidos = db.query(PedidoModel).all()
+    # Os status são enviados como literais: com parâmetros, o plano
+    # genérico do PostgreSQL (prepared statements) não pode usar o índice
+    # parcial, pois não comprova que o filtro está contido no do índice
+    ativos = bindparam(
+        "status_ativos",
+        [status.value] if status else list(STATUS_ATIVOS),
+        expanding=True,
+        literal_execute=True
+    )
+    consulta = select(
+        PedidoModel.id, PedidoModel.status, PedidoModel.preco_total
+    ).where(PedidoModel.status.in_(ativos))
 
-    return [
-        PedidoClienteOutput(
-            id=pedido.id,
-            status=pedido.status,
-            preco_total=pedido.preco_total
-        ) for pedido in pedidos
-    ]
+    if cursor is not None:
+        consulta = consulta.where(PedidoModel.id > cursor)
+
+    return await fetch_order_page(db, consulta, limite)
+
+
+async def fetch_order_page(
+        db: AsyncSession,
+        consulta,
+        limite: int
+) -> PaginaPedidos:
+    """
+    Executa uma consulta de pedidos (id, status, preco_total) ordenada
+    pelo ID e monta a página com o cursor da próxima.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        consulta (Select): Consulta já filtrada.
+        limite (int): Quantidade máxima de pedidos na página.
+    Returns:
+        PaginaPedidos: Pedidos da página e o cursor da próxima página.
+    """
+    # Busca um pedido a mais para saber se existe uma próxima página
+    pedidos = (
+        await db.execute(
+            consulta.order_by(PedidoModel.id).limit(limite + 1)
+        )
+    ).all()
+
+    proximo_cursor = None
+    if len(pedidos) > limite:
+        pedidos = pedidos[:limite]
+        proximo_cursor = pedidos[-1].id
+
+    return PaginaPedidos(
+        pedidos=[
+            PedidoClienteOutput(
+                id=pedido.id,
+                status=pedido.status,
+                preco_total=pedido.preco_total
+            ) for pedido in pedidos
+        ],
+        proximo_cursor=proximo_cursor
+    )
+
+
+async def export_orders(
+        db: AsyncSession,
+        formato: FormatoExportacao = FormatoExportacao.NDJSON
+):
+    """
+    Exporta todos os pedidos com os seus itens, em partes.
+
+    A consulta usa um cursor no servidor (yield_per), então apenas um lote
+    de linhas fica em memória por vez, independentemente do tamanho da
+    tabela.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        formato (FormatoExportacao): Formato de saída (ndjson ou csv).
+    Yields:
+        str: Trechos do arquivo exportado.
+    """
+    consulta = (
+        select(
+            PedidoModel.id,
+            PedidoModel.status,
+            PedidoModel.preco_total,
+            PedidoItensModel.item_id,
+            PedidoItensModel.nome,
+            PedidoItensModel.quantidade,
+            (
+                cast(PedidoItensModel.preco_unitario_centavos, Float) / 100
+            ).label("preco")
+        )
+        .outerjoin(
+            PedidoItensModel, PedidoItensModel.pedido_id == PedidoModel.id
+        )
+        .order_by(PedidoModel.id, PedidoItensModel.id)
+        .execution_options(yield_per=LOTE_EXPORTACAO)
+    )
+    resultado = await db.stream(consulta)
+
+    if formato == FormatoExportacao.CSV:
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        escritor.writerow([
+            "pedido_id", "status", "preco_total", "item_id",
+            "item_nome", "quantidade", "preco_unitario"
+        ])
+
+        async for particao in resultado.partitions():
+            escritor.writerows(particao)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Envia o cabeçalho mesmo quando não há pedidos
+        if buffer.tell():
+            yield buffer.getvalue()
+        return
+
+    # NDJSON: uma linha por pedido, agrupando os itens consecutivos
+    pedido = None
+
+    async for particao in resultado.partitions():
+        linhas = []
+
+        for linha in particao:
+            if pedido is None or pedido["id"] != linha.id:
+                if pedido is not None:
+                    linhas.append(json.dumps(pedido, ensure_ascii=False))
+                pedido = {
+                    "id": linha.id,
+                    "status": linha.status,
+                    "preco_total": linha.preco_total,
+                    "itens": []
+                }
+
+            # Pedidos sem linhas vêm do outer join com nome nulo
+            if linha.nome is not None:
+                pedido["itens"].append({
+                    "item_id": linha.item_id,
+                    "nome": linha.nome,
+                    "quantidade": linha.quantidade,
+                    "preco_unitario": linha.preco
+                })
+
+        if linhas:
+            yield "\n".join(linhas) + "\n"
+
+    if pedido is not None:
+        yield json.dumps(pedido, ensure_ascii=False) + "\n"
+
+
+async def export_items(
+        db: AsyncSession,
+        formato: FormatoExportacao = FormatoExportacao.NDJSON
+):
+    """
+    Exporta os itens do cardápio, em partes, no formato aceito pela
+    importação (import_items): as imagens são informadas pela chave no
+    armazenamento, então o arquivo pode ser importado em outra loja sem
+    reenviá-las.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        formato (FormatoExportacao): Formato de saída (ndjson ou csv).
+    Yields:
+        str: Trechos do arquivo exportado.
+    """
+    consulta = (
+        select(
+            ItemModel.nome,
+            ItemModel.descricao,
+            ItemModel.preco,
+            ItemModel.categoria,
+            ItemModel.url_imagem
+        )
+        .order_by(ItemModel.id)
+        .execution_options(yield_per=LOTE_EXPORTACAO)
+    )
+    resultado = await db.stream(consulta)
+
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    if formato == FormatoExportacao.CSV:
+        escritor.writerow(COLUNAS_ITENS)
+
+    async for particao in resultado.partitions():
+        for *campos, url_imagem in particao:
+            linha = [*campos, storage_key(url_imagem)]
+
+            if formato == FormatoExportacao.CSV:
+                escritor.writerow(linha)
+            else:
+                buffer.write(json.dumps(
+                    dict(zip(COLUNAS_ITENS, linha)), ensure_ascii=False
+                ) + "\n")
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
 
+    # Envia o cabeçalho do CSV mesmo quando não há itens
+    if buffer.tell():
+        yield buffer.getvalue()
 
-def get_detail_order(
-        db: Session,
+
+async def get_detail_order(
+        db: AsyncSession,
         order_id: int
 ):
     """
@@ -95,94 +505,245 @@ def get_detail_order(
 
     Args:
         order_id (int): ID do pedido.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
 
     Returns:
         DetalhePedido: Detalhes do pedido.
     """
     # Busca o pedido pelo ID no banco de dados
-    pedido = db.query(PedidoModel).filter(PedidoModel.id == order_id).first()
+    pedido = await db.get(PedidoModel, order_id)
 
     # Verifica se o pedido foi encontrado
     if not pedido:
         return None
 
-    # Busca os itens associados ao pedido com join para ItemModel
+    # Busca os itens do pedido: nome e preço foram registrados na linha
+    # quando o item entrou no pedido, sem join com a tabela de itens
     itens_pedido = (
-        db.query(PedidoItensModel, ItemModel)
-        .join(ItemModel, PedidoItensModel.item_id == ItemModel.id)
-        .filter(PedidoItensModel.pedido_id == order_id)
-        .all()
-    )
-
-    # Extrai informações dos itens
-    itens_nomes = [item.ItemModel.nome for item in itens_pedido]
-    quantidades = [item.PedidoItensModel.quantidade for item in itens_pedido]
-    precos_unitarios = [item.ItemModel.preco for item in itens_pedido]
+        await db.execute(
+            select(
+                PedidoItensModel.nome,
+                PedidoItensModel.quantidade,
+                PedidoItensModel.preco_unitario_centavos,
+                PedidoItensModel.subtotal_centavos
+            )
+            .where(PedidoItensModel.pedido_id == order_id)
+            .order_by(PedidoItensModel.id)
+        )
+    ).all()
 
     return DetalhePedido(
         id=pedido.id,
-        itens=itens_nomes,
-        quantidade=quantidades,
-        precos_unitario=precos_unitarios,
+        itens=[item.nome for item in itens_pedido],
+        quantidade=[item.quantidade for item in itens_pedido],
+        precos_unitario=[
+            item.preco_unitario_centavos / 100 for item in itens_pedido
+        ],
+        subtotais=[item.subtotal_centavos / 100 for item in itens_pedido],
         preco_total=pedido.preco_total
     )
 
 
-def get_all_categories(
-        db: Session
-):
+async def get_all_categories(
+        db: AsyncSession
+) -> list[CategoriaResumo]:
     """
-    Retorna todas as categorias disponíveis.
+    Retorna todas as categorias disponíveis, com a quantidade de itens e a
+    faixa de preço de cada uma, em ordem alfabética.
+
+    Lê apenas o resumo das categorias (pela chave primária), sem carregar
+    os itens do cardápio.
 
     Args:
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         list: Lista de categorias.
     """
-    # Busca todas as categorias no banco de dados
-    categorias = db.query(ItemModel.categoria).distinct().all()
+    resumos = await db.scalars(
+        select(CategoriaResumoModel).order_by(CategoriaResumoModel.categoria)
+    )
+
+    return [
+        CategoriaResumo(
+            nome=resumo.categoria.upper(),
+            quantidade_itens=resumo.quantidade_itens,
+            preco_minimo=resumo.preco_minimo,
+            preco_maximo=resumo.preco_maximo
+        )
+        for resumo in resumos
+    ]
+
+
+def sales_period(consulta, modelo, inicio: date = None, fim: date = None):
+    """
+    Restringe uma consulta aos resumos de vendas de um período.
+
+    Args:
+        consulta (Select): Consulta sobre a tabela do resumo.
+        modelo: Modelo do resumo (VendaDiariaItemModel ou
+            VendaDiariaCategoriaModel).
+        inicio (date): Primeiro dia do período (inclusive).
+        fim (date): Último dia do período (inclusive).
+    Returns:
+        Select: Consulta filtrada.
+    """
+    if inicio is not None:
+        consulta = consulta.where(modelo.dia >= inicio)
+    if fim is not None:
+        consulta = consulta.where(modelo.dia <= fim)
 
-    # Extrai os nomes das categorias
-    return [categoria[0].upper() for categoria in categorias]
+    return consulta
+
+
+async def get_daily_sales(
+        db: AsyncSession,
+        inicio: date = None,
+        fim: date = None
+) -> list[VendaDiaria]:
+    """
+    Retorna a quantidade vendida e a receita de cada dia do período, a
+    partir do resumo por dia e categoria.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        inicio (date): Primeiro dia do período (inclusive).
+        fim (date): Último dia do período (inclusive).
+    Returns:
+        list: Vendas por dia, em ordem cronológica.
+    """
+    consulta = sales_period(
+        select(
+            VendaDiariaCategoriaModel.dia,
+            func.sum(VendaDiariaCategoriaModel.quantidade),
+            func.sum(VendaDiariaCategoriaModel.receita_centavos)
+        )
+        .group_by(VendaDiariaCategoriaModel.dia)
+        .having(func.sum(VendaDiariaCategoriaModel.quantidade) > 0)
+        .order_by(VendaDiariaCategoriaModel.dia),
+        VendaDiariaCategoriaModel, inicio, fim
+    )
+
+    return [
+        VendaDiaria(dia=dia, quantidade=quantidade, receita=receita / 100)
+        for dia, quantidade, receita in await db.execute(consulta)
+    ]
+
+
+async def get_top_items(
+        db: AsyncSession,
+        inicio: date = None,
+        fim: date = None,
+        limite: int = 10
+) -> list[VendaItem]:
+    """
+    Retorna os itens de maior receita no período, a partir do resumo por
+    dia e item.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        inicio (date): Primeiro dia do período (inclusive).
+        fim (date): Último dia do período (inclusive).
+        limite (int): Quantidade de itens.
+    Returns:
+        list: Itens mais vendidos, da maior para a menor receita.
+    """
+    receita = func.sum(VendaDiariaItemModel.receita_centavos)
+    quantidade = func.sum(VendaDiariaItemModel.quantidade)
+    consulta = sales_period(
+        select(
+            VendaDiariaItemModel.item_id,
+            func.max(VendaDiariaItemModel.nome),
+            quantidade,
+            receita
+        )
+        .group_by(VendaDiariaItemModel.item_id)
+        .having(quantidade > 0)
+        .order_by(
+            receita.desc(), quantidade.desc(), VendaDiariaItemModel.item_id
+        )
+        .limit(limite),
+        VendaDiariaItemModel, inicio, fim
+    )
+
+    return [
+        VendaItem(
+            item_id=item_id,
+            nome=nome,
+            quantidade=total,
+            receita=centavos / 100
+        )
+        for item_id, nome, total, centavos in await db.execute(consulta)
+    ]
 
 
-def create_item(
-        db: Session,
+async def get_category_sales(
+        db: AsyncSession,
+        inicio: date = None,
+        fim: date = None
+) -> list[VendaCategoria]:
+    """
+    Retorna as vendas de cada categoria no período e a sua participação na
+    receita, a partir do resumo por dia e categoria.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        inicio (date): Primeiro dia do período (inclusive).
+        fim (date): Último dia do período (inclusive).
+    Returns:
+        list: Vendas por categoria, da maior para a menor receita.
+    """
+    receita = func.sum(VendaDiariaCategoriaModel.receita_centavos)
+    quantidade = func.sum(VendaDiariaCategoriaModel.quantidade)
+    consulta = sales_period(
+        select(VendaDiariaCategoriaModel.categoria, quantidade, receita)
+        .group_by(VendaDiariaCategoriaModel.categoria)
+        .having(quantidade > 0)
+        .order_by(receita.desc(), VendaDiariaCategoriaModel.categoria),
+        VendaDiariaCategoriaModel, inicio, fim
+    )
+    categorias = (await db.execute(consulta)).all()
+    receita_total = sum(centavos for _, _, centavos in categorias)
+
+    return [
+        VendaCategoria(
+            categoria=categoria.upper(),
+            quantidade=total,
+            receita=centavos / 100,
+            participacao=centavos / receita_total if receita_total else 0.0
+        )
+        for categoria, total, centavos in categorias
+    ]
+
+
+async def create_item(
+        db: AsyncSession,
         nome: str,
         descricao: str,
         preco: float,
         categoria: str,
-        arquivo: UploadFile = File(...)
+        arquivo: UploadFile = File(None),
+        chave_imagem: str = None
 ):
     """
     Cadastra um novo item no cardápio.
 
     Args:
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
         nome (str): Nome do item.
         descricao (str): Descrição do item.
         preco (float): Preço do item.
         categoria (str): Categoria do item.
         arquivo (UploadFile): Imagem do item.
+        chave_imagem (str): Chave de uma imagem enviada diretamente ao
+            armazenamento, no lugar de ``arquivo``.
     Returns:
-        MenuItem: Item cadastrado.
+        MenuItem: Item cadastrado, ou None se nenhuma imagem foi informada.
     """
-    # Certifique-se de que o diretório de imagens existe
-    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Obtém o maior ID existente ou 0 se a tabela estiver vazia
-    ultimo_id = db.query(func.max(ItemModel.id)).scalar() or 0
+    # Salva a imagem no armazenamento, nomeada pelo seu conteúdo
+    caminho_arquivo = await obtain_image(arquivo, chave_imagem)
 
-    # Evita sobreposição de arquivos com o mesmo nome
-    arquivo.filename = f'{ultimo_id + 1}_{arquivo.filename}'
-
-    # Constroi o caminho completo do arquivo
-    caminho_arquivo = f'{IMAGES_DIR / arquivo.filename}'
-
-    # Salva o arquivo no diretório de imagens
-    with open(caminho_arquivo, "wb+") as objeto_arquivo:
-        objeto_arquivo.write(arquivo.file.read())
+    if not caminho_arquivo:
+        return None
 
     # Cria um novo item
     novo_item = ItemModel(
@@ -195,16 +756,186 @@ def create_item(
 
     # Adiciona o item ao banco de dados
     db.add(novo_item)
-    db.commit()
-    db.refresh(novo_item)
+    await add_image_reference(db, caminho_arquivo)
+    await db.flush()
+    await refresh_category_summary(db, [categoria])
+    await db.commit()
+    await db.refresh(novo_item)
+
+    # Invalida o cardápio em cache
+    menu_cache.invalidate()
 
     return novo_item
 
 
-def place_order(
-        db: Session,
+async def process_item_image(
+        item_id: int,
+        caminho: str
+):
+    """
+    Gera as variantes da imagem de um item e as registra no banco.
+
+    Executada em segundo plano após o cadastro ou a atualização da imagem,
+    por isso abre a sua própria sessão.
+
+    Args:
+        item_id (int): ID do item.
+        caminho (str): Caminho da imagem original do item.
+    """
+    variantes = await create_variants(caminho)
+
+    if not variantes:
+        return
+
+    async with SessionLocal() as db:
+        # Só registra se a imagem do item não foi trocada nesse meio tempo
+        resultado = await db.execute(
+            update(ItemModel)
+            .where(ItemModel.id == item_id, ItemModel.url_imagem == caminho)
+            .values(imagens=variantes)
+        )
+        await db.commit()
+
+        if resultado.rowcount:
+            # Invalida o cardápio em cache
+            menu_cache.invalidate()
+            return
+
+        # Remove as variantes apenas se nenhum item usa mais a imagem
+        referencias = await db.scalar(
+            select(ArquivoImagemModel.referencias)
+            .where(ArquivoImagemModel.caminho == caminho)
+        )
+
+    if not referencias:
+        await remove_variants(variantes)
+
+
+async def import_items(
+        db: AsyncSession,
+        itens: list[ItemImportacao],
+        referencias: dict[str, str]
+) -> list[str]:
+    """
+    Cadastra vários itens do cardápio em uma única transação.
+
+    No PostgreSQL os itens são gravados com COPY; nos demais bancos, com
+    um único INSERT executado para todas as linhas (executemany).
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        itens (list): Itens já validados.
+        referencias (dict): Referência armazenada de cada imagem dos itens.
+    Returns:
+        list: Caminhos das imagens que ainda não têm variantes (veja
+        process_imported_images).
+    """
+    if not itens:
+        return []
+
+    caminhos = [referencias[item.imagem] for item in itens]
+
+    # Imagens já usadas por outros itens reaproveitam as suas variantes
+    variantes = {
+        caminho: imagens
+        for caminho, imagens in await db.execute(
+            select(ItemModel.url_imagem, ItemModel.imagens).where(
+                ItemModel.url_imagem.in_(set(caminhos)),
+                ItemModel.imagens.is_not(None)
+            )
+        )
+        if imagens
+    }
+
+    # Também inicia a transação, antes do COPY
+    await add_image_references(db, Counter(caminhos))
+
+    registros = [
+        (item.nome, item.descricao, item.preco, item.categoria, caminho)
+        for item, caminho in zip(itens, caminhos)
+    ]
+
+    if db.bind.dialect.name == "postgresql":
+        conexao = await (await db.connection()).get_raw_connection()
+        await conexao.driver_connection.copy_records_to_table(
+            ItemModel.__tablename__,
+            records=[
+                (
+                    *registro,
+                    json.dumps(variantes[registro[-1]])
+                    if registro[-1] in variantes else None
+                )
+                for registro in registros
+            ],
+            columns=COLUNAS_IMPORTACAO
+        )
+    else:
+        # null() grava NULL, e não o JSON null, nas imagens sem variantes
+        await db.execute(
+            insert(ItemModel),
+            [
+                dict(zip(
+                    COLUNAS_IMPORTACAO,
+                    (*registro, variantes.get(registro[-1], null()))
+                ))
+                for registro in registros
+            ]
+        )
+
+    await refresh_category_summary(db, {item.categoria for item in itens})
+    await db.commit()
+
+    # Invalida o cardápio em cache
+    menu_cache.invalidate()
+
+    return list(dict.fromkeys(
+        caminho for caminho in caminhos if caminho not in variantes
+    ))
+
+
+async def process_imported_images(caminhos: list[str]):
+    """
+    Gera as variantes das imagens importadas e as registra, com um único
+    UPDATE, em todos os itens que as usam e ainda não as têm.
+
+    Executada em segundo plano após a importação de itens.
+
+    Args:
+        caminhos (list): Caminhos das imagens importadas.
+    """
+    atualizacoes = []
+    for caminho in caminhos:
+        variantes = await create_variants(caminho)
+        if variantes:
+            atualizacoes.append(
+                {"caminho": caminho, "variantes": variantes}
+            )
+
+    if not atualizacoes:
+        return
+
+    tabela = ItemModel.__table__
+    async with SessionLocal() as db:
+        await db.execute(
+            update(tabela)
+            .where(
+                tabela.c.url_imagem == bindparam("caminho"),
+                tabela.c.imagens.is_(None)
+            )
+            .values(imagens=bindparam("variantes")),
+            atualizacoes
+        )
+        await db.commit()
+
+    # Invalida o cardápio em cache
+    menu_cache.invalidate()
+
+
+async def place_order(
+        db: AsyncSession,
         pedido: PedidoClienteInput,
-        status: StatusPedido
+        status: StatusPedido,
+        chave_idempotencia: str = None
 ):
     """
     Processa um pedido do cliente.
@@ -212,7 +943,9 @@ def place_order(
     Args:
         pedido (PedidoClienteInput): Pedido do cliente.
         status (StatusPedido): Status do pedido.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        chave_idempotencia (str): Chave já reservada nesta transação
+            (claim_idempotency_key), associada ao pedido criado.
 
     Returns:
         PedidoModel: Detalhes do pedido.
@@ -222,18 +955,42 @@ def place_order(
     """
     # Contar quantidades de cada item
     itens_quantidades = Counter(pedido.itens)
-    preco_total = 0.0
-    itens_validados = []
 
-    # Validar todos os itens antes de criar o pedido
-    for item_id, quantidade in itens_quantidades.items():
-        item = get_item_by_id(db, item_id)
+    # Valida todos os itens do pedido em uma única consulta (IN)
+    itens = {
+        item.id: item
+        for item in await db.execute(
+            select(
+                ItemModel.id,
+                ItemModel.nome,
+                ItemModel.categoria_normalizada,
+                ItemModel.preco
+            ).where(ItemModel.id.in_(itens_quantidades))
+        )
+    }
 
-        if not item:
-            return None
+    # Algum item do pedido não foi encontrado
+    if len(itens) != len(itens_quantidades):
+        return None
 
-        itens_validados.append((item, quantidade))
-        preco_total += item.preco * quantidade
+    # Registra o nome, a categoria e o preço (em centavos) de cada item
+    # neste momento
+    linhas = [
+        {
+            "item_id": item_id,
+            "quantidade": quantidade,
+            "nome": itens[item_id].nome,
+            "categoria": itens[item_id].categoria_normalizada,
+            "preco_unitario_centavos": to_cents(itens[item_id].preco)
+        }
+        for item_id, quantidade in itens_quantidades.items()
+    ]
+
+    # Soma exata em centavos
+    preco_total = sum(
+        linha["preco_unitario_centavos"] * linha["quantidade"]
+        for linha in linhas
+    ) / 100
 
     # Criar novo pedido apenas após validação
     novo_pedido = PedidoModel(
@@ -241,53 +998,136 @@ def place_order(
         preco_total=preco_total
     )
     db.add(novo_pedido)
-    db.commit()  # Salvar o pedido para gerar o ID
+    await db.flush()  # Gera o ID do pedido sem encerrar a transação
 
-    # Associar itens ao pedido
-    for item, quantidade in itens_validados:
-        pedido_itens = PedidoItensModel(
-            pedido_id=novo_pedido.id,
-            item_id=item.id,
-            quantidade=quantidade
+    # Associa os itens ao pedido com um único INSERT de múltiplas linhas
+    if linhas:
+        await db.execute(
+            insert(PedidoItensModel),
+            [{"pedido_id": novo_pedido.id, **linha} for linha in linhas]
         )
-        db.add(pedido_itens)
 
-    db.commit()  # Salvar as associações
-    db.refresh(novo_pedido)
+    # Soma o pedido aos resumos de vendas do dia
+    if counts_as_sale(novo_pedido.status):
+        await record_sales(db, sales_day(novo_pedido.criado_em), linhas)
+
+    # Avisa as telas da cozinha (entregue apenas após o commit)
+    await publish_order_event(db, TipoEventoPedido.CRIADO, novo_pedido)
+
+    # A chave de idempotência só é confirmada junto com o pedido
+    if chave_idempotencia:
+        await db.execute(
+            update(ChaveIdempotenciaModel)
+            .where(ChaveIdempotenciaModel.chave == chave_idempotencia)
+            .values(pedido_id=novo_pedido.id)
+        )
+
+    await db.commit()  # Salva o pedido e as associações na mesma transação
 
     return novo_pedido
 
 
-def update_item(
-        db: Session,
+async def claim_idempotency_key(
+        db: AsyncSession,
+        chave: str,
+        impressao: str
+) -> Optional[tuple[str, int]]:
+    """
+    Reserva uma chave de idempotência na transação atual (sem commit).
+
+    A reserva é desfeita se a transação não for confirmada (ex.: pedido
+    inválido). No PostgreSQL, uma transação que reserva a mesma chave
+    aguarda a anterior terminar e então recebe o seu resultado. Chaves
+    expiradas (IDEMPOTENCY_TTL) são reaproveitadas.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        chave (str): Valor do cabeçalho Idempotency-Key.
+        impressao (str): Hash do corpo da requisição.
+    Returns:
+        tuple: None se a chave foi reservada; caso contrário, a impressão e
+        o ID do pedido da requisição que a usou antes.
+    """
+    limite = utc_now() - timedelta(seconds=settings.IDEMPOTENCY_TTL)
+
+    upsert = dialect_insert(db, ChaveIdempotenciaModel)
+    reservada = await db.scalar(
+        upsert.values(chave=chave, impressao=impressao, criado_em=utc_now())
+        .on_conflict_do_update(
+            index_elements=["chave"],
+            set_={
+                "impressao": upsert.excluded.impressao,
+                "pedido_id": None,
+                "criado_em": upsert.excluded.criado_em
+            },
+            where=ChaveIdempotenciaModel.criado_em < limite
+        )
+        .returning(ChaveIdempotenciaModel.chave)
+    )
+
+    if reservada is not None:
+        return None
+
+    return tuple((
+        await db.execute(
+            select(
+                ChaveIdempotenciaModel.impressao,
+                ChaveIdempotenciaModel.pedido_id
+            ).where(ChaveIdempotenciaModel.chave == chave)
+        )
+    ).one())
+
+
+async def purge_idempotency_keys():
+    """
+    Remove as chaves de idempotência expiradas (IDEMPOTENCY_TTL), em
+    segundo plano.
+    """
+    limite = utc_now() - timedelta(seconds=settings.IDEMPOTENCY_TTL)
+
+    async with SessionLocal() as db:
+        await db.execute(
+            delete(ChaveIdempotenciaModel)
+            .where(ChaveIdempotenciaModel.criado_em < limite)
+        )
+        await db.commit()
+
+
+async def update_item(
+        db: AsyncSession,
         item_id: int,
         nome: str = None,
         descricao: str = None,
         preco: float = None,
         categoria: str = None,
-        arquivo: UploadFile = File(None)
+        arquivo: UploadFile = File(None),
+        chave_imagem: str = None
 ):
     """
     Atualiza um item do cardápio.
 
     Args:
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
         item_id (int): ID do item a ser atualizado.
         nome (str): Novo nome do item.
         descricao (str): Nova descrição do item.
         preco (float): Novo preço do item.
         categoria (str): Nova categoria do item.
         arquivo (UploadFile): Nova imagem do item.
+        chave_imagem (str): Chave de uma nova imagem enviada diretamente ao
+            armazenamento, no lugar de ``arquivo``.
     Returns:
         MenuItem: Item atualizado.
     """
     # Busca o item pelo ID no banco de dados
-    item = db.query(ItemModel).filter(ItemModel.id == item_id).first()
+    item = await db.get(ItemModel, item_id)
 
     # Verifica se o item foi encontrado
     if not item:
         return None
 
+    categoria_antiga = item.categoria
+
     # Atualiza os campos do item
     if nome:
         item.nome = nome
@@ -298,33 +1138,47 @@ def update_item(
     if categoria:
         item.categoria = categoria
 
-    # Se um novo arquivo for fornecido, atualiza a imagem
-    if arquivo:
-        # Evita sobreposição de arquivos com o mesmo nome
-        arquivo.filename = f'{item_id}_{arquivo.filename}'
+    # Imagem antiga a ser removida após o commit, se não for mais usada
+    imagem_antiga = None
 
-        # Constroi o caminho completo do arquivo
-        caminho_arquivo = f'{IMAGES_DIR / arquivo.filename}'
+    # Se uma nova imagem for fornecida, atualiza a imagem
+    caminho_arquivo = await obtain_image(arquivo, chave_imagem)
 
-        with open(caminho_arquivo, "wb+") as objeto_arquivo:
-            objeto_arquivo.write(arquivo.file.read())
+    if caminho_arquivo:
+        # Mesmo conteúdo: o item continua usando o mesmo arquivo
+        if item.url_imagem != caminho_arquivo:
+            await add_image_reference(db, caminho_arquivo)
 
-        # Deleta o arquivo antigo se existir
-        if Path(item.url_imagem).exists():
-            Path(item.url_imagem).unlink()
+            if await release_image_reference(db, item.url_imagem):
+                imagem_antiga = (item.url_imagem, item.imagens)
 
-        # Atualiza a URL da imagem no banco de dados
-        item.url_imagem = caminho_arquivo
+            # As variantes da nova imagem são geradas em segundo plano
+            item.imagens = None
+
+            # Atualiza a URL da imagem no banco de dados
+            item.url_imagem = caminho_arquivo
+
+    # O preço e a categoria entram no resumo das categorias
+    if preco or categoria:
+        await db.flush()
+        await refresh_category_summary(db, [categoria_antiga, item.categoria])
 
     # Salva as alterações no banco de dados
-    db.commit()
-    db.refresh(item)
+    await db.commit()
+    await db.refresh(item)
+
+    # Deleta o arquivo antigo e suas variantes
+    if imagem_antiga:
+        await remove_unused_image(db, *imagem_antiga)
+
+    # Invalida o cardápio em cache
+    menu_cache.invalidate()
 
     return MenuItem(**item.__dict__)
 
 
-def update_order_status(
-        db: Session,
+async def update_order_status(
+        db: AsyncSession,
         order_id: int,
         status: StatusPedido
 ):
@@ -332,31 +1186,488 @@ def update_order_status(
     Atualiza o status de um pedido.
 
     Args:
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
         order_id (int): ID do pedido a ser atualizado.
         status (StatusPedido): Novo status do pedido.
     Returns:
         PedidoCliente: Pedido atualizado.
     """
-    # Busca o pedido pelo ID no banco de dados
-    pedido = db.query(PedidoModel).filter(PedidoModel.id == order_id).first()
+    # Busca o pedido pelo ID no banco de dados, bloqueando-o até o commit
+    # para que alterações simultâneas não contem as vendas duas vezes
+    pedido = await db.get(PedidoModel, order_id, with_for_update=True)
 
     # Verifica se o pedido foi encontrado
     if not pedido:
         return None
 
+    # Cancelar um pedido retira as suas vendas dos resumos; reabri-lo as
+    # devolve
+    vendido = counts_as_sale(pedido.status)
+    if vendido != counts_as_sale(status.value):
+        await record_sales(
+            db,
+            sales_day(pedido.criado_em),
+            await order_sales_lines(db, order_id),
+            -1 if vendido else 1
+        )
+
     # Atualiza o status do pedido
     pedido.status = status.value
 
+    await publish_order_event(db, TipoEventoPedido.STATUS_ALTERADO, pedido)
+
     # Salva as alterações no banco de dados
-    db.commit()
-    db.refresh(pedido)
+    await db.commit()
+    await db.refresh(pedido)
 
     return pedido
 
 
-def update_order(
-        db: Session,
+def dialect_insert(db: AsyncSession, modelo):
+    """
+    Retorna o INSERT específico do dialeto da sessão, que oferece
+    on_conflict_do_update (PostgreSQL ou SQLite).
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        modelo: Modelo em que os registros serão inseridos.
+    Returns:
+        Insert: Comando INSERT do dialeto.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return postgresql_insert(modelo)
+
+    return sqlite_insert(modelo)
+
+
+def counts_as_sale(status: str) -> bool:
+    """
+    Indica se um pedido com este status entra nos resumos de vendas
+    (todos, exceto os cancelados).
+    """
+    return status != StatusPedido.CANCELADO.value
+
+
+def sales_day(criado_em: datetime) -> date:
+    """
+    Dia de um pedido nos resumos de vendas, no fuso SALES_TIMEZONE.
+
+    Args:
+        criado_em (datetime): Data de criação do pedido.
+    Returns:
+        date: Dia do pedido.
+    """
+    # O SQLite não guarda o fuso horário: as datas são gravadas em UTC
+    if criado_em.tzinfo is None:
+        criado_em = criado_em.replace(tzinfo=timezone.utc)
+
+    fuso = (
+        ZoneInfo(settings.SALES_TIMEZONE)
+        if settings.SALES_TIMEZONE else timezone.utc
+    )
+
+    return criado_em.astimezone(fuso).date()
+
+
+async def order_sales_lines(
+        db: AsyncSession,
+        order_id: int
+) -> list[Mapping]:
+    """
+    Carrega as linhas de um pedido com os campos dos resumos de vendas.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        order_id (int): ID do pedido.
+    Returns:
+        list: Linhas do pedido (item_id, nome, categoria, quantidade e
+        preco_unitario_centavos).
+    """
+    return (
+        await db.execute(
+            select(*COLUNAS_VENDAS)
+            .where(PedidoItensModel.pedido_id == order_id)
+        )
+    ).mappings().all()
+
+
+def sum_sales(
+        linhas: Iterable[Mapping],
+        por_item: dict,
+        por_categoria: dict
+):
+    """
+    Acumula linhas de pedidos nos registros dos resumos por dia e item e
+    por dia e categoria.
+
+    Linhas de itens removidos do cardápio (item_id nulo) entram apenas no
+    resumo por categoria: o registro do item permanece como estava.
+
+    Args:
+        linhas: Linhas com dia, item_id, nome, categoria, quantidade e
+            preco_unitario_centavos.
+        por_item (dict): Registros por (dia, item_id), atualizados.
+        por_categoria (dict): Registros por (dia, categoria), atualizados.
+    """
+    for linha in linhas:
+        if not linha["quantidade"]:
+            continue
+
+        receita = linha["quantidade"] * linha["preco_unitario_centavos"]
+        registros = []
+        if linha["item_id"] is not None:
+            registros.append(por_item.setdefault(
+                (linha["dia"], linha["item_id"]),
+                {
+                    "dia": linha["dia"],
+                    "item_id": linha["item_id"],
+                    "nome": linha["nome"],
+                    "quantidade": 0,
+                    "receita_centavos": 0
+                }
+            ))
+        registros.append(por_categoria.setdefault(
+            (linha["dia"], linha["categoria"]),
+            {
+                "dia": linha["dia"],
+                "categoria": linha["categoria"],
+                "quantidade": 0,
+                "receita_centavos": 0
+            }
+        ))
+
+        for registro in registros:
+            registro["quantidade"] += linha["quantidade"]
+            registro["receita_centavos"] += receita
+
+
+def sorted_records(registros: dict) -> list[dict]:
+    """
+    Retorna os registros dos resumos de vendas ordenados pela chave
+    ((dia, item_id) ou (dia, categoria)).
+
+    Args:
+        registros (dict): Registros montados por sum_sales.
+    Returns:
+        list: Registros na ordem das chaves.
+    """
+    return [registros[chave] for chave in sorted(registros)]
+
+
+async def record_sales(
+        db: AsyncSession,
+        dia: date,
+        linhas: Iterable[Mapping],
+        sinal: int = 1
+):
+    """
+    Soma (ou subtrai, com sinal -1) linhas de um pedido aos resumos de
+    vendas do dia, com um upsert por tabela (sem commit).
+
+    As linhas atualizadas ficam bloqueadas até o commit, então pedidos do
+    mesmo dia com itens ou categorias em comum são gravados um de cada vez.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        dia (date): Dia do pedido (sales_day).
+        linhas: Linhas do pedido (item_id, nome, categoria, quantidade e
+            preco_unitario_centavos); a quantidade pode ser negativa.
+        sinal (int): 1 para somar as linhas, -1 para subtraí-las.
+    """
+    por_item, por_categoria = {}, {}
+    sum_sales(
+        (
+            {**linha, "dia": dia, "quantidade": sinal * linha["quantidade"]}
+            for linha in linhas
+        ),
+        por_item,
+        por_categoria
+    )
+
+    # Registros na ordem das chaves únicas: pedidos simultâneos bloqueiam as
+    # linhas do dia sempre na mesma ordem e esperam um pelo outro, em vez de
+    # travarem em deadlock
+    if por_item:
+        upsert = dialect_insert(db, VendaDiariaItemModel)
+        await db.execute(
+            upsert.values(sorted_records(por_item)).on_conflict_do_update(
+                index_elements=["dia", "item_id"],
+                set_={
+                    "nome": upsert.excluded.nome,
+                    "quantidade":
+                        VendaDiariaItemModel.quantidade +
+                        upsert.excluded.quantidade,
+                    "receita_centavos":
+                        VendaDiariaItemModel.receita_centavos +
+                        upsert.excluded.receita_centavos
+                }
+            )
+        )
+
+    if por_categoria:
+        upsert = dialect_insert(db, VendaDiariaCategoriaModel)
+        await db.execute(
+            upsert.values(
+                sorted_records(por_categoria)
+            ).on_conflict_do_update(
+                index_elements=["dia", "categoria"],
+                set_={
+                    "quantidade":
+                        VendaDiariaCategoriaModel.quantidade +
+                        upsert.excluded.quantidade,
+                    "receita_centavos":
+                        VendaDiariaCategoriaModel.receita_centavos +
+                        upsert.excluded.receita_centavos
+                }
+            )
+        )
+
+
+async def rebuild_sales(db: AsyncSession) -> tuple[int, int]:
+    """
+    Recalcula os resumos de vendas a partir de todos os pedidos (backfill).
+
+    Os pedidos são lidos em lotes (yield_per) e os resumos regravados na
+    mesma transação. No PostgreSQL as tabelas dos resumos ficam bloqueadas
+    até o commit: os pedidos feitos durante o recálculo aguardam e são
+    somados em seguida. Pedidos entregues já removidos (deletar_pedido) não
+    entram no recálculo.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+    Returns:
+        tuple: Registros gravados por dia e item e por dia e categoria.
+    """
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(text(
+            "LOCK TABLE vendas_diarias_itens, vendas_diarias_categorias "
+            "IN EXCLUSIVE MODE"
+        ))
+
+    await db.execute(delete(VendaDiariaItemModel))
+    await db.execute(delete(VendaDiariaCategoriaModel))
+
+    resultado = await db.stream(
+        select(PedidoModel.criado_em, *COLUNAS_VENDAS)
+        .join(PedidoItensModel, PedidoItensModel.pedido_id == PedidoModel.id)
+        .where(PedidoModel.status != StatusPedido.CANCELADO.value)
+        .execution_options(yield_per=LOTE_EXPORTACAO)
+    )
+    # Apenas os registros dos resumos ficam em memória
+    por_item, por_categoria = {}, {}
+    async for particao in resultado.mappings().partitions():
+        sum_sales(
+            (
+                {**linha, "dia": sales_day(linha["criado_em"])}
+                for linha in particao
+            ),
+            por_item,
+            por_categoria
+        )
+
+    if por_item:
+        await db.execute(
+            insert(VendaDiariaItemModel), sorted_records(por_item)
+        )
+    if por_categoria:
+        await db.execute(
+            insert(VendaDiariaCategoriaModel), sorted_records(por_categoria)
+        )
+    await db.commit()
+
+    return len(por_item), len(por_categoria)
+
+
+async def add_image_reference(
+        db: AsyncSession,
+        caminho: str
+):
+    """
+    Registra mais um item usando o arquivo de imagem (sem commit).
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        caminho (str): Caminho do arquivo de imagem.
+    """
+    await add_image_references(db, {caminho: 1})
+
+
+async def add_image_references(
+        db: AsyncSession,
+        contagem: dict[str, int]
+):
+    """
+    Registra, com um único upsert, novas referências a vários arquivos de
+    imagem (sem commit).
+
+    Os arquivos que não tinham referências podem ter sido removidos por
+    remove_unused_image depois de gravados: com as contagens já
+    bloqueadas pelo upsert, confirma que eles ainda estão armazenados.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        contagem (dict): Quantidade de novos itens por caminho.
+    Raises:
+        APIException: Se algum desses arquivos foi removido.
+    """
+    upsert = dialect_insert(db, ArquivoImagemModel)
+    resultado = await db.execute(
+        upsert.values([
+            {"caminho": caminho, "referencias": quantidade}
+            # Ordem fixa de bloqueio entre transações simultâneas
+            for caminho, quantidade in sorted(contagem.items())
+        ]).on_conflict_do_update(
+            index_elements=["caminho"],
+            set_={
+                "referencias":
+                    ArquivoImagemModel.referencias +
+                    upsert.excluded.referencias
+            }
+        ).returning(
+            ArquivoImagemModel.caminho, ArquivoImagemModel.referencias
+        )
+    )
+
+    await ensure_stored([
+        caminho for caminho, referencias in resultado
+        if referencias == contagem[caminho]
+    ])
+
+
+async def refresh_category_summary(
+        db: AsyncSession,
+        categorias: Iterable[str]
+):
+    """
+    Recalcula, a partir dos itens, o resumo das categorias afetadas por
+    uma escrita (sem commit). Deve ser chamada após o flush dos itens.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        categorias: Categorias afetadas (normalizadas ou não).
+    """
+    categorias = sorted({normalize_category(c) for c in categorias})
+
+    if db.bind.dialect.name == "postgresql":
+        # Serializa as escritas simultâneas em uma mesma categoria (na
+        # ordem alfabética, sem deadlocks): a próxima transação recalcula
+        # o resumo já vendo os itens da anterior
+        await db.execute(
+            text(
+                "SELECT pg_advisory_xact_lock("
+                "hashtext('categorias_resumo:' || categoria)) "
+                "FROM unnest(CAST(:categorias AS text[])) AS categoria"
+            ),
+            {"categorias": categorias}
+        )
+
+    upsert = dialect_insert(db, CategoriaResumoModel)
+    await db.execute(
+        upsert.from_select(
+            ["categoria", "quantidade_itens", "preco_minimo", "preco_maximo"],
+            select(
+                ItemModel.categoria_normalizada,
+                func.count(),
+                func.min(ItemModel.preco),
+                func.max(ItemModel.preco)
+            )
+            .where(ItemModel.categoria_normalizada.in_(categorias))
+            .group_by(ItemModel.categoria_normalizada)
+        ).on_conflict_do_update(
+            index_elements=["categoria"],
+            set_={
+                "quantidade_itens": upsert.excluded.quantidade_itens,
+                "preco_minimo": upsert.excluded.preco_minimo,
+                "preco_maximo": upsert.excluded.preco_maximo
+            }
+        )
+    )
+
+    # Remove as categorias que ficaram sem itens
+    await db.execute(
+        delete(CategoriaResumoModel).where(
+            CategoriaResumoModel.categoria.in_(categorias),
+            CategoriaResumoModel.categoria.not_in(
+                select(ItemModel.categoria_normalizada)
+                .where(ItemModel.categoria_normalizada.in_(categorias))
+            )
+        )
+    )
+
+
+async def release_image_reference(
+        db: AsyncSession,
+        caminho: str
+) -> bool:
+    """
+    Remove uma referência ao arquivo de imagem (sem commit).
+
+    A contagem zerada é mantida até remove_unused_image, chamada após o
+    commit, remover o arquivo.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        caminho (str): Caminho do arquivo de imagem.
+    Returns:
+        bool: True se o arquivo não é mais usado e pode ser removido.
+    """
+    referencias = await db.scalar(
+        update(ArquivoImagemModel)
+        .where(ArquivoImagemModel.caminho == caminho)
+        .values(referencias=ArquivoImagemModel.referencias - 1)
+        .returning(ArquivoImagemModel.referencias)
+    )
+
+    if referencias is None:
+        # Arquivo sem contagem: pertence apenas a este item
+        await db.execute(
+            dialect_insert(db, ArquivoImagemModel)
+            .values(caminho=caminho, referencias=0)
+            .on_conflict_do_nothing()
+        )
+        return True
+
+    return referencias <= 0
+
+
+async def remove_unused_image(
+        db: AsyncSession,
+        caminho: str,
+        variantes: dict[str, dict[str, str]] = None
+):
+    """
+    Remove do armazenamento um arquivo de imagem liberado por
+    release_image_reference, e as suas variantes, se ele continuar sem
+    referências. Deve ser chamada após o commit que liberou o arquivo.
+
+    A contagem é apagada antes da remoção e permanece bloqueada até o
+    commit: um cadastro simultâneo com o mesmo conteúdo aguarda e, em
+    seguida, encontra o arquivo já removido (add_image_references), em vez
+    de passar a apontar para ele.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        caminho (str): Caminho do arquivo de imagem.
+        variantes (dict): URLs das variantes por nome e formato.
+    """
+    liberado = await db.scalar(
+        delete(ArquivoImagemModel)
+        .where(
+            ArquivoImagemModel.caminho == caminho,
+            ArquivoImagemModel.referencias <= 0
+        )
+        .returning(ArquivoImagemModel.caminho)
+    )
+
+    if liberado:
+        await remove_image(caminho)
+        await remove_variants(variantes)
+
+    await db.commit()
+
+
+async def update_order(
+        db: AsyncSession,
         order_id: int,
         pedido: PedidoClienteInput
 ) -> PedidoClienteOutput:
@@ -364,87 +1675,164 @@ def update_order(
     Atualiza um pedido existente.
 
     Args:
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
         order_id (int): ID do pedido a ser atualizado.
         pedido (PedidoClienteInput): Novo pedido do cliente.
 
     Returns:
         PedidoClienteOutput: Detalhes do pedido atualizado.
     """
-    # Busca o pedido pelo ID no banco de dados
-    pedido_db = db.query(PedidoModel).filter(
-        PedidoModel.id == order_id
-    ).first()
+    # Busca o pedido pelo ID no banco de dados, bloqueando-o até o commit
+    # para que alterações simultâneas não contem as vendas duas vezes
+    pedido_db = await db.get(PedidoModel, order_id, with_for_update=True)
 
     # Verifica se o pedido foi encontrado
     if not pedido_db:
         return None
 
-    # Busca todos os itens atuais associados ao pedido
-    itens_atuais = db.query(PedidoItensModel).filter(
-        PedidoItensModel.pedido_id == order_id
-    ).all()
-
-    # Lista de IDs de itens novos fornecidos na requisição
-    novos_itens_ids = [item for item in pedido.itens]
+    # Conta a quantidade de cada item na lista de entrada
+    itens_contagem = Counter(pedido.itens)
 
-    # Remove os itens que não estão mais na nova lista
-    for item_atual in itens_atuais:
-        if item_atual.item_id not in novos_itens_ids:
-            db.delete(item_atual)
+    # Linhas atuais do pedido, para atualizar os resumos de vendas
+    vendido = counts_as_sale(pedido_db.status)
+    linhas_antigas = await order_sales_lines(db, order_id) if vendido else []
 
     # Verifica se o pedido está vazio (sem itens)
-    if not novos_itens_ids:
-        db.delete(pedido_db)  # Deleta o pedido do banco
-        db.commit()
+    if not itens_contagem:
+        await record_sales(
+            db, sales_day(pedido_db.criado_em), linhas_antigas, -1
+        )
+        # Remove as associações e o pedido com comandos em lote
+        await db.execute(
+            delete(PedidoItensModel).where(
+                PedidoItensModel.pedido_id == order_id
+            )
+        )
+        await db.execute(
+            delete(PedidoModel).where(PedidoModel.id == order_id)
+        )
+        await publish_order_event(db, TipoEventoPedido.REMOVIDO, pedido_db)
+        await db.commit()
         return []  # Retorna [], pois o pedido foi removido
 
-    # Calcula o preço total e atualiza os itens
-    preco_total = 0.0
-    itens_contagem = {}  # Dicionário para contar a quantidade de cada item
+    # Carrega os itens referenciados em uma única consulta (IN)
+    itens_existentes = {
+        item.id: item
+        for item in await db.execute(
+            select(
+                ItemModel.id,
+                ItemModel.nome,
+                ItemModel.categoria_normalizada,
+                ItemModel.preco
+            ).where(ItemModel.id.in_(itens_contagem))
+        )
+    }
+
+    # Itens inexistentes no cardápio são ignorados
+    novas_linhas = [
+        {
+            "pedido_id": order_id,
+            "item_id": item_id,
+            "quantidade": quantidade,
+            "nome": itens_existentes[item_id].nome,
+            "categoria": itens_existentes[item_id].categoria_normalizada,
+            "preco_unitario_centavos": to_cents(
+                itens_existentes[item_id].preco
+            )
+        }
+        for item_id, quantidade in itens_contagem.items()
+        if item_id in itens_existentes
+    ]
 
-    # Conta a quantidade de cada item na lista de entrada
-    for item_id in pedido.itens:
-        itens_contagem[item_id] = itens_contagem.get(item_id, 0) + 1
-
-    # Atualiza ou adiciona os itens no pedido
-    for item_id, quantidade in itens_contagem.items():
-        item_db = db.query(ItemModel).filter(ItemModel.id == item_id).first()
-
-        if item_db:
-            # Verifica se o item já está no pedido
-            item_pedido_db = db.query(PedidoItensModel).filter(
-                PedidoItensModel.pedido_id == pedido_db.id,
-                PedidoItensModel.item_id == item_db.id
-            ).first()
-
-            if item_pedido_db:
-                # Atualiza a quantidade do item existente
-                item_pedido_db.quantidade = quantidade
-            else:
-                # Adiciona um novo item ao pedido
-                novo_item = PedidoItensModel(
-                    pedido_id=pedido_db.id,
-                    item_id=item_db.id,
-                    quantidade=quantidade
+    # Remove, em lote, os itens que não estão mais no pedido, inclusive
+    # as linhas de itens que saíram do cardápio (item_id nulo)
+    await db.execute(
+        delete(PedidoItensModel).where(
+            PedidoItensModel.pedido_id == order_id,
+            or_(
+                PedidoItensModel.item_id.is_(None),
+                PedidoItensModel.item_id.not_in(
+                    [linha["item_id"] for linha in novas_linhas]
                 )
-                db.add(novo_item)
+            )
+        )
+    )
 
-            # Adiciona o preço do item ao preço total
-            preco_total += item_db.preco * quantidade
+    # Insere ou atualiza as quantidades com um único upsert, usando a
+    # restrição única (pedido_id, item_id). Linhas já existentes mantêm o
+    # nome e o preço registrados quando o item entrou no pedido
+    if novas_linhas:
+        upsert = dialect_insert(db, PedidoItensModel)
+        await db.execute(
+            upsert.values(novas_linhas).on_conflict_do_update(
+                index_elements=["pedido_id", "item_id"],
+                set_={"quantidade": upsert.excluded.quantidade}
+            )
+        )
 
-    # Atualiza o preço total do pedido
-    pedido_db.preco_total = preco_total
+    # Aplica aos resumos de vendas a variação de cada item; as linhas que
+    # já estavam no pedido mantêm o preço registrado
+    if vendido:
+        antigas = {
+            linha["item_id"]: linha for linha in linhas_antigas
+            if linha["item_id"] is not None
+        }
+        novas = {linha["item_id"]: linha for linha in novas_linhas}
+        variacoes = Counter(
+            {item_id: linha["quantidade"] for item_id, linha in novas.items()}
+        )
+        for item_id, linha in antigas.items():
+            variacoes[item_id] -= linha["quantidade"]
+        await record_sales(
+            db,
+            sales_day(pedido_db.criado_em),
+            [
+                *(
+                    {
+                        **(antigas.get(item_id) or novas[item_id]),
+                        "quantidade": variacao
+                    }
+                    for item_id, variacao in variacoes.items()
+                ),
+                # Linhas de itens removidos do cardápio saem do pedido
+                *(
+                    {**linha, "quantidade": -linha["quantidade"]}
+                    for linha in linhas_antigas if linha["item_id"] is None
+                )
+            ]
+        )
+
+    # Recalcula o preço total no próprio banco de dados, somando os
+    # subtotais em centavos das linhas do pedido
+    subtotal = (
+        select(
+            func.coalesce(func.sum(PedidoItensModel.subtotal_centavos), 0)
+            / 100.0
+        )
+        .where(PedidoItensModel.pedido_id == order_id)
+        .scalar_subquery()
+    )
+    preco_total = await db.scalar(
+        update(PedidoModel)
+        .where(PedidoModel.id == order_id)
+        .values(preco_total=subtotal)
+        .returning(PedidoModel.preco_total),
+        execution_options={"synchronize_session": False}
+    )
+
+    # Sincroniza o objeto em memória sem gerar um novo UPDATE
+    set_committed_value(pedido_db, "preco_total", preco_total)
+
+    await publish_order_event(db, TipoEventoPedido.ATUALIZADO, pedido_db)
 
     # Salva as alterações no banco de dados
-    db.commit()
-    db.refresh(pedido_db)
+    await db.commit()
 
     return pedido_db
 
 
-def delete_item(
-        db: Session,
+async def delete_item(
+        db: AsyncSession,
         item_id: int
 ):
     """
@@ -452,27 +1840,36 @@ def delete_item(
 
     Args:
         item_id (int): ID do item.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     """
     # Busca o item pelo ID no banco de dados
-    item = db.query(ItemModel).filter(ItemModel.id == item_id).first()
+    item = await db.get(ItemModel, item_id)
 
     if not item:
         return None
 
-    # Deleta o arquivo de imagem associado ao item
-    if item.url_imagem and Path(item.url_imagem).exists():
-        Path(item.url_imagem).unlink()
+    liberada = await release_image_reference(db, item.url_imagem)
 
-    # Deleta o item do banco de dados
-    db.delete(item)
-    db.commit()
+    # Deleta o item do banco de dados. As linhas dos pedidos com o item
+    # permanecem, com item_id nulo (ON DELETE SET NULL), e mantêm o nome
+    # e o preço registrados
+    await db.delete(item)
+    await db.flush()
+    await refresh_category_summary(db, [item.categoria])
+    await db.commit()
+
+    # Deleta o arquivo de imagem e suas variantes se não forem mais usados
+    if liberada:
+        await remove_unused_image(db, item.url_imagem, item.imagens)
+
+    # Invalida o cardápio em cache
+    menu_cache.invalidate()
 
     return db
 
 
-def delete_order(
-        db: Session,
+async def delete_order(
+        db: AsyncSession,
         order_id: int
 ):
     """
@@ -480,10 +1877,10 @@ def delete_order(
 
     Args:
         order_id (int): ID do pedido.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     """
     # Busca o pedido pelo ID no banco de dados
-    pedido = db.query(PedidoModel).filter(PedidoModel.id == order_id).first()
+    pedido = await db.get(PedidoModel, order_id)
 
     # Verifica se o pedido foi encontrado
     if not pedido or (
@@ -492,8 +1889,14 @@ def delete_order(
     ):
         return None
 
-    # Deleta o pedido do banco de dados
-    db.delete(pedido)
-    db.commit()
+    # Deleta o pedido do banco de dados. Os resumos de vendas não mudam:
+    # as vendas dos pedidos cancelados já foram descontadas e as dos
+    # entregues continuam no histórico
+    await db.execute(
+        delete(PedidoItensModel).where(PedidoItensModel.pedido_id == order_id)
+    )
+    await db.delete(pedido)
+    await publish_order_event(db, TipoEventoPedido.REMOVIDO, pedido)
+    await db.commit()
 
     return db
@@ -0,0 +1,274 @@
+# Imports do sistema
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+# Imports de terceiros
+import asyncpg
+from fastapi import WebSocket
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Imports locais
+from core.config import settings
+from core.database import URL_ASSINCRONA, engine
+from src.menu.models import PedidoModel
+from src.menu.schemas import EventoPedido, TipoEventoPedido
+
+# Canal do LISTEN/NOTIFY do PostgreSQL
+CANAL_PEDIDOS = "eventos_pedidos"
+
+# Chave, em Session.info, dos eventos que aguardam o commit (demais bancos)
+EVENTOS_PENDENTES = "eventos_pedidos"
+
+# Intervalo entre os comentários enviados às conexões SSE ociosas, para que
+# proxies não as encerrem (segundos)
+INTERVALO_KEEPALIVE = 15
+
+# Espera do navegador antes de reconectar uma conexão SSE (ms)
+RECONEXAO_SSE = 3000
+
+# Código de fechamento do WebSocket quando o servidor encerra a assinatura
+# (1013: tente novamente mais tarde)
+FECHAMENTO_ASSINATURA = 1013
+
+logger = logging.getLogger(__name__)
+
+
+def listen_dsn() -> str:
+    """
+    URL da conexão dedicada ao LISTEN, no formato aceito pelo asyncpg.
+
+    Returns:
+        str: ORDER_EVENTS_DATABASE_URL ou a URL do banco, sem o driver.
+    """
+    url = make_url(settings.ORDER_EVENTS_DATABASE_URL or URL_ASSINCRONA)
+
+    return url.set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+class OrderEventBroker:
+    """
+    Distribui os eventos de pedidos às conexões SSE/WebSocket do processo.
+
+    No PostgreSQL os eventos são publicados com NOTIFY na própria transação
+    da escrita e cada worker os recebe por uma conexão dedicada (LISTEN),
+    aberta na primeira assinatura: todos os workers recebem os eventos de
+    todos, e apenas das transações confirmadas. Nos demais bancos os
+    eventos são entregues somente às conexões do próprio processo.
+    """
+    def __init__(self, limite_fila: int):
+        self.limite_fila: int = limite_fila
+        # Fila de cada assinante e o pedido acompanhado (None: todos)
+        self.assinantes: dict[asyncio.Queue, Optional[int]] = {}
+        self._conexao: asyncpg.Connection = None
+        self._lock = asyncio.Lock()
+
+    async def _listen(self):
+        """
+        Abre a conexão do LISTEN, se ainda não estiver aberta (PostgreSQL).
+        """
+        if engine.dialect.name != "postgresql" or self._conexao is not None:
+            return
+
+        # Apenas uma assinatura abre a conexão
+        async with self._lock:
+            if self._conexao is not None:
+                return
+
+            conexao = await asyncpg.connect(
+                listen_dsn(), timeout=settings.DB_CONNECT_TIMEOUT
+            )
+            await conexao.add_listener(CANAL_PEDIDOS, self._notification)
+            conexao.add_termination_listener(self._connection_lost)
+            self._conexao = conexao
+
+    def _notification(self, conexao, pid, canal, payload):
+        self.deliver(payload)
+
+    def _connection_lost(self, conexao):
+        # Eventos podem ter sido perdidos: os clientes reconectam e
+        # recarregam os pedidos; a próxima assinatura reabre o LISTEN
+        logger.warning("Conexão do LISTEN de %s perdida", CANAL_PEDIDOS)
+        self._conexao = None
+        self.close_all()
+
+    @asynccontextmanager
+    async def subscribe(self, pedido_id: int = None):
+        """
+        Registra uma fila que recebe os eventos até o fim do bloco.
+
+        Cada item da fila é uma tupla (EventoPedido, JSON do evento). A fila
+        recebe None quando o servidor encerra a assinatura (assinante que
+        não consome os eventos a tempo ou conexão do LISTEN perdida); o
+        cliente deve então reconectar e recarregar os pedidos.
+
+        Args:
+            pedido_id (int): Recebe apenas os eventos deste pedido.
+        """
+        await self._listen()
+
+        fila = asyncio.Queue(self.limite_fila)
+        self.assinantes[fila] = pedido_id
+
+        try:
+            yield fila
+        finally:
+            self.assinantes.pop(fila, None)
+
+    def deliver(self, payload: str):
+        """
+        Entrega um evento aos assinantes do processo.
+
+        Args:
+            payload (str): Evento serializado em JSON (EventoPedido).
+        """
+        evento = EventoPedido.model_validate_json(payload)
+
+        for fila, pedido_id in list(self.assinantes.items()):
+            if pedido_id is not None and pedido_id != evento.id:
+                continue
+
+            try:
+                fila.put_nowait((evento, payload))
+            except asyncio.QueueFull:
+                logger.warning(
+                    "Assinante de eventos de pedidos encerrado: %d eventos "
+                    "não consumidos", fila.qsize()
+                )
+                self._close(fila)
+
+    def _close(self, fila: asyncio.Queue):
+        """
+        Encerra uma assinatura, descartando os eventos não consumidos.
+        """
+        self.assinantes.pop(fila, None)
+
+        while not fila.empty():
+            fila.get_nowait()
+        fila.put_nowait(None)
+
+    def close_all(self):
+        """
+        Encerra todas as assinaturas do processo.
+        """
+        for fila in list(self.assinantes):
+            self._close(fila)
+
+
+eventos_pedidos = OrderEventBroker(settings.ORDER_EVENTS_QUEUE_SIZE)
+
+
+async def publish_order_event(
+        db: AsyncSession,
+        tipo: TipoEventoPedido,
+        pedido: PedidoModel
+):
+    """
+    Publica um evento de pedido na transação atual (sem commit).
+
+    O evento só é entregue se a transação for confirmada.
+
+    Args:
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+        tipo (TipoEventoPedido): Tipo do evento.
+        pedido (PedidoModel): Pedido criado, alterado ou removido.
+    """
+    payload = EventoPedido(
+        tipo=tipo,
+        id=pedido.id,
+        status=pedido.status,
+        preco_total=pedido.preco_total
+    ).model_dump_json()
+
+    if db.bind.dialect.name == "postgresql":
+        # O NOTIFY é enviado aos ouvintes apenas no commit
+        await db.execute(select(func.pg_notify(CANAL_PEDIDOS, payload)))
+        return
+
+    db.info.setdefault(EVENTOS_PENDENTES, []).append(payload)
+
+
+def deliver_pending(sessao: Session):
+    """
+    Entrega os eventos da transação confirmada (bancos sem NOTIFY).
+    """
+    for payload in sessao.info.pop(EVENTOS_PENDENTES, ()):
+        eventos_pedidos.deliver(payload)
+
+
+def discard_pending(sessao: Session):
+    """
+    Descarta os eventos da transação desfeita.
+    """
+    sessao.info.pop(EVENTOS_PENDENTES, None)
+
+
+event.listen(Session, "after_commit", deliver_pending)
+event.listen(Session, "after_rollback", discard_pending)
+
+
+async def order_event_stream(pedido_id: int = None):
+    """
+    Gera os eventos de pedidos no formato Server-Sent Events.
+
+    Args:
+        pedido_id (int): Envia apenas os eventos deste pedido.
+    Yields:
+        str: Eventos (event: tipo, data: JSON) e comentários de keep-alive.
+    """
+    async with eventos_pedidos.subscribe(pedido_id) as fila:
+        yield f"retry: {RECONEXAO_SSE}\n\n"
+
+        while True:
+            try:
+                item = await asyncio.wait_for(fila.get(), INTERVALO_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            # Assinatura encerrada pelo servidor: o navegador reconecta
+            if item is None:
+                return
+
+            evento, payload = item
+            yield f"event: {evento.tipo.value}\ndata: {payload}\n\n"
+
+
+async def forward_order_events(websocket: WebSocket, pedido_id: int = None):
+    """
+    Envia os eventos de pedidos por um WebSocket até o cliente desconectar.
+
+    Args:
+        websocket (WebSocket): Conexão do cliente.
+        pedido_id (int): Envia apenas os eventos deste pedido.
+    """
+    async with eventos_pedidos.subscribe(pedido_id) as fila:
+        await websocket.accept()
+
+        async def send_events():
+            while (item := await fila.get()) is not None:
+                await websocket.send_text(item[1])
+
+        async def wait_disconnect():
+            mensagem = await websocket.receive()
+            while mensagem["type"] != "websocket.disconnect":
+                mensagem = await websocket.receive()
+
+        envio = asyncio.ensure_future(send_events())
+        desconexao = asyncio.ensure_future(wait_disconnect())
+        await asyncio.wait(
+            (envio, desconexao), return_when=asyncio.FIRST_COMPLETED
+        )
+
+        # Assinatura encerrada pelo servidor com o cliente ainda conectado
+        if envio.done() and envio.exception() is None:
+            await websocket.close(code=FECHAMENTO_ASSINATURA)
+
+        envio.cancel()
+        desconexao.cancel()
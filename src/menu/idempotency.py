@@ -0,0 +1,149 @@
+# Imports do sistema
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+# Imports locais
+from core.config import settings
+from core.exceptions import APIException
+
+# Intervalo mínimo entre as remoções das chaves expiradas do banco, por
+# worker (segundos)
+INTERVALO_LIMPEZA = 60 * 60
+
+
+def request_fingerprint(*partes) -> str:
+    """
+    Hash SHA-256 do corpo de uma requisição, para detectar a mesma chave
+    de idempotência usada com outro conteúdo.
+
+    Args:
+        *partes: Valores serializáveis em JSON que identificam a requisição.
+    Returns:
+        str: Hash em hexadecimal.
+    """
+    return hashlib.sha256(
+        json.dumps(partes, sort_keys=True).encode()
+    ).hexdigest()
+
+
+class IdempotencyCache:
+    """
+    Resultados recentes das requisições com Idempotency-Key, em memória.
+
+    Mantém os resultados confirmados em uma LRU com expiração (na frente
+    da tabela chaves_idempotencia) e agrupa as requisições simultâneas com
+    a mesma chave no processo: apenas a primeira é executada e as demais
+    aguardam o seu resultado.
+
+    Cada resultado é uma tupla (impressão da requisição, ID do pedido), com
+    ID None quando nenhum pedido foi criado.
+    """
+    def __init__(self, tamanho: int, ttl: float):
+        self.tamanho: int = tamanho
+        self.ttl: float = ttl
+        # Chave -> (impressão, ID do pedido, expiração)
+        self._recentes: OrderedDict[str, tuple] = OrderedDict()
+        # Execuções em andamento, por chave
+        self._em_andamento: dict[str, asyncio.Future] = {}
+        self._proxima_limpeza: float = 0.0
+
+    def _lookup(self, chave: str) -> Optional[tuple]:
+        registro = self._recentes.get(chave)
+        if registro is None:
+            return None
+
+        if registro[2] <= time.monotonic():
+            del self._recentes[chave]
+            return None
+
+        self._recentes.move_to_end(chave)
+        return registro[:2]
+
+    def _remember(self, chave: str, resultado: tuple):
+        self._recentes[chave] = (*resultado, time.monotonic() + self.ttl)
+        self._recentes.move_to_end(chave)
+
+        while len(self._recentes) > self.tamanho:
+            self._recentes.popitem(last=False)
+
+    async def run(
+            self,
+            chave: str,
+            impressao: str,
+            executar: Callable[[], Awaitable[tuple]]
+    ) -> Optional[int]:
+        """
+        Executa a requisição uma única vez por chave.
+
+        Args:
+            chave (str): Valor do cabeçalho Idempotency-Key.
+            impressao (str): Hash do corpo da requisição.
+            executar: Reserva a chave e cria o pedido, retornando o
+                resultado, ou o resultado de quem já usou a chave.
+        Returns:
+            int: ID do pedido criado por esta requisição ou pela original,
+            ou None se nenhum pedido foi criado.
+        Raises:
+            APIException: Se a chave já foi usada com outro conteúdo.
+        """
+        resultado = self._lookup(chave)
+
+        if resultado is None:
+            andamento = self._em_andamento.get(chave)
+
+            if andamento is not None:
+                resultado = await asyncio.shield(andamento)
+            else:
+                andamento = asyncio.get_running_loop().create_future()
+                self._em_andamento[chave] = andamento
+
+                try:
+                    resultado = await executar()
+                except BaseException:
+                    # Quem aguarda executa a requisição por conta própria
+                    andamento.set_result(None)
+                    raise
+                finally:
+                    del self._em_andamento[chave]
+
+                andamento.set_result(resultado)
+
+                # Apenas os pedidos confirmados são memorizados
+                if resultado[1] is not None:
+                    self._remember(chave, resultado)
+
+            if resultado is None:
+                return await self.run(chave, impressao, executar)
+
+        if resultado[0] != impressao:
+            raise APIException(
+                code=422,
+                description=(
+                    "A chave de idempotência já foi usada em uma requisição "
+                    "com outro conteúdo."
+                ),
+                message="Chave de idempotência reutilizada."
+            )
+
+        return resultado[1]
+
+    def purge_due(self) -> bool:
+        """
+        Indica se é hora de remover do banco as chaves expiradas (no máximo
+        uma vez por INTERVALO_LIMPEZA em cada worker).
+        """
+        agora = time.monotonic()
+        if agora < self._proxima_limpeza:
+            return False
+
+        self._proxima_limpeza = agora + INTERVALO_LIMPEZA
+        return True
+
+
+pedidos_idempotentes = IdempotencyCache(
+    settings.IDEMPOTENCY_CACHE_SIZE, settings.IDEMPOTENCY_TTL
+)
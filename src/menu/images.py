@@ -0,0 +1,582 @@
+# Imports do sistema
+import hashlib
+import io
+import logging
+import os
+import re
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterator, Iterable
+
+# Imports de terceiros
+from anyio import CapacityLimiter, to_thread
+from fastapi import UploadFile
+from fastapi.staticfiles import StaticFiles
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+# Imports locais
+from core.config import settings
+from core.exceptions import APIException
+from src.menu.schemas import EnvioImagem
+from src.menu.storage import (LocalStorage, MemoryStorage, S3Storage, Storage,
+                              verify_upload)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent  # Raiz do projeto
+STATIC_DIR = BASE_DIR / "static"  # Diretório servido em /static
+IMAGES_DIR = STATIC_DIR / "images"  # Diretório das imagens
+
+TAMANHO_PEDACO = 1024 * 1024  # Bytes copiados por vez (1 MiB)
+
+# Extensões aceitas no nome dos arquivos armazenados
+PADRAO_SUFIXO = re.compile(r"\.[a-z0-9]{1,10}")
+
+# Arquivos nomeados pelo hash do conteúdo (originais e variantes)
+PADRAO_CONTEUDO = re.compile(r"[0-9a-f]{64}(\.[a-z0-9]+)*")
+
+# Prefixo das chaves das imagens
+PREFIXO_IMAGENS = "images/"
+
+# Chaves aceitas nos envios diretos: images/{sha256}{extensão}
+PADRAO_CHAVE = re.compile(r"images/[0-9a-f]{64}(\.[a-z0-9]{1,10})?")
+
+# Arquivos endereçados pelo conteúdo nunca mudam: dispensam revalidação
+CACHE_IMUTAVEL = "public, max-age=31536000, immutable"
+
+# Variantes geradas para cada imagem: nome -> largura máxima (px)
+VARIANTES = {"thumb": 160, "card": 480, "full": 1280}
+
+# Formatos das variantes, do mais para o menos compacto
+FORMATOS = {
+    formato: qualidade
+    for formato, qualidade in (("avif", 50), ("webp", 75))
+    if features.check(formato)
+}
+
+logger = logging.getLogger(__name__)
+
+# Limita as threads gravando imagens ao mesmo tempo, para que os envios
+# não ocupem o pool de threads usado pelo restante da aplicação
+limitador_uploads = CapacityLimiter(settings.UPLOAD_THREADS)
+
+
+def create_storage() -> Storage:
+    """
+    Cria o backend de armazenamento configurado em STORAGE_BACKEND.
+
+    Returns:
+        Storage: Backend de armazenamento.
+    """
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            regiao=settings.S3_REGION,
+            chave_acesso=settings.S3_ACCESS_KEY,
+            chave_secreta=settings.S3_SECRET_KEY,
+            url_publica=settings.S3_PUBLIC_URL,
+            cache_control=CACHE_IMUTAVEL,
+        )
+
+    # Os demais backends recebem os envios diretos pela própria API, com
+    # URLs assinadas por STORAGE_SECRET: uma chave diferente em cada worker
+    # recusaria os envios atendidos por outro processo
+    if settings.DIRECT_UPLOADS and not settings.STORAGE_SECRET:
+        raise RuntimeError(
+            f"STORAGE_SECRET é obrigatório com STORAGE_BACKEND="
+            f"{settings.STORAGE_BACKEND}; defina o mesmo valor em todos os "
+            f"workers ou desative os envios diretos (DIRECT_UPLOADS=false)"
+        )
+
+    if settings.STORAGE_BACKEND == "memory":
+        return MemoryStorage()
+
+    return LocalStorage(STATIC_DIR)
+
+
+armazenamento = create_storage()
+
+
+def buffer_limited(
+        origem,
+        tamanho_maximo: int,
+        destino: Storage = None
+) -> tuple[Path, str]:
+    """
+    Copia o conteúdo de ``origem`` em pedaços de tamanho fixo para um
+    arquivo temporário, calculando o hash SHA-256 durante a cópia.
+
+    Args:
+        origem: Arquivo de origem, aberto para leitura binária.
+        tamanho_maximo (int): Tamanho máximo aceito, em bytes.
+        destino (Storage): Backend que fornece o arquivo temporário
+            (padrão: o configurado).
+    Returns:
+        tuple: Caminho do arquivo temporário e hash (hex) do conteúdo, ou
+        None se o limite foi excedido.
+    """
+    descritor, temporario = (destino or armazenamento).staging_file(
+        PREFIXO_IMAGENS
+    )
+    resumo = hashlib.sha256()
+    copiados = 0
+
+    try:
+        with os.fdopen(descritor, "wb") as arquivo_temporario:
+            while pedaco := origem.read(TAMANHO_PEDACO):
+                copiados += len(pedaco)
+
+                # Interrompe a cópia assim que o limite é excedido
+                if copiados > tamanho_maximo:
+                    temporario.unlink()
+                    return None
+
+                resumo.update(pedaco)
+                arquivo_temporario.write(pedaco)
+    except BaseException:
+        temporario.unlink(missing_ok=True)
+        raise
+
+    return temporario, resumo.hexdigest()
+
+
+def image_suffix(nome_arquivo: str) -> str:
+    """
+    Extrai a extensão do nome de arquivo enviado, em minúsculas.
+
+    Args:
+        nome_arquivo (str): Nome do arquivo enviado.
+    Returns:
+        str: Extensão (ex.: ".png"), ou vazio se inválida.
+    """
+    sufixo = Path(nome_arquivo or "").suffix.lower()
+
+    return sufixo if PADRAO_SUFIXO.fullmatch(sufixo) else ""
+
+
+def image_key(sha256: str, sufixo: str) -> str:
+    """
+    Chave de armazenamento de uma imagem, endereçada pelo conteúdo.
+
+    Args:
+        sha256 (str): Hash SHA-256 (hex) do conteúdo.
+        sufixo (str): Extensão do arquivo.
+    Returns:
+        str: Chave no formato images/{sha256}{sufixo}.
+    """
+    return f"{PREFIXO_IMAGENS}{sha256}{sufixo}"
+
+
+def uploads_disabled() -> APIException:
+    """
+    Erro para envios diretos com DIRECT_UPLOADS desativado.
+    """
+    return APIException(
+        code=404,
+        description="O envio direto de imagens está desativado.",
+        message="Envio direto desativado."
+    )
+
+
+def too_large() -> APIException:
+    """
+    Erro para imagens acima de MAX_UPLOAD_SIZE.
+    """
+    return APIException(
+        code=413,
+        description=(
+            f"A imagem excede o tamanho máximo de "
+            f"{settings.MAX_UPLOAD_SIZE} bytes."
+        ),
+        message="Imagem muito grande."
+    )
+
+
+async def store_buffered(
+        temporario: Path,
+        chave: str,
+        content_type: str = None,
+        destino: Storage = None
+) -> str:
+    """
+    Armazena um arquivo temporário na chave, reaproveitando o objeto se o
+    conteúdo já estiver armazenado.
+
+    Args:
+        temporario (Path): Arquivo temporário, consumido pela função.
+        chave (str): Chave de armazenamento.
+        content_type (str): Tipo do conteúdo.
+        destino (Storage): Backend de armazenamento (padrão: o configurado).
+    Returns:
+        str: Referência do objeto a ser gravada no banco.
+    """
+    destino = destino or armazenamento
+
+    if await destino.size(chave) is None:
+        await destino.put(chave, temporario, content_type)
+    else:
+        await to_thread.run_sync(temporario.unlink)
+
+    return destino.locate(chave)
+
+
+async def save_upload(arquivo: UploadFile, destino: Storage = None) -> str:
+    """
+    Salva uma imagem enviada pelo hash do seu conteúdo, sem bloquear o
+    event loop: a cópia em pedaços roda em uma thread do pool.
+
+    Envios com o mesmo conteúdo resultam no mesmo objeto.
+
+    Args:
+        arquivo (UploadFile): Imagem enviada.
+        destino (Storage): Backend de armazenamento (padrão: o configurado).
+    Returns:
+        str: Referência da imagem a ser gravada no banco.
+    Raises:
+        APIException: Se a imagem exceder MAX_UPLOAD_SIZE.
+    """
+    copia = await to_thread.run_sync(
+        buffer_limited, arquivo.file, settings.MAX_UPLOAD_SIZE, destino,
+        limiter=limitador_uploads
+    )
+
+    if copia is None:
+        raise too_large()
+
+    temporario, sha256 = copia
+    chave = image_key(sha256, image_suffix(arquivo.filename))
+
+    return await store_buffered(
+        temporario, chave, arquivo.content_type, destino
+    )
+
+
+async def presign_upload(
+        nome_arquivo: str,
+        sha256: str,
+        tamanho: int,
+        content_type: str
+) -> EnvioImagem:
+    """
+    Prepara o envio direto de uma imagem ao armazenamento, sem que o
+    conteúdo passe pela API.
+
+    A chave é derivada do hash informado; se a imagem já estiver
+    armazenada, o envio é dispensado.
+
+    Args:
+        nome_arquivo (str): Nome do arquivo, usado para a extensão.
+        sha256 (str): Hash SHA-256 (hex) do conteúdo.
+        tamanho (int): Tamanho do conteúdo, em bytes.
+        content_type (str): Tipo do conteúdo.
+    Returns:
+        EnvioImagem: Chave da imagem e, se necessário, os dados do envio.
+    Raises:
+        APIException: Se a imagem exceder MAX_UPLOAD_SIZE ou os envios
+        diretos estiverem desativados.
+    """
+    if not settings.DIRECT_UPLOADS:
+        raise uploads_disabled()
+
+    if tamanho > settings.MAX_UPLOAD_SIZE:
+        raise too_large()
+
+    chave = image_key(sha256, image_suffix(nome_arquivo))
+
+    if await armazenamento.size(chave) is not None:
+        return EnvioImagem(chave=chave, existente=True)
+
+    envio = await armazenamento.presigned_upload(
+        chave, sha256, tamanho, content_type
+    )
+
+    return EnvioImagem(chave=chave, **envio)
+
+
+async def receive_upload(
+        chave: str,
+        corpo: AsyncIterator[bytes],
+        sha256: str,
+        tamanho: int,
+        expira: int,
+        assinatura: str,
+        content_type: str = None
+):
+    """
+    Recebe um envio direto assinado (backends sem URLs assinadas próprias)
+    e o armazena se o conteúdo corresponder ao hash e ao tamanho
+    assinados.
+
+    Args:
+        chave (str): Chave da imagem.
+        corpo (AsyncIterator): Corpo da requisição.
+        sha256 (str): Hash SHA-256 (hex) assinado.
+        tamanho (int): Tamanho assinado, em bytes.
+        expira (int): Instante de expiração assinado.
+        assinatura (str): Assinatura do envio.
+        content_type (str): Tipo do conteúdo.
+    Raises:
+        APIException: Se a assinatura for inválida ou o conteúdo não
+        corresponder ao que foi assinado.
+    """
+    if not settings.DIRECT_UPLOADS:
+        raise uploads_disabled()
+
+    if not verify_upload(chave, sha256, tamanho, expira, assinatura):
+        raise APIException(
+            code=403,
+            description="Assinatura do envio inválida ou expirada.",
+            message="Envio não autorizado."
+        )
+
+    descritor, temporario = armazenamento.staging_file(PREFIXO_IMAGENS)
+    resumo = hashlib.sha256()
+    recebidos = 0
+
+    try:
+        with os.fdopen(descritor, "wb") as arquivo_temporario:
+            async for pedaco in corpo:
+                recebidos += len(pedaco)
+                if recebidos > tamanho:
+                    break
+
+                resumo.update(pedaco)
+                await to_thread.run_sync(
+                    arquivo_temporario.write, pedaco,
+                    limiter=limitador_uploads
+                )
+
+        if recebidos != tamanho or resumo.hexdigest() != sha256:
+            raise APIException(
+                code=400,
+                description=(
+                    "O conteúdo enviado não corresponde ao hash e ao "
+                    "tamanho informados."
+                ),
+                message="Conteúdo inválido."
+            )
+
+        await store_buffered(temporario, chave, content_type)
+    finally:
+        temporario.unlink(missing_ok=True)
+
+
+async def claim_upload(chave: str) -> str:
+    """
+    Confirma que uma imagem enviada diretamente está armazenada.
+
+    Args:
+        chave (str): Chave retornada por presign_upload.
+    Returns:
+        str: Referência da imagem a ser gravada no banco.
+    Raises:
+        APIException: Se a chave for inválida, a imagem não tiver sido
+        enviada ou exceder MAX_UPLOAD_SIZE.
+    """
+    tamanho = None
+    if PADRAO_CHAVE.fullmatch(chave or ""):
+        tamanho = await armazenamento.size(chave)
+
+    if tamanho is None:
+        raise APIException(
+            code=400,
+            description=f"Imagem {chave} não encontrada no armazenamento.",
+            message="Imagem não encontrada."
+        )
+
+    if tamanho > settings.MAX_UPLOAD_SIZE:
+        raise too_large()
+
+    return armazenamento.locate(chave)
+
+
+async def obtain_image(arquivo: UploadFile = None, chave: str = None) -> str:
+    """
+    Salva a imagem enviada ou confirma a imagem enviada diretamente.
+
+    Args:
+        arquivo (UploadFile): Imagem enviada pela API.
+        chave (str): Chave de uma imagem enviada diretamente.
+    Returns:
+        str: Referência da imagem, ou None se nenhuma foi informada.
+    """
+    if arquivo:
+        return await save_upload(arquivo)
+
+    if chave:
+        return await claim_upload(chave)
+
+    return None
+
+
+def render_variants(conteudo: bytes) -> dict[str, dict[str, bytes]]:
+    """
+    Gera as variantes redimensionadas (VARIANTES) de uma imagem em cada
+    formato disponível (FORMATOS).
+
+    Aplica a orientação indicada no EXIF (as variantes são gravadas sem
+    metadados) e não amplia imagens menores que a largura da variante.
+    Imagens com mais pixels que Image.MAX_IMAGE_PIXELS são recusadas antes
+    de serem decodificadas.
+
+    Args:
+        conteudo (bytes): Conteúdo da imagem original.
+    Returns:
+        dict: Conteúdo das variantes por nome e formato, ou vazio se não
+        for uma imagem válida.
+    """
+    variantes = {}
+
+    try:
+        with Image.open(io.BytesIO(conteudo)) as imagem:
+            # Poucos bytes podem declarar dimensões que ocupariam gigabytes
+            # de memória ao decodificar (decompression bomb)
+            limite = Image.MAX_IMAGE_PIXELS
+            if limite and imagem.width * imagem.height > limite:
+                return {}
+
+            imagem.load()
+            # Fotos de celular costumam vir giradas, com a orientação
+            # apenas na tag EXIF
+            imagem = ImageOps.exif_transpose(imagem)
+            if imagem.mode not in ("RGB", "RGBA"):
+                imagem = imagem.convert("RGBA")
+
+            for nome, largura in VARIANTES.items():
+                copia = imagem.copy()
+                copia.thumbnail((largura, largura * 4))
+
+                variantes[nome] = {}
+                for formato, qualidade in FORMATOS.items():
+                    saida = io.BytesIO()
+                    copia.save(saida, format=formato, quality=qualidade)
+                    variantes[nome][formato] = saida.getvalue()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        return {}
+
+    return variantes
+
+
+async def create_variants(referencia: str) -> dict[str, dict[str, str]]:
+    """
+    Gera e armazena as variantes de uma imagem, ao lado da original
+    (``{hash}.{variante}.{formato}``). A renderização roda em uma thread,
+    sem bloquear o event loop.
+
+    Args:
+        referencia (str): Referência da imagem original.
+    Returns:
+        dict: URLs das variantes por nome e formato, ou vazio se não for
+        uma imagem válida.
+    """
+    chave = armazenamento.key_of(referencia)
+    conteudo = await armazenamento.read(chave)
+
+    renderizadas = await to_thread.run_sync(
+        render_variants, conteudo, limiter=limitador_uploads
+    )
+    if not renderizadas:
+        logger.warning("Não foi possível processar a imagem %s", referencia)
+        return {}
+
+    base = chave.removesuffix(PurePosixPath(chave).suffix)
+    variantes = {}
+
+    for nome, formatos in renderizadas.items():
+        variantes[nome] = {}
+        for formato, dados in formatos.items():
+            chave_variante = f"{base}.{nome}.{formato}"
+
+            # Imagens com o mesmo conteúdo compartilham variantes
+            if await armazenamento.size(chave_variante) is None:
+                await armazenamento.put_bytes(
+                    chave_variante, dados, f"image/{formato}"
+                )
+
+            variantes[nome][formato] = armazenamento.url(chave_variante)
+
+    return variantes
+
+
+def storage_key(referencia: str) -> str:
+    """
+    Chave de armazenamento de uma imagem (ex.: na exportação do cardápio),
+    que pode ser informada no lugar do arquivo ao cadastrar itens.
+
+    Args:
+        referencia (str): Referência ou URL da imagem.
+    Returns:
+        str: Chave da imagem, ou a própria referência se estiver fora do
+        armazenamento.
+    """
+    try:
+        return armazenamento.key_of(referencia)
+    except ValueError:
+        return referencia
+
+
+async def ensure_stored(referencias: Iterable[str]):
+    """
+    Confirma que as imagens ainda estão no armazenamento.
+
+    Args:
+        referencias: Referências das imagens.
+    Raises:
+        APIException: Se alguma imagem foi removida nesse meio tempo.
+    """
+    for referencia in referencias:
+        try:
+            chave = armazenamento.key_of(referencia)
+        except ValueError:
+            # Imagem fora do armazenamento, nunca removida pela aplicação
+            continue
+
+        if await armazenamento.size(chave) is None:
+            raise APIException(
+                code=409,
+                description=(
+                    "A imagem foi removida enquanto o item era salvo; "
+                    "envie-a novamente."
+                ),
+                message="Imagem removida."
+            )
+
+
+async def remove_image(referencia: str):
+    """
+    Remove uma imagem do armazenamento, se existir.
+
+    Args:
+        referencia (str): Referência ou URL da imagem.
+    """
+    if not referencia:
+        return
+
+    try:
+        await armazenamento.delete(armazenamento.key_of(referencia))
+    except ValueError:
+        logger.warning("Imagem fora do armazenamento: %s", referencia)
+
+
+async def remove_variants(variantes: dict[str, dict[str, str]]):
+    """
+    Remove as variantes de uma imagem do armazenamento.
+
+    Args:
+        variantes (dict): URLs das variantes por nome e formato.
+    """
+    for formatos in (variantes or {}).values():
+        for url in formatos.values():
+            await remove_image(url)
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles que marca como imutáveis os arquivos nomeados pelo hash do
+    seu conteúdo, para que navegadores e CDNs não os revalidem.
+    """
+    def file_response(self, full_path, *args, **kwargs):
+        resposta = super().file_response(full_path, *args, **kwargs)
+
+        if PADRAO_CONTEUDO.fullmatch(Path(full_path).name):
+            resposta.headers["Cache-Control"] = CACHE_IMUTAVEL
+
+        return resposta
@@ -1,11 +1,54 @@
+# Imports do sistema
+from datetime import datetime, timezone
+
 # Imports de terceiros
-from sqlalchemy import Column, Float, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import (DDL, JSON, Column, Computed, Date, DateTime, Enum,
+                        Float, ForeignKey, Index, Integer, String,
+                        UniqueConstraint, event)
 
 # Imports locais
 from core.database import Base
 from src.menu.schemas import StatusPedido
 
+# Configuração de busca textual em português que ignora acentos
+CONFIG_BUSCA = "portugues_sem_acento"
+
+# Status dos pedidos que ainda estão na fila da cozinha
+STATUS_ATIVOS = (StatusPedido.PENDENTE.value, StatusPedido.PREPARANDO.value)
+
+
+def normalize_category(categoria: str) -> str:
+    """
+    Normaliza o nome de uma categoria da mesma forma que a coluna
+    ItemModel.categoria_normalizada (lower(trim(categoria))).
+
+    Args:
+        categoria (str): Nome da categoria.
+    Returns:
+        str: Nome da categoria normalizado.
+    """
+    return categoria.strip().lower()
+
+
+def utc_now() -> datetime:
+    """
+    Data e hora atuais em UTC.
+    """
+    return datetime.now(timezone.utc)
+
+
+def to_cents(valor: float) -> int:
+    """
+    Converte um preço para centavos, a unidade em que os preços são
+    registrados nos pedidos.
+
+    Args:
+        valor (float): Preço em reais.
+    Returns:
+        int: Preço em centavos.
+    """
+    return round(valor * 100)
+
 
 class ItemModel(Base):
     """
@@ -18,10 +61,60 @@ class ItemModel(Base):
     descricao = Column(String, nullable=False)
     preco = Column(Float, nullable=False)
     categoria = Column(String, nullable=False)
+    categoria_normalizada = Column(
+        String, Computed("lower(trim(categoria))", persisted=True)
+    )
     url_imagem = Column(String, nullable=False)
+    imagens = Column(JSON, nullable=True)
+
+    __table_args__ = (
+        # Busca exata pela categoria (B-tree)
+        Index("ix_itens_categoria_normalizada", "categoria_normalizada"),
+        # Busca aproximada (LIKE '%...%') com trigramas do pg_trgm
+        Index(
+            "ix_itens_categoria_normalizada_trgm",
+            "categoria_normalizada",
+            postgresql_using="gin",
+            postgresql_ops={"categoria_normalizada": "gin_trgm_ops"},
+        ),
+    )
 
-    pedidos = relationship(
-        "PedidoModel", secondary="pedido_itens", back_populates="itens"
+
+# O índice de trigramas é criado junto com a tabela e depende do pg_trgm
+event.listen(
+    ItemModel.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql"
+    )
+)
+
+# A coluna de busca textual (tsvector) existe apenas no PostgreSQL e não é
+# mapeada no modelo; as consultas a referenciam como itens.busca. Estes
+# comandos a recriam quando as tabelas são geradas com create_all.
+for comando in (
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""
+    DO $$ BEGIN
+        CREATE TEXT SEARCH CONFIGURATION {CONFIG_BUSCA} (COPY = portuguese);
+        ALTER TEXT SEARCH CONFIGURATION {CONFIG_BUSCA}
+            ALTER MAPPING FOR hword, hword_part, word
+            WITH unaccent, portuguese_stem;
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$
+    """,
+    f"""
+    ALTER TABLE itens ADD COLUMN busca tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{CONFIG_BUSCA}', coalesce(nome, '')), 'A') ||
+        setweight(to_tsvector('{CONFIG_BUSCA}', coalesce(descricao, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_itens_busca ON itens USING gin (busca)",
+):
+    event.listen(
+        ItemModel.__table__,
+        "after_create",
+        DDL(comando).execute_if(dialect="postgresql")
     )
 
 
@@ -32,13 +125,28 @@ class PedidoModel(Base):
     __tablename__ = "pedidos"
 
     id = Column(Integer, primary_key=True, index=True)
-    itens = relationship(
-        "ItemModel", secondary="pedido_itens", back_populates="pedidos"
-    )
+    # Tipo enum nativo no PostgreSQL; os valores continuam sendo strings
     status = Column(
-        String, nullable=False, default=StatusPedido.PENDENTE.value
+        Enum(*StatusPedido.list(), name="status_pedido"),
+        nullable=False,
+        default=StatusPedido.PENDENTE.value
     )
     preco_total = Column(Float, nullable=False, default=0.0)
+    criado_em = Column(
+        DateTime(timezone=True), nullable=False, default=utc_now
+    )
+
+    __table_args__ = (
+        # Fila da cozinha: apenas os pedidos ativos, na ordem de chegada
+        # (ID). O índice não cresce com o histórico de pedidos entregues e
+        # cancelados
+        Index(
+            "ix_pedidos_ativos",
+            "id",
+            postgresql_where=status.in_(STATUS_ATIVOS),
+            sqlite_where=status.in_(STATUS_ATIVOS),
+        ),
+    )
 
 
 class PedidoItensModel(Base):
@@ -49,5 +157,110 @@ class PedidoItensModel(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     pedido_id = Column(Integer, ForeignKey("pedidos.id"), nullable=False)
-    item_id = Column(Integer, ForeignKey("itens.id"), nullable=False)
+    # Sem relacionamentos do ORM com itens e pedidos: as linhas não são
+    # apagadas junto com o item. Quando o item sai do cardápio, a linha
+    # permanece no pedido, com item_id nulo e os dados registrados abaixo
+    item_id = Column(
+        Integer, ForeignKey("itens.id", ondelete="SET NULL"), nullable=True
+    )
     quantidade = Column(Integer, nullable=False, default=1)
+    # Nome, categoria (normalizada) e preço do item no momento do pedido:
+    # os detalhes, os totais e os resumos de vendas do pedido não mudam
+    # quando o item é alterado e dispensam o join com itens
+    nome = Column(String, nullable=False)
+    categoria = Column(String, nullable=False)
+    preco_unitario_centavos = Column(Integer, nullable=False)
+    subtotal_centavos = Column(
+        Integer,
+        Computed("quantidade * preco_unitario_centavos", persisted=True)
+    )
+
+    __table_args__ = (
+        # Um item aparece uma única vez por pedido; o índice da restrição
+        # também atende as buscas por pedido_id (primeira coluna)
+        UniqueConstraint(
+            "pedido_id", "item_id", name="uq_pedido_itens_pedido_item"
+        ),
+        # Buscas por item (ex.: exclusão de itens do cardápio)
+        Index("ix_pedido_itens_item_id", "item_id"),
+    )
+
+
+class ArquivoImagemModel(Base):
+    """
+    Modelo de Arquivo de Imagem para o banco de dados.
+
+    Conta quantos itens usam cada arquivo de imagem; o arquivo só é
+    removido do disco quando não é mais referenciado.
+    """
+    __tablename__ = "arquivos_imagem"
+
+    caminho = Column(String, primary_key=True)
+    referencias = Column(Integer, nullable=False, default=0)
+
+
+class ChaveIdempotenciaModel(Base):
+    """
+    Modelo das chaves de idempotência dos pedidos para o banco de dados.
+
+    Cada chave (cabeçalho Idempotency-Key de fazer_pedido) é gravada na
+    mesma transação do pedido que criou: repetições da requisição retornam
+    o mesmo resultado sem criar outro pedido. Chaves mais antigas que
+    IDEMPOTENCY_TTL podem ser reutilizadas e são removidas periodicamente.
+    """
+    __tablename__ = "chaves_idempotencia"
+
+    chave = Column(String, primary_key=True)
+    # Hash SHA-256 do corpo da requisição original
+    impressao = Column(String, nullable=False)
+    # Sem chave estrangeira: o resultado permanece se o pedido for removido
+    pedido_id = Column(Integer, nullable=True)
+    criado_em = Column(
+        DateTime(timezone=True), nullable=False, default=utc_now, index=True
+    )
+
+
+class CategoriaResumoModel(Base):
+    """
+    Modelo do resumo das categorias do cardápio para o banco de dados.
+
+    Uma linha por categoria normalizada, recalculada na mesma transação
+    das escritas de itens (refresh_category_summary): a listagem de
+    categorias lê apenas esta tabela, pela chave primária.
+    """
+    __tablename__ = "categorias_resumo"
+
+    categoria = Column(String, primary_key=True)
+    quantidade_itens = Column(Integer, nullable=False)
+    preco_minimo = Column(Float, nullable=False)
+    preco_maximo = Column(Float, nullable=False)
+
+
+class VendaDiariaItemModel(Base):
+    """
+    Modelo do resumo de vendas por dia e item para o banco de dados.
+
+    Mantido a cada alteração dos pedidos (record_sales), para que os
+    relatórios de vendas leiam uma linha por dia e item em vez de todos os
+    pedidos. Os pedidos cancelados não são contados. Sem chave estrangeira:
+    o histórico permanece quando o item é removido do cardápio.
+    """
+    __tablename__ = "vendas_diarias_itens"
+
+    dia = Column(Date, primary_key=True)
+    item_id = Column(Integer, primary_key=True)
+    nome = Column(String, nullable=False)
+    quantidade = Column(Integer, nullable=False, default=0)
+    receita_centavos = Column(Integer, nullable=False, default=0)
+
+
+class VendaDiariaCategoriaModel(Base):
+    """
+    Modelo do resumo de vendas por dia e categoria para o banco de dados.
+    """
+    __tablename__ = "vendas_diarias_categorias"
+
+    dia = Column(Date, primary_key=True)
+    categoria = Column(String, primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
+    receita_centavos = Column(Integer, nullable=False, default=0)
@@ -1,19 +1,41 @@
+# Imports do sistema
+from datetime import date
+
 # Imports de terceiros
-from fastapi import APIRouter, File, UploadFile
+from fastapi import (APIRouter, BackgroundTasks, File, Header, Query, Request,
+                     Response, UploadFile, WebSocket)
 from fastapi.params import Depends
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Imports locais
-from core.database import get_db
+from core.body_limit import body_limit
+from core.database import SessionLocal, get_db
 from core.exceptions import APIException
+from core.query_budget import query_budget
 from core.schemas import SuccessResponse
-from src.menu.crud import (create_item, delete_item, delete_order,
+from src.menu.bulk import MenuImport
+from src.menu.cache import etag_match
+from src.menu.crud import (claim_idempotency_key, create_item, delete_item,
+                           delete_order, export_items, export_orders,
                            get_all_categories, get_all_orders,
-                           get_detail_order, get_item_by_id, get_menu,
-                           place_order, update_item, update_order,
+                           get_category_sales, get_daily_sales,
+                           get_detail_order, get_item_by_id, get_kitchen_queue,
+                           get_menu_payload, get_top_items, import_items,
+                           place_order, process_imported_images,
+                           process_item_image, purge_idempotency_keys,
+                           search_items, update_item, update_order,
                            update_order_status)
-from src.menu.schemas import PedidoClienteInput, StatusPedido
-
+from src.menu.events import forward_order_events, order_event_stream
+from src.menu.idempotency import pedidos_idempotentes, request_fingerprint
+from src.menu.images import presign_upload, receive_upload
+from src.menu.models import STATUS_ATIVOS
+from src.menu.schemas import (EnvioImagem, FormatoExportacao,
+                              PedidoClienteInput, StatusPedido)
+
+# O orçamento de comandos SQL de cada rota (query_budget, verificado com
+# DEBUG) considera o cardápio fora do cache e inclui as tarefas em segundo
+# plano e o corpo das respostas em streaming
 router = APIRouter(
     prefix="/cardapio",
     tags=["cardapio"],
@@ -22,26 +44,75 @@ router = APIRouter(
 
 
 @router.get("/obter_cardapio")
+@query_budget(1)
 async def obter_cardapio(
         categoria: str = None,
-        db: Session = Depends(get_db)
+        if_none_match: str = Header(None),
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna o cardápio completo ou filtrado por categoria do banco de dados.
 
+    A resposta é enviada com um ETag forte; se o cliente informar o mesmo
+    valor em If-None-Match, retorna 304 sem corpo.
+
     Args:
         categoria (str): Categoria para filtrar os itens do cardápio.
-        db (Session): Sessão do banco de dados.
+        if_none_match (str): ETag da versão do cardápio que o cliente possui.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         list: Lista de itens do cardápio.
     """
 
-    cardapio = get_menu(db, categoria)
+    cardapio = await get_menu_payload(db, categoria)
+
+    if cardapio is not None:
+        corpo, etag = cardapio
+        cabecalhos = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if etag_match(if_none_match, etag):
+            return Response(status_code=304, headers=cabecalhos)
+
+        return Response(
+            content=corpo,
+            media_type="application/json",
+            headers=cabecalhos
+        )
+
+    raise APIException(
+        code=404,
+        description="Nenhum item encontrado.",
+        message="Nenhum item encontrado."
+    )
+
+
+@router.get("/buscar")
+@query_budget(1)
+async def buscar(
+        texto: str = Query(..., min_length=1),
+        categoria: str = None,
+        pagina: int = Query(1, ge=1),
+        limite: int = Query(20, ge=1, le=100),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Busca itens do cardápio pelo nome e pela descrição.
+
+    Args:
+        texto (str): Texto da busca (ex.: "frango").
+        categoria (str): Categoria para filtrar os itens.
+        pagina (int): Número da página, a partir de 1.
+        limite (int): Quantidade máxima de itens na página.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+    Returns:
+        list: Itens encontrados, do mais para o menos relevante.
+    """
+    itens = await search_items(db, texto, categoria, pagina, limite)
 
-    if len(cardapio) != 0:
+    if len(itens) != 0:
         return SuccessResponse(
-            data=cardapio,
-            message="Cardápio obtido com sucesso.",
+            data=itens,
+            message="Itens encontrados com sucesso.",
         )
 
     raise APIException(
@@ -52,21 +123,22 @@ async def obter_cardapio(
 
 
 @router.get("/obter_item/{item_id}")
+@query_budget(1)
 async def obter_item_id(
         item_id: int,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna um item do cardápio pelo ID.
 
     Args:
         item_id (int): ID do item.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         MenuItem: Item do cardápio.
     """
     # Busca o item pelo ID no banco de dados
-    item = get_item_by_id(db, item_id)
+    item = await get_item_by_id(db, item_id)
 
     # Verifica se o item foi encontrado
     if item:
@@ -83,20 +155,35 @@ async def obter_item_id(
 
 
 @router.get("/obter_pedidos")
+@query_budget(1)
 async def obter_pedidos(
-        db: Session = Depends(get_db)
+        limite: int = Query(50, ge=1, le=500),
+        cursor: int = None,
+        status: StatusPedido = None,
+        id_inicial: int = None,
+        id_final: int = None,
+        db: AsyncSession = Depends(get_db)
 ):
     """
-    Retorna todos os pedidos realizados.
+    Retorna os pedidos realizados, paginados pelo ID.
 
+    Args:
+        limite (int): Quantidade máxima de pedidos na página.
+        cursor (int): Valor de proximo_cursor da página anterior.
+        status (str): Filtra os pedidos pelo status.
+        id_inicial (int): Menor ID de pedido (inclusivo).
+        id_final (int): Maior ID de pedido (inclusivo).
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
-        list: Lista de pedidos realizados.
+        PaginaPedidos: Página de pedidos e o cursor da próxima página.
     """
-    pedidos = get_all_orders(db)
+    pagina = await get_all_orders(
+        db, limite, cursor, status, id_inicial, id_final
+    )
 
-    if len(pedidos) != 0:
+    if len(pagina.pedidos) != 0:
         return SuccessResponse(
-            data=pedidos,
+            data=pagina,
             message="Pedidos obtidos com sucesso.",
         )
 
@@ -107,23 +194,227 @@ async def obter_pedidos(
     )
 
 
+@router.get("/fila_cozinha")
+@query_budget(1)
+async def fila_cozinha(
+        limite: int = Query(100, ge=1, le=500),
+        cursor: int = None,
+        status: StatusPedido = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna os pedidos ativos (PRE-PEDIDO e PENDENTE) na ordem de chegada,
+    para as telas da cozinha. Uma fila vazia não é um erro.
+
+    Args:
+        limite (int): Quantidade máxima de pedidos na página.
+        cursor (int): Valor de proximo_cursor da página anterior.
+        status (str): Filtra por um dos status ativos.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+    Returns:
+        PaginaPedidos: Página de pedidos e o cursor da próxima página.
+    """
+    if status is not None and status.value not in STATUS_ATIVOS:
+        raise APIException(
+            code=400,
+            description="O status informado não faz parte da fila.",
+            message="O status informado não faz parte da fila."
+        )
+
+    pagina = await get_kitchen_queue(db, limite, cursor, status)
+
+    return SuccessResponse(
+        data=pagina,
+        message="Fila da cozinha obtida com sucesso.",
+    )
+
+
+@router.get("/vendas_diarias")
+@query_budget(1)
+async def vendas_diarias(
+        inicio: date = None,
+        fim: date = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna a quantidade vendida e a receita de cada dia do período.
+
+    Lê apenas os resumos de vendas, então o custo depende da quantidade de
+    dias, e não de pedidos. Pedidos cancelados não são contados.
+
+    Args:
+        inicio (date): Primeiro dia do período (inclusive).
+        fim (date): Último dia do período (inclusive).
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+    Returns:
+        list: Vendas por dia.
+    """
+    vendas = await get_daily_sales(db, inicio, fim)
+
+    return SuccessResponse(
+        data=vendas,
+        message="Vendas diárias obtidas com sucesso.",
+    )
+
+
+@router.get("/itens_mais_vendidos")
+@query_budget(1)
+async def itens_mais_vendidos(
+        inicio: date = None,
+        fim: date = None,
+        limite: int = Query(10, ge=1, le=100),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna os itens de maior receita no período.
+
+    Args:
+        inicio (date): Primeiro dia do período (inclusive).
+        fim (date): Último dia do período (inclusive).
+        limite (int): Quantidade de itens.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+    Returns:
+        list: Itens mais vendidos.
+    """
+    itens = await get_top_items(db, inicio, fim, limite)
+
+    return SuccessResponse(
+        data=itens,
+        message="Itens mais vendidos obtidos com sucesso.",
+    )
+
+
+@router.get("/vendas_por_categoria")
+@query_budget(1)
+async def vendas_por_categoria(
+        inicio: date = None,
+        fim: date = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna as vendas de cada categoria no período e a sua participação na
+    receita.
+
+    Args:
+        inicio (date): Primeiro dia do período (inclusive).
+        fim (date): Último dia do período (inclusive).
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+    Returns:
+        list: Vendas por categoria.
+    """
+    categorias = await get_category_sales(db, inicio, fim)
+
+    return SuccessResponse(
+        data=categorias,
+        message="Vendas por categoria obtidas com sucesso.",
+    )
+
+
+@router.get("/exportar_pedidos")
+@query_budget(1)
+async def exportar_pedidos(
+        formato: FormatoExportacao = FormatoExportacao.NDJSON
+):
+    """
+    Exporta o histórico completo de pedidos em NDJSON ou CSV.
+
+    A resposta é enviada em partes; a memória usada não depende da
+    quantidade de pedidos.
+
+    Args:
+        formato (FormatoExportacao): Formato de saída (ndjson ou csv).
+    Returns:
+        StreamingResponse: Arquivo com os pedidos e seus itens.
+    """
+    tipos = {
+        FormatoExportacao.NDJSON: "application/x-ndjson",
+        FormatoExportacao.CSV: "text/csv",
+    }
+
+    async def gerar():
+        # A sessão pertence ao gerador, pois precisa durar até o fim do envio
+        async with SessionLocal() as db:
+            async for trecho in export_orders(db, formato):
+                yield trecho
+
+    return StreamingResponse(
+        gerar(),
+        media_type=tipos[formato],
+        headers={
+            "Content-Disposition":
+                f'attachment; filename="pedidos.{formato.value}"'
+        }
+    )
+
+
+@router.get("/eventos_pedidos")
+@query_budget(0)
+async def eventos_pedidos(
+        pedido_id: int = None
+):
+    """
+    Envia os pedidos criados, atualizados, com status alterado ou removidos
+    assim que acontecem (Server-Sent Events), no lugar de consultar
+    obter_pedidos periodicamente.
+
+    Cada evento tem o tipo em ``event`` e o pedido (EventoPedido) em
+    ``data``. Se a conexão for encerrada, o navegador reconecta sozinho;
+    os eventos do intervalo não são reenviados e a tela deve recarregar os
+    pedidos.
+
+    Args:
+        pedido_id (int): Envia apenas os eventos deste pedido (ex.: tela do
+            cliente); sem ele, envia os de todos os pedidos (cozinha).
+    Returns:
+        StreamingResponse: Fluxo text/event-stream.
+    """
+    return StreamingResponse(
+        order_event_stream(pedido_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Desativa o buffer de proxies como o nginx
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+@router.websocket("/eventos_pedidos/ws")
+async def eventos_pedidos_ws(
+        websocket: WebSocket,
+        pedido_id: int = None
+):
+    """
+    Envia os eventos de pedidos (EventoPedido em JSON) por WebSocket.
+
+    Quando o servidor encerra a assinatura a conexão é fechada com o código
+    1013; o cliente deve reconectar e recarregar os pedidos.
+
+    Args:
+        websocket (WebSocket): Conexão do cliente.
+        pedido_id (int): Envia apenas os eventos deste pedido.
+    """
+    await forward_order_events(websocket, pedido_id)
+
+
 @router.get("/obter_detalhes_pedido/{pedido_id}")
+@query_budget(2)
 async def obter_detalhes_pedido(
         pedido_id: int,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna os detalhes de um pedido específico.
 
     Args:
         pedido_id (int): ID do pedido.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
 
     Returns:
         PedidoCliente: Detalhes do pedido.
     """
     # Busca os detalhes do pedido no banco de dados
-    pedido_detalahdo = get_detail_order(db, pedido_id)
+    pedido_detalahdo = await get_detail_order(db, pedido_id)
 
     if pedido_detalahdo is not None:
         return SuccessResponse(
@@ -139,23 +430,30 @@ async def obter_detalhes_pedido(
 
 
 @router.get("/obter_categorias")
+@query_budget(1)
 async def obter_categorias(
-        db: Session = Depends(get_db)
+        detalhes: bool = False,
+        db: AsyncSession = Depends(get_db)
 ):
     """
-    Retorna todas as categorias do cardápio.
+    Retorna todas as categorias do cardápio, em ordem alfabética.
 
     Args:
-        db (Session): Sessão do banco de dados.
+        detalhes (bool): Inclui a quantidade de itens e os preços mínimo e
+            máximo de cada categoria, no lugar de apenas os nomes.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         list: Lista de categorias.
     """
-    # Busca as categorias no banco de dados
-    categorias = get_all_categories(db)
+    # Busca as categorias no resumo mantido pelas escritas de itens
+    categorias = await get_all_categories(db)
 
     if len(categorias) != 0:
         return SuccessResponse(
-            data=categorias,
+            data=(
+                categorias if detalhes
+                else [categoria.nome for categoria in categorias]
+            ),
             message="Categorias obtidas com sucesso.",
         )
 
@@ -166,14 +464,86 @@ async def obter_categorias(
     )
 
 
+@router.post("/imagens/url_envio")
+@query_budget(0)
+async def obter_url_envio(
+        nome_arquivo: str,
+        sha256: str = Query(..., pattern="^[0-9a-f]{64}$"),
+        tamanho: int = Query(..., ge=1),
+        content_type: str = "application/octet-stream"
+):
+    """
+    Gera uma URL para enviar uma imagem diretamente ao armazenamento, sem
+    que o conteúdo passe pela API.
+
+    Depois do envio, a chave retornada é informada em chave_imagem ao
+    cadastrar ou atualizar o item. Se a imagem já estiver armazenada
+    (existente), o envio é dispensado.
+
+    Args:
+        nome_arquivo (str): Nome do arquivo, usado para a extensão.
+        sha256 (str): Hash SHA-256 (hex) do conteúdo.
+        tamanho (int): Tamanho do conteúdo, em bytes.
+        content_type (str): Tipo do conteúdo.
+    Returns:
+        SuccessResponse: Chave da imagem e dados do envio.
+    """
+    envio = await presign_upload(nome_arquivo, sha256, tamanho, content_type)
+
+    return SuccessResponse(
+        data=envio,
+        message="URL de envio gerada com sucesso.",
+    )
+
+
+@router.put("/imagens/envio/{chave:path}")
+@query_budget(0)
+@body_limit("MAX_UPLOAD_SIZE")
+async def receber_envio(
+        chave: str,
+        request: Request,
+        sha256: str,
+        tamanho: int,
+        expira: int,
+        assinatura: str
+):
+    """
+    Recebe o envio direto de uma imagem assinado por /imagens/url_envio,
+    para os backends de armazenamento sem URLs assinadas próprias.
+
+    Args:
+        chave (str): Chave da imagem.
+        request (Request): Requisição, com o conteúdo da imagem no corpo.
+        sha256 (str): Hash SHA-256 (hex) assinado.
+        tamanho (int): Tamanho assinado, em bytes.
+        expira (int): Instante de expiração assinado.
+        assinatura (str): Assinatura do envio.
+    Returns:
+        SuccessResponse: Chave da imagem armazenada.
+    """
+    await receive_upload(
+        chave, request.stream(), sha256, tamanho, expira, assinatura,
+        request.headers.get("content-type")
+    )
+
+    return SuccessResponse(
+        data=EnvioImagem(chave=chave, existente=True),
+        message="Imagem enviada com sucesso.",
+    )
+
+
 @router.post("/cadastrar_item")
+@query_budget(8)
+@body_limit("MAX_UPLOAD_SIZE")
 async def cadastrar_item(
         nome: str,
         descricao: str,
         preco: float,
         categoria: str,
-        arquivo: UploadFile = File(...),
-        db: Session = Depends(get_db)
+        background_tasks: BackgroundTasks,
+        arquivo: UploadFile = File(None),
+        chave_imagem: str = None,
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Cadastra um novo item no cardápio.
@@ -183,15 +553,32 @@ async def cadastrar_item(
         descricao (str): Descrição do item.
         preco (float): Preço do item.
         categoria (str): Categoria do item.
+        background_tasks (BackgroundTasks): Tarefas executadas após a resposta.
         arquivo (UploadFile): Imagem do item.
-        db (Session): Sessão do banco de dados.
+        chave_imagem (str): Chave de uma imagem enviada diretamente ao
+            armazenamento (veja /imagens/url_envio), no lugar de arquivo.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         SuccessResponse: Mensagem de sucesso.
     """
+    if not arquivo and not chave_imagem:
+        raise APIException(
+            code=400,
+            description="Informe o arquivo ou a chave da imagem do item.",
+            message="Imagem do item não informada."
+        )
+
     # Cria o item no banco de dados
-    item = create_item(db, nome, descricao, preco, categoria, arquivo)
+    item = await create_item(
+        db, nome, descricao, preco, categoria, arquivo, chave_imagem
+    )
 
     if item:
+        # Gera as variantes da imagem após o envio da resposta
+        background_tasks.add_task(
+            process_item_image, item.id, item.url_imagem
+        )
+
         return SuccessResponse(
             data=None,
             message="Item cadastrado com sucesso.",
@@ -204,26 +591,154 @@ async def cadastrar_item(
     )
 
 
+@router.post("/importar_itens")
+@query_budget(7)
+@body_limit("IMPORT_MAX_SIZE")
+async def importar_itens(
+        background_tasks: BackgroundTasks,
+        arquivo: UploadFile = File(...),
+        imagens: UploadFile = File(None),
+        formato: FormatoExportacao = None,
+        parcial: bool = False,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Cadastra vários itens do cardápio de uma vez, a partir de um arquivo
+    CSV (com cabeçalho) ou NDJSON com os campos nome, descricao, preco,
+    categoria e imagem.
+
+    A imagem de cada linha é o nome de um arquivo do pacote .zip enviado em
+    imagens ou a chave de uma imagem já armazenada (como em exportar_itens).
+    Todas as linhas são validadas antes da gravação, feita em uma única
+    transação. Se houver erros, nada é importado e o relatório com os erros
+    de cada linha é retornado, a menos que parcial seja informado.
+
+    Args:
+        background_tasks (BackgroundTasks): Tarefas executadas após a resposta.
+        arquivo (UploadFile): Arquivo com os itens.
+        imagens (UploadFile): Pacote .zip com as imagens dos itens.
+        formato (FormatoExportacao): Formato do arquivo (padrão: pela
+            extensão do nome; .csv ou ndjson).
+        parcial (bool): Importa as linhas válidas mesmo havendo erros.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
+    Returns:
+        SuccessResponse: Quantidade de itens importados e erros por linha.
+    """
+    importacao = MenuImport(arquivo, formato, imagens)
+    await importacao.validate()
+
+    if importacao.linhas_com_erro and not parcial:
+        erro = APIException(
+            code=422,
+            description="Há linhas inválidas; nenhum item foi importado.",
+            message="Erro ao importar os itens."
+        )
+        erro.data = importacao.report().model_dump()
+        raise erro
+
+    referencias = await importacao.store_images()
+    pendentes = await import_items(
+        db, [item for _, item in importacao.itens], referencias
+    )
+
+    # Gera as variantes das novas imagens após o envio da resposta
+    if pendentes:
+        background_tasks.add_task(process_imported_images, pendentes)
+
+    return SuccessResponse(
+        data=importacao.report(len(importacao.itens)),
+        message="Itens importados com sucesso.",
+    )
+
+
+@router.get("/exportar_itens")
+@query_budget(1)
+async def exportar_itens(
+        formato: FormatoExportacao = FormatoExportacao.NDJSON
+):
+    """
+    Exporta os itens do cardápio em NDJSON ou CSV, no formato aceito por
+    importar_itens, para copiar o cardápio para outra loja.
+
+    Args:
+        formato (FormatoExportacao): Formato de saída (ndjson ou csv).
+    Returns:
+        StreamingResponse: Arquivo com os itens.
+    """
+    tipos = {
+        FormatoExportacao.NDJSON: "application/x-ndjson",
+        FormatoExportacao.CSV: "text/csv",
+    }
+
+    async def gerar():
+        # A sessão pertence ao gerador, pois precisa durar até o fim do envio
+        async with SessionLocal() as db:
+            async for trecho in export_items(db, formato):
+                yield trecho
+
+    return StreamingResponse(
+        gerar(),
+        media_type=tipos[formato],
+        headers={
+            "Content-Disposition":
+                f'attachment; filename="itens.{formato.value}"'
+        }
+    )
+
+
 @router.post("/fazer_pedido")
+@query_budget(9)
 async def fazer_pedido(
         pedido: PedidoClienteInput,
         status: StatusPedido,
-        db: Session = Depends(get_db)
+        background_tasks: BackgroundTasks,
+        idempotency_key: str = Header(None, max_length=255),
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Realiza um pedido com os itens e quantidades especificadas.
 
+    Com o cabeçalho Idempotency-Key, repetições da requisição (ex.: novas
+    tentativas do cliente após uma falha de rede) retornam a mesma resposta
+    sem criar outro pedido, inclusive quando chegam ao mesmo tempo; a chave
+    vale por IDEMPOTENCY_TTL.
+
     Args:
         pedido (PedidoRequest): Detalhes do pedido, incluindo
         itens e quantidades.
         status (str): Status do pedido.
-        db (Session): Sessão do banco de dados.
+        background_tasks (BackgroundTasks): Tarefas executadas após a
+            resposta.
+        idempotency_key (str): Chave única da requisição, gerada pelo
+            cliente.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
 
     Returns:
         SuccessResponse: Confirmação do pedido.
     """
+    if idempotency_key is None:
+        pedido_cliente = await place_order(db, pedido, status)
+    else:
+        impressao = request_fingerprint(status.value, sorted(pedido.itens))
+
+        async def executar():
+            original = await claim_idempotency_key(
+                db, idempotency_key, impressao
+            )
+            if original is not None:
+                return original
+
+            novo_pedido = await place_order(
+                db, pedido, status, idempotency_key
+            )
+            return impressao, novo_pedido.id if novo_pedido else None
 
-    pedido_cliente = place_order(db, pedido, status)
+        pedido_cliente = await pedidos_idempotentes.run(
+            idempotency_key, impressao, executar
+        )
+
+        if pedidos_idempotentes.purge_due():
+            background_tasks.add_task(purge_idempotency_keys)
 
     if pedido_cliente:
         return SuccessResponse(
@@ -239,33 +754,48 @@ async def fazer_pedido(
 
 
 @router.put("/atualizar_item/{item_id}")
+@query_budget(11)
+@body_limit("MAX_UPLOAD_SIZE")
 async def atualizar_item(
         item_id: int,
+        background_tasks: BackgroundTasks,
         nome: str = None,
         descricao: str = None,
         preco: float = None,
         categoria: str = None,
         arquivo: UploadFile = File(None),
-        db: Session = Depends(get_db)
+        chave_imagem: str = None,
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Atualiza um item do cardápio.
 
     Args:
         item_id (int): ID do item a ser atualizado.
+        background_tasks (BackgroundTasks): Tarefas executadas após a resposta.
         nome (str): Novo nome do item.
         descricao (str): Nova descrição do item.
         preco (float): Novo preço do item.
         categoria (str): Nova categoria do item.
         arquivo (UploadFile): Nova imagem do item.
-        db (Session): Sessão do banco de dados.
+        chave_imagem (str): Chave de uma nova imagem enviada diretamente ao
+            armazenamento (veja /imagens/url_envio), no lugar de arquivo.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         SuccessResponse: Mensagem de sucesso.
     """
     # Atualiza o item no banco de dados
-    item = update_item(db, item_id, nome, descricao, preco, categoria, arquivo)
+    item = await update_item(
+        db, item_id, nome, descricao, preco, categoria, arquivo, chave_imagem
+    )
 
     if item:
+        # Gera as variantes da nova imagem após o envio da resposta
+        if arquivo or chave_imagem:
+            background_tasks.add_task(
+                process_item_image, item.id, item.url_imagem
+            )
+
         return SuccessResponse(
             data=None,
             message="Item atualizado com sucesso.",
@@ -279,10 +809,11 @@ async def atualizar_item(
 
 
 @router.put("/atualizar_status_pedido/{pedido_id}")
+@query_budget(7)
 async def atualizar_status_pedido(
         pedido_id: int,
         status: StatusPedido,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Atualiza o status de um pedido.
@@ -290,12 +821,12 @@ async def atualizar_status_pedido(
     Args:
         pedido_id (int): ID do pedido a ser atualizado.
         status (str): Novo status do pedido.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         SuccessResponse: Mensagem de sucesso.
     """
     # Atualiza o status do pedido no banco de dados
-    pedido = update_order_status(db, pedido_id, status)
+    pedido = await update_order_status(db, pedido_id, status)
 
     if pedido:
         return SuccessResponse(
@@ -311,10 +842,11 @@ async def atualizar_status_pedido(
 
 
 @router.put("/atualizar_pedido/{pedido_id}")
+@query_budget(9)
 async def atualizar_pedido(
         pedido_id: int,
         pedido: PedidoClienteInput,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Atualiza um pedido existente.
@@ -323,12 +855,12 @@ async def atualizar_pedido(
         pedido_id (int): ID do pedido a ser atualizado.
         pedido (PedidoRequest): Detalhes do pedido, incluindo
         itens e quantidades.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         SuccessResponse: Mensagem de sucesso.
     """
     # Atualiza o pedido no banco de dados
-    pedido_cliente = update_order(db, pedido_id, pedido)
+    pedido_cliente = await update_order(db, pedido_id, pedido)
 
     try:
         if pedido_cliente:
@@ -350,18 +882,19 @@ async def atualizar_pedido(
 
 
 @router.delete("/deletar_item/{item_id}")
-async def deletar_item(item_id: int, db: Session = Depends(get_db)):
+@query_budget(9)
+async def deletar_item(item_id: int, db: AsyncSession = Depends(get_db)):
     """
     Deleta um item do cardápio.
 
     Args:
         item_id (int): ID do item a ser deletado.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         SuccessResponse: Mensagem de sucesso.
     """
     # Verifica se o item existe no banco de dados
-    item = delete_item(db, item_id)
+    item = await delete_item(db, item_id)
 
     # Se o item existir, deleta-o
     if item:
@@ -378,21 +911,22 @@ async def deletar_item(item_id: int, db: Session = Depends(get_db)):
 
 
 @router.delete("/deletar_pedido/{pedido_id}")
+@query_budget(5)
 async def deletar_pedido(
         pedido_id: int,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Deleta um pedido.
 
     Args:
         pedido_id (int): ID do pedido a ser deletado.
-        db (Session): Sessão do banco de dados.
+        db (AsyncSession): Sessão assíncrona do banco de dados.
     Returns:
         SuccessResponse: Mensagem de sucesso.
     """
     # Verifica se o pedido existe no banco de dados
-    pedido = delete_order(db, pedido_id)
+    pedido = await delete_order(db, pedido_id)
 
     # Se o pedido existir, deleta-o
     if pedido:
@@ -0,0 +1,39 @@
+"""
+Recalcula os resumos de vendas (vendas_diarias_itens e
+vendas_diarias_categorias) a partir de todos os pedidos.
+
+Necessário após a migração que cria os resumos ou para corrigi-los; no
+dia a dia eles são atualizados pelas próprias rotas de pedidos.
+
+Uso:
+    python -m src.menu.sales
+"""
+# Imports do sistema
+import argparse
+import asyncio
+
+# Imports locais
+from core.database import SessionLocal, engine
+from src.menu.crud import rebuild_sales
+
+
+async def main():
+    try:
+        async with SessionLocal() as db:
+            por_item, por_categoria = await rebuild_sales(db)
+    finally:
+        await engine.dispose()
+
+    print(
+        f"Resumos de vendas recalculados: {por_item} registros por dia e "
+        f"item e {por_categoria} por dia e categoria."
+    )
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    ).parse_args()
+
+    asyncio.run(main())
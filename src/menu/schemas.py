@@ -1,8 +1,10 @@
 # Imports do sistema
+from datetime import date
 from enum import Enum
+from typing import Optional
 
 # Imports de terceiros
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class MenuItem(BaseModel):
@@ -15,6 +17,9 @@ class MenuItem(BaseModel):
     preco: float
     categoria: str
     url_imagem: str = None
+    # URLs das variantes da imagem por tamanho e formato, ex.:
+    # {"thumb": {"avif": "...", "webp": "..."}, "card": {...}, ...}
+    imagens: Optional[dict[str, dict[str, str]]] = None
 
     class Config:
         """
@@ -51,6 +56,14 @@ class PedidoClienteOutput(BaseModel):
         from_attributes = True
 
 
+class PaginaPedidos(BaseModel):
+    """
+    Modelo de página de pedidos.
+    """
+    pedidos: list[PedidoClienteOutput]
+    proximo_cursor: Optional[int] = None
+
+
 class StatusPedido(str, Enum):
     """
     Enumeração de status do pedido.
@@ -73,6 +86,7 @@ class DetalhePedido(BaseModel):
     itens: list[str]
     quantidade: list[int]
     precos_unitario: list[float]
+    subtotais: list[float]
     preco_total: float
 
     class Config:
@@ -80,3 +94,115 @@ class DetalhePedido(BaseModel):
         Configurações do modelo.
         """
         from_attributes = True
+
+
+class FormatoExportacao(str, Enum):
+    """
+    Enumeração de formatos de exportação de pedidos.
+    """
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class EnvioImagem(BaseModel):
+    """
+    Modelo de envio direto de uma imagem ao armazenamento.
+    """
+    chave: str
+    # True se a imagem já está armazenada e o envio é dispensado
+    existente: bool = False
+    metodo: Optional[str] = None
+    url: Optional[str] = None
+    cabecalhos: dict[str, str] = {}
+    expira: Optional[int] = None
+
+
+class TipoEventoPedido(str, Enum):
+    """
+    Enumeração de tipos de evento de pedido.
+    """
+    CRIADO = "criado"
+    ATUALIZADO = "atualizado"
+    STATUS_ALTERADO = "status_alterado"
+    REMOVIDO = "removido"
+
+
+class EventoPedido(BaseModel):
+    """
+    Modelo de evento de pedido enviado às telas da cozinha e dos clientes.
+    """
+    tipo: TipoEventoPedido
+    id: int
+    status: Optional[str] = None
+    preco_total: Optional[float] = None
+
+
+class ItemImportacao(BaseModel):
+    """
+    Modelo de linha da importação de itens do cardápio.
+    """
+    nome: str = Field(min_length=1)
+    descricao: str
+    preco: float = Field(gt=0)
+    categoria: str = Field(min_length=1)
+    # Nome do arquivo no pacote .zip de imagens ou chave de uma imagem já
+    # armazenada (como na exportação)
+    imagem: str = Field(min_length=1)
+
+
+class ErroImportacao(BaseModel):
+    """
+    Modelo de erro em uma linha da importação.
+    """
+    linha: int
+    mensagem: str
+
+
+class RelatorioImportacao(BaseModel):
+    """
+    Modelo de resultado da importação de itens.
+    """
+    importados: int = 0
+    linhas_com_erro: int = 0
+    # Primeiros erros encontrados, pela ordem das linhas
+    erros: list[ErroImportacao] = []
+
+
+class CategoriaResumo(BaseModel):
+    """
+    Modelo de resumo de uma categoria do cardápio.
+    """
+    nome: str
+    quantidade_itens: int
+    preco_minimo: float
+    preco_maximo: float
+
+
+class VendaDiaria(BaseModel):
+    """
+    Modelo de vendas de um dia.
+    """
+    dia: date
+    quantidade: int
+    receita: float
+
+
+class VendaItem(BaseModel):
+    """
+    Modelo de vendas de um item no período.
+    """
+    item_id: int
+    nome: str
+    quantidade: int
+    receita: float
+
+
+class VendaCategoria(BaseModel):
+    """
+    Modelo de vendas de uma categoria no período.
+    """
+    categoria: str
+    quantidade: int
+    receita: float
+    # Fração da receita do período (0 a 1)
+    participacao: float
@@ -0,0 +1,77 @@
+# Imports do sistema
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+# Imports locais
+from src.menu.schemas import MenuItem
+
+# Peso dos termos encontrados no nome e na descrição (como no setweight)
+PESO_NOME = 2
+PESO_DESCRICAO = 1
+
+
+def tokenize(texto: str) -> list[str]:
+    """
+    Separa o texto em termos minúsculos e sem acentos.
+
+    Args:
+        texto (str): Texto a ser separado.
+    Returns:
+        list: Lista de termos.
+    """
+    sem_acento = unicodedata.normalize("NFKD", texto or "")
+    sem_acento = "".join(
+        caractere for caractere in sem_acento
+        if not unicodedata.combining(caractere)
+    )
+
+    return re.findall(r"\w+", sem_acento.lower())
+
+
+class InvertedIndex:
+    """
+    Índice invertido em memória sobre nome e descrição dos itens.
+
+    Usado quando o banco não é PostgreSQL (ex.: SQLite nos testes), no
+    lugar da coluna tsvector. Todos os termos da busca precisam ser
+    encontrados; a relevância soma os pesos dos termos em cada item.
+    """
+    def __init__(self, itens: list[MenuItem]):
+        self.itens: dict[int, MenuItem] = {item.id: item for item in itens}
+        self.termos: dict[str, Counter] = defaultdict(Counter)
+
+        for item in itens:
+            for termo in tokenize(item.nome):
+                self.termos[termo][item.id] += PESO_NOME
+            for termo in tokenize(item.descricao):
+                self.termos[termo][item.id] += PESO_DESCRICAO
+
+    def search(self, texto: str) -> list[MenuItem]:
+        """
+        Busca os itens que contêm todos os termos do texto.
+
+        Args:
+            texto (str): Texto da busca.
+        Returns:
+            list: Itens encontrados, do mais para o menos relevante.
+        """
+        termos = tokenize(texto)
+        if not termos:
+            return []
+
+        relevancia = Counter(self.termos.get(termos[0], {}))
+        for termo in termos[1:]:
+            ocorrencias = self.termos.get(termo, {})
+            relevancia = Counter({
+                item_id: peso + ocorrencias[item_id]
+                for item_id, peso in relevancia.items()
+                if item_id in ocorrencias
+            })
+
+        return [
+            self.itens[item_id]
+            for item_id, _ in sorted(
+                relevancia.items(), key=lambda par: (-par[1], par[0])
+            )
+        ]
@@ -0,0 +1,448 @@
+# Imports do sistema
+import base64
+import hashlib
+import hmac
+import os
+import shutil
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlencode
+
+# Imports de terceiros
+from anyio import to_thread
+
+# Imports locais
+from core.config import settings
+
+# Rota da API que recebe os envios assinados dos backends sem URL própria
+ROTA_ENVIO = "/cardapio/imagens/envio"
+
+
+def sign_upload(
+        chave: str,
+        sha256: str,
+        tamanho: int,
+        expira: int,
+        segredo: str = None
+) -> str:
+    """
+    Assina os dados de um envio direto (HMAC-SHA256).
+
+    Args:
+        chave (str): Chave do objeto.
+        sha256 (str): Hash SHA-256 (hex) esperado do conteúdo.
+        tamanho (int): Tamanho esperado do conteúdo, em bytes.
+        expira (int): Instante de expiração (timestamp Unix).
+        segredo (str): Chave da assinatura (padrão: STORAGE_SECRET).
+    Returns:
+        str: Assinatura em hexadecimal.
+    """
+    mensagem = f"{chave}\n{sha256}\n{tamanho}\n{expira}".encode()
+
+    return hmac.new(
+        (segredo or settings.STORAGE_SECRET).encode(), mensagem,
+        hashlib.sha256
+    ).hexdigest()
+
+
+def verify_upload(
+        chave: str,
+        sha256: str,
+        tamanho: int,
+        expira: int,
+        assinatura: str,
+        segredo: str = None
+) -> bool:
+    """
+    Verifica a assinatura e a validade de um envio direto.
+
+    Returns:
+        bool: True se a assinatura confere e ainda não expirou.
+    """
+    if expira < time.time():
+        return False
+
+    return hmac.compare_digest(
+        sign_upload(chave, sha256, tamanho, expira, segredo), assinatura
+    )
+
+
+class Storage(ABC):
+    """
+    Armazenamento de objetos (imagens) identificados por uma chave, ex.:
+    ``images/{sha256}.png``.
+
+    Além da URL pública, cada backend define a referência gravada no
+    banco (ItemModel.url_imagem) e como obter a chave de volta a partir
+    dela, mantendo compatíveis os registros já existentes.
+    """
+    @abstractmethod
+    async def put(
+            self,
+            chave: str,
+            origem: Path,
+            content_type: str = None
+    ):
+        """
+        Armazena o arquivo local ``origem`` na chave, consumindo-o.
+        """
+
+    def staging_file(self, prefixo: str) -> tuple[int, Path]:
+        """
+        Cria o arquivo temporário que recebe o conteúdo de um objeto com
+        chave iniciada por ``prefixo`` (ex.: "images/") antes de put. Por
+        padrão, no diretório temporário do sistema.
+
+        Returns:
+            tuple: Descritor aberto para escrita e caminho do arquivo.
+        """
+        descritor, caminho = tempfile.mkstemp(prefix=".upload-")
+
+        return descritor, Path(caminho)
+
+    @abstractmethod
+    async def put_bytes(
+            self,
+            chave: str,
+            conteudo: bytes,
+            content_type: str = None
+    ):
+        """
+        Armazena o conteúdo na chave.
+        """
+
+    @abstractmethod
+    async def read(self, chave: str) -> bytes:
+        """
+        Lê o conteúdo armazenado na chave.
+        """
+
+    @abstractmethod
+    async def size(self, chave: str) -> Optional[int]:
+        """
+        Retorna o tamanho do objeto, ou None se ele não existir.
+        """
+
+    @abstractmethod
+    async def delete(self, chave: str):
+        """
+        Remove o objeto, se existir.
+        """
+
+    @abstractmethod
+    def url(self, chave: str) -> str:
+        """
+        URL pública do objeto.
+        """
+
+    def locate(self, chave: str) -> str:
+        """
+        Referência do objeto gravada no banco (por padrão, a URL pública).
+        """
+        return self.url(chave)
+
+    def key_of(self, referencia: str) -> str:
+        """
+        Chave do objeto a partir da referência ou da URL pública.
+        """
+        return referencia.removeprefix(self.url(""))
+
+    async def presigned_upload(
+            self,
+            chave: str,
+            sha256: str,
+            tamanho: int,
+            content_type: str
+    ) -> dict:
+        """
+        Gera os dados de um envio direto do conteúdo para a chave.
+
+        Por padrão o envio é feito para ROTA_ENVIO, com a assinatura na
+        query string; backends com URLs assinadas próprias (S3) enviam
+        direto para o serviço de armazenamento.
+
+        Args:
+            chave (str): Chave do objeto.
+            sha256 (str): Hash SHA-256 (hex) do conteúdo.
+            tamanho (int): Tamanho do conteúdo, em bytes.
+            content_type (str): Tipo do conteúdo.
+        Returns:
+            dict: Método, URL e cabeçalhos do envio.
+        """
+        expira = int(time.time()) + settings.PRESIGNED_EXPIRATION
+        parametros = urlencode({
+            "sha256": sha256,
+            "tamanho": tamanho,
+            "expira": expira,
+            "assinatura": sign_upload(chave, sha256, tamanho, expira),
+        })
+
+        return {
+            "metodo": "PUT",
+            "url": f"{ROTA_ENVIO}/{chave}?{parametros}",
+            "cabecalhos": {"Content-Type": content_type},
+            "expira": expira,
+        }
+
+
+class LocalStorage(Storage):
+    """
+    Armazenamento no sistema de arquivos local, servido em /static.
+
+    Grava no banco o caminho absoluto do arquivo, como antes.
+    """
+    def __init__(self, raiz: Path, url_base: str = "/static/"):
+        self.raiz: Path = Path(raiz)
+        self.url_base: str = url_base
+
+    def _caminho(self, chave: str) -> Path:
+        caminho = (self.raiz / chave).resolve()
+
+        # Impede chaves fora da raiz (ex.: "../")
+        if not caminho.is_relative_to(self.raiz.resolve()):
+            raise ValueError(f"Chave inválida: {chave}")
+
+        return caminho
+
+    def _temporario(self, diretorio: Path) -> tuple[int, Path]:
+        diretorio.mkdir(parents=True, exist_ok=True)
+        descritor, caminho = tempfile.mkstemp(prefix=".upload-", dir=diretorio)
+
+        return descritor, Path(caminho)
+
+    def staging_file(self, prefixo):
+        # No diretório do destino, para que put seja um os.replace atômico
+        return self._temporario(self._caminho(prefixo))
+
+    def _substituir(self, temporario: Path, destino: Path):
+        # Leitores veem o arquivo anterior ou o novo, nunca um parcial
+        try:
+            os.chmod(temporario, 0o644)
+            os.replace(temporario, destino)
+        except BaseException:
+            temporario.unlink(missing_ok=True)
+            raise
+
+    def _mover(self, origem: Path, destino: Path):
+        origem = Path(origem)
+
+        if origem.parent.resolve() != destino.parent:
+            # Origem em outro diretório, possivelmente em outro sistema de
+            # arquivos: copia antes para um temporário ao lado do destino
+            descritor, temporario = self._temporario(destino.parent)
+            try:
+                with os.fdopen(descritor, "wb") as copia, \
+                        origem.open("rb") as leitura:
+                    shutil.copyfileobj(leitura, copia)
+            except BaseException:
+                temporario.unlink(missing_ok=True)
+                raise
+
+            origem.unlink()
+            origem = temporario
+
+        self._substituir(origem, destino)
+
+    def _gravar(self, conteudo: bytes, destino: Path):
+        descritor, temporario = self._temporario(destino.parent)
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(conteudo)
+        except BaseException:
+            temporario.unlink(missing_ok=True)
+            raise
+
+        self._substituir(temporario, destino)
+
+    async def put(self, chave, origem, content_type=None):
+        await to_thread.run_sync(self._mover, origem, self._caminho(chave))
+
+    async def put_bytes(self, chave, conteudo, content_type=None):
+        await to_thread.run_sync(self._gravar, conteudo, self._caminho(chave))
+
+    async def read(self, chave):
+        return await to_thread.run_sync(self._caminho(chave).read_bytes)
+
+    async def size(self, chave):
+        try:
+            estatisticas = await to_thread.run_sync(self._caminho(chave).stat)
+        except FileNotFoundError:
+            return None
+
+        return estatisticas.st_size
+
+    async def delete(self, chave):
+        await to_thread.run_sync(self._caminho(chave).unlink, True)
+
+    def url(self, chave):
+        return f"{self.url_base}{chave}"
+
+    def locate(self, chave):
+        return str(self._caminho(chave))
+
+    def key_of(self, referencia):
+        if referencia.startswith(self.url_base):
+            return referencia.removeprefix(self.url_base)
+
+        return Path(referencia).resolve().relative_to(
+            self.raiz.resolve()
+        ).as_posix()
+
+
+class MemoryStorage(Storage):
+    """
+    Armazenamento em memória, para testes e desenvolvimento.
+    """
+    def __init__(self, url_base: str = "memory://"):
+        self.url_base: str = url_base
+        self.objetos: dict[str, bytes] = {}
+
+    async def put(self, chave, origem, content_type=None):
+        self.objetos[chave] = await to_thread.run_sync(
+            Path(origem).read_bytes
+        )
+        Path(origem).unlink(missing_ok=True)
+
+    async def put_bytes(self, chave, conteudo, content_type=None):
+        self.objetos[chave] = bytes(conteudo)
+
+    async def read(self, chave):
+        return self.objetos[chave]
+
+    async def size(self, chave):
+        conteudo = self.objetos.get(chave)
+
+        return None if conteudo is None else len(conteudo)
+
+    async def delete(self, chave):
+        self.objetos.pop(chave, None)
+
+    def url(self, chave):
+        return f"{self.url_base}{chave}"
+
+
+class S3Storage(Storage):
+    """
+    Armazenamento em um bucket compatível com S3 (AWS S3, MinIO etc.).
+
+    Os envios diretos usam URLs pré-assinadas do próprio serviço, que
+    exigem o checksum SHA-256 informado: o conteúdo enviado pelo cliente
+    precisa corresponder à chave.
+    """
+    def __init__(
+            self,
+            bucket: str,
+            endpoint_url: str = None,
+            regiao: str = None,
+            chave_acesso: str = None,
+            chave_secreta: str = None,
+            url_publica: str = None,
+            cache_control: str = None
+    ):
+        # Dependência opcional, necessária apenas para este backend
+        import boto3
+        from botocore.config import Config
+
+        self.bucket: str = bucket
+        self.cache_control: str = cache_control
+        self.cliente = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=regiao,
+            aws_access_key_id=chave_acesso,
+            aws_secret_access_key=chave_secreta,
+            # SigV4 assina os cabeçalhos (checksum, tamanho) das URLs
+            config=Config(signature_version="s3v4"),
+        )
+        self.url_base: str = (
+            url_publica or
+            f"{endpoint_url or 'https://s3.amazonaws.com'}/{bucket}"
+        ).rstrip("/") + "/"
+
+    def _extras(self, content_type: str = None) -> dict:
+        extras = {}
+        if content_type:
+            extras["ContentType"] = content_type
+        if self.cache_control:
+            extras["CacheControl"] = self.cache_control
+
+        return extras
+
+    async def put(self, chave, origem, content_type=None):
+        await to_thread.run_sync(
+            lambda: self.cliente.upload_file(
+                str(origem), self.bucket, chave,
+                ExtraArgs=self._extras(content_type)
+            )
+        )
+        Path(origem).unlink(missing_ok=True)
+
+    async def put_bytes(self, chave, conteudo, content_type=None):
+        await to_thread.run_sync(
+            lambda: self.cliente.put_object(
+                Bucket=self.bucket, Key=chave, Body=conteudo,
+                **self._extras(content_type)
+            )
+        )
+
+    async def read(self, chave):
+        resposta = await to_thread.run_sync(
+            lambda: self.cliente.get_object(Bucket=self.bucket, Key=chave)
+        )
+
+        return await to_thread.run_sync(resposta["Body"].read)
+
+    async def size(self, chave):
+        try:
+            resposta = await to_thread.run_sync(
+                lambda: self.cliente.head_object(
+                    Bucket=self.bucket, Key=chave
+                )
+            )
+        except self.cliente.exceptions.ClientError as erro:
+            if erro.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+
+        return resposta["ContentLength"]
+
+    async def delete(self, chave):
+        await to_thread.run_sync(
+            lambda: self.cliente.delete_object(Bucket=self.bucket, Key=chave)
+        )
+
+    def url(self, chave):
+        return f"{self.url_base}{chave}"
+
+    async def presigned_upload(self, chave, sha256, tamanho, content_type):
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        parametros = {
+            "Bucket": self.bucket,
+            "Key": chave,
+            "ContentLength": tamanho,
+            "ChecksumSHA256": checksum,
+            **self._extras(content_type),
+        }
+        url = await to_thread.run_sync(
+            lambda: self.cliente.generate_presigned_url(
+                "put_object",
+                Params=parametros,
+                ExpiresIn=settings.PRESIGNED_EXPIRATION,
+            )
+        )
+
+        cabecalhos = {"x-amz-checksum-sha256": checksum}
+        if content_type:
+            cabecalhos["Content-Type"] = content_type
+        if self.cache_control:
+            cabecalhos["Cache-Control"] = self.cache_control
+
+        return {
+            "metodo": "PUT",
+            "url": url,
+            "cabecalhos": cabecalhos,
+            "expira": int(time.time()) + settings.PRESIGNED_EXPIRATION,
+        }
@@ -0,0 +1,217 @@
+# Imports do sistema
+import io
+import os
+import tempfile
+
+# Banco, armazenamento e orçamento de consultas dos testes, definidos antes
+# de importar a aplicação (core.config lê o ambiente na importação). Com
+# TEST_DATABASE_URL os testes usam esse banco (PostgreSQL), que é apagado
+# a cada teste
+PASTA_TESTES = tempfile.mkdtemp(prefix="cardapio-testes-")
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite:///{PASTA_TESTES}/testes.db"
+)
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ["STORAGE_SECRET"] = "segredo-dos-testes"
+os.environ["DEBUG"] = "true"
+os.environ["QUERY_BUDGET_STRICT"] = "true"
+os.environ["METRICS_ENABLED"] = "false"
+for variavel in ("POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB",
+                 "DATABASE_HOST"):
+    os.environ.setdefault(variavel, "testes")
+os.environ.setdefault("DATABASE_PORT", "5432")
+
+# Imports de terceiros
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from PIL import Image  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+# Imports locais
+import src.menu.models  # noqa: E402, F401
+from core.database import Base, SessionLocal, engine  # noqa: E402
+from main import app  # noqa: E402
+from src.menu.cache import menu_cache  # noqa: E402
+from src.menu.crud import rebuild_sales  # noqa: E402
+from src.menu.images import armazenamento  # noqa: E402
+from src.menu.models import VendaDiariaCategoriaModel  # noqa: E402
+from src.menu.models import VendaDiariaItemModel  # noqa: E402
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Pula os testes marcados com postgresql fora do PostgreSQL.
+    """
+    if engine.dialect.name == "postgresql":
+        return
+
+    pular = pytest.mark.skip(reason="requer TEST_DATABASE_URL (PostgreSQL)")
+    for item in items:
+        if "postgresql" in item.keywords:
+            item.add_marker(pular)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def cliente():
+    """
+    Cliente HTTP da aplicação sobre um banco SQLite e um armazenamento em
+    memória vazios.
+
+    Com DEBUG e QUERY_BUDGET_STRICT, uma rota que exceder o seu orçamento
+    de comandos SQL (@query_budget) levanta QueryBudgetExceeded e falha o
+    teste.
+    """
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.drop_all)
+        await conexao.run_sync(Base.metadata.create_all)
+
+    menu_cache.invalidate()
+    armazenamento.objetos.clear()
+
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+            transport=transporte, base_url="http://testes"
+    ) as cliente:
+        yield cliente
+
+    # As conexões do pool pertencem ao event loop deste teste
+    await engine.dispose()
+
+
+@pytest.fixture
+def png():
+    """
+    Gera o conteúdo de uma imagem PNG com a cor informada.
+    """
+    def gerar(cor: str = "red", tamanho: tuple = (64, 48)) -> bytes:
+        saida = io.BytesIO()
+        Image.new("RGB", tamanho, cor).save(saida, "PNG")
+        return saida.getvalue()
+
+    return gerar
+
+
+@pytest.fixture
+def cadastrar(cliente, png):
+    """
+    Cadastra um item com uma imagem PNG e retorna a resposta.
+    """
+    async def cadastrar_item(
+            nome: str,
+            categoria: str,
+            preco: float = 10.0,
+            descricao: str = "Descrição",
+            cor: str = "red"
+    ) -> httpx.Response:
+        resposta = await cliente.post(
+            "/cardapio/cadastrar_item",
+            params={
+                "nome": nome,
+                "descricao": descricao,
+                "preco": preco,
+                "categoria": categoria,
+            },
+            files={"arquivo": (f"{cor}.png", png(cor), "image/png")},
+        )
+        assert resposta.status_code == 200, resposta.text
+        return resposta
+
+    return cadastrar_item
+
+
+@pytest.fixture
+async def itens(cadastrar):
+    """
+    Cadastra três itens: 1 (Suco, 8,00) e 2 (Refrigerante, 6,00) em
+    Bebidas e 3 (Pudim, 12,00) em Sobremesas.
+    """
+    await cadastrar("Suco", "Bebidas", preco=8, cor="orange")
+    await cadastrar("Refrigerante", "Bebidas", preco=6, cor="black")
+    await cadastrar("Pudim", "Sobremesas", preco=12, cor="yellow")
+
+
+@pytest.fixture
+def fazer_pedido(cliente):
+    """
+    Faz um pedido com os itens informados e retorna a resposta.
+    """
+    async def pedir(
+            itens: list[int],
+            status: str = "PRE-PEDIDO",
+            chave: str = None
+    ) -> httpx.Response:
+        return await cliente.post(
+            "/cardapio/fazer_pedido",
+            params={"status": status},
+            json={"itens": itens},
+            headers={"Idempotency-Key": chave} if chave else {},
+        )
+
+    return pedir
+
+
+@pytest.fixture
+def plano(cliente):
+    """
+    Plano de execução (EXPLAIN) de uma consulta no PostgreSQL.
+
+    As varreduras sequenciais são desativadas: nas tabelas pequenas dos
+    testes elas custam menos que qualquer índice.
+    """
+    async def explicar(consulta) -> str:
+        async with engine.begin() as conexao:
+            await conexao.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            comando = consulta.compile(
+                dialect=conexao.dialect,
+                compile_kwargs={"literal_binds": True}
+            )
+            linhas = await conexao.exec_driver_sql(f"EXPLAIN {comando}")
+            return "\n".join(linha for linha, in linhas)
+
+    return explicar
+
+
+async def resumos() -> tuple[set, set]:
+    """
+    Registros dos resumos de vendas, sem os zerados.
+    """
+    async with SessionLocal() as db:
+        por_item = await db.execute(
+            select(
+                VendaDiariaItemModel.dia,
+                VendaDiariaItemModel.item_id,
+                VendaDiariaItemModel.quantidade,
+                VendaDiariaItemModel.receita_centavos
+            ).where(VendaDiariaItemModel.quantidade != 0)
+        )
+        por_categoria = await db.execute(
+            select(
+                VendaDiariaCategoriaModel.dia,
+                VendaDiariaCategoriaModel.categoria,
+                VendaDiariaCategoriaModel.quantidade,
+                VendaDiariaCategoriaModel.receita_centavos
+            ).where(VendaDiariaCategoriaModel.quantidade != 0)
+        )
+        return set(por_item), set(por_categoria)
+
+
+@pytest.fixture
+def conferir_resumos(cliente):
+    """
+    Confere que os resumos de vendas mantidos pelas rotas são iguais aos
+    recalculados a partir dos pedidos (rebuild_sales).
+    """
+    async def conferir():
+        incrementais = await resumos()
+
+        async with SessionLocal() as db:
+            await rebuild_sales(db)
+
+        assert await resumos() == incrementais
+
+    return conferir
@@ -0,0 +1,184 @@
+# Imports do sistema
+import csv
+import io
+import json
+import zipfile
+
+# Imports de terceiros
+import asyncpg
+import pytest
+
+# Imports locais
+from core.config import settings
+from src.menu.images import VARIANTES
+
+pytestmark = pytest.mark.anyio
+
+CABECALHO = "nome,descricao,preco,categoria,imagem"
+LINHAS = [
+    {"nome": "Suco", "descricao": "Natural", "preco": 8,
+     "categoria": "Bebidas", "imagem": "suco.png"},
+    {"nome": "Suco grande", "descricao": "Natural", "preco": 10,
+     "categoria": "Bebidas", "imagem": "suco.png"},
+    {"nome": "Pudim", "descricao": "Doce", "preco": 12,
+     "categoria": "Sobremesas", "imagem": "pudim.png"},
+]
+
+
+@pytest.fixture
+def pacote(png) -> bytes:
+    """
+    Pacote .zip com as imagens suco.png e pudim.png.
+    """
+    saida = io.BytesIO()
+    with zipfile.ZipFile(saida, "w") as arquivo_zip:
+        arquivo_zip.writestr("suco.png", png("orange"))
+        arquivo_zip.writestr("pudim.png", png("yellow"))
+
+    return saida.getvalue()
+
+
+def ndjson(linhas: list[dict]) -> bytes:
+    return "\n".join(json.dumps(linha) for linha in linhas).encode()
+
+
+async def importar(cliente, arquivo, imagens: bytes = None, **parametros):
+    arquivos = {"arquivo": arquivo}
+    if imagens is not None:
+        arquivos["imagens"] = ("imagens.zip", imagens)
+
+    return await cliente.post(
+        "/cardapio/importar_itens", files=arquivos, params=parametros
+    )
+
+
+async def exportar(cliente, formato: str = "ndjson") -> str:
+    resposta = await cliente.get(
+        "/cardapio/exportar_itens", params={"formato": formato}
+    )
+    assert resposta.status_code == 200
+    return resposta.text
+
+
+async def test_importar_e_exportar_itens(cliente, pacote):
+    resposta = await importar(
+        cliente, ("itens.ndjson", ndjson(LINHAS)), pacote
+    )
+    assert resposta.status_code == 200, resposta.text
+    assert resposta.json()["data"] == {
+        "importados": 3, "linhas_com_erro": 0, "erros": []
+    }
+
+    cardapio = (await cliente.get("/cardapio/obter_cardapio")).json()["data"]
+    assert [item["nome"] for item in cardapio] == [
+        "Suco", "Suco grande", "Pudim"
+    ]
+    # A mesma imagem em duas linhas é gravada uma única vez, e as
+    # variantes são geradas após a resposta
+    assert cardapio[0]["url_imagem"] == cardapio[1]["url_imagem"]
+    assert all(set(item["imagens"]) == set(VARIANTES) for item in cardapio)
+
+    categorias = (
+        await cliente.get(
+            "/cardapio/obter_categorias", params={"detalhes": True}
+        )
+    ).json()["data"]
+    assert [
+        (categoria["nome"], categoria["quantidade_itens"])
+        for categoria in categorias
+    ] == [("BEBIDAS", 2), ("SOBREMESAS", 1)]
+
+    texto = await exportar(cliente, "csv")
+    assert texto.splitlines()[0] == CABECALHO
+    assert len(texto.splitlines()) == 4
+
+
+async def test_copiar_cardapio(cliente, pacote):
+    await importar(cliente, ("itens.ndjson", ndjson(LINHAS)), pacote)
+    exportado = await exportar(cliente, "csv")
+
+    # As imagens exportadas são chaves já armazenadas: dispensam o pacote
+    resposta = await importar(cliente, ("itens.csv", exportado.encode()))
+    assert resposta.status_code == 200, resposta.text
+    assert resposta.json()["data"]["importados"] == 3
+
+    linhas = list(csv.DictReader(io.StringIO(await exportar(cliente, "csv"))))
+    assert len(linhas) == 6
+    assert linhas[3:] == linhas[:3]
+
+    # Os novos itens reaproveitam as variantes das imagens
+    item = (await cliente.get("/cardapio/obter_item/4")).json()["data"]
+    assert set(item["imagens"]) == set(VARIANTES)
+
+
+async def test_importar_itens_com_erros(cliente, pacote):
+    linhas = [
+        *LINHAS,
+        {**LINHAS[0], "preco": "abc"},
+        {**LINHAS[0], "imagem": "inexistente.png"},
+    ]
+    arquivo = ("itens.ndjson", ndjson(linhas) + b"\n{nao e json")
+
+    resposta = await importar(cliente, arquivo, pacote)
+    assert resposta.status_code == 422
+    relatorio = resposta.json()["data"]
+    assert relatorio["linhas_com_erro"] == 3
+    assert [erro["linha"] for erro in relatorio["erros"]] == [4, 5, 6]
+
+    # Nada foi importado
+    resposta = await cliente.get("/cardapio/obter_cardapio")
+    assert resposta.status_code == 404
+
+    # Com parcial, as linhas válidas são importadas
+    resposta = await importar(cliente, arquivo, pacote, parcial=True)
+    assert resposta.status_code == 200
+    assert resposta.json()["data"]["importados"] == 3
+
+
+async def test_arquivos_invalidos(cliente, monkeypatch):
+    resposta = await importar(
+        cliente, ("itens.csv", f"{CABECALHO}\n".encode()), b"nao e um zip"
+    )
+    assert resposta.status_code == 400
+
+    resposta = await importar(cliente, ("itens.csv", b"\xff\xfe\x00"))
+    assert resposta.status_code == 422
+    assert resposta.json()["data"]["erros"][0]["mensagem"] == (
+        "O arquivo deve estar em UTF-8."
+    )
+
+    monkeypatch.setattr(settings, "IMPORT_MAX_ROWS", 2)
+    resposta = await importar(cliente, ("itens.ndjson", ndjson(LINHAS)))
+    assert resposta.status_code == 422
+    assert resposta.json()["data"]["erros"][-1]["mensagem"] == (
+        "O arquivo excede 2 linhas."
+    )
+
+
+@pytest.mark.postgresql
+async def test_importar_com_copy(cliente, pacote, monkeypatch):
+    copias = []
+    copy_records_to_table = asyncpg.Connection.copy_records_to_table
+
+    async def copiar(conexao, tabela, **argumentos):
+        copias.append((tabela, len(argumentos["records"])))
+        return await copy_records_to_table(conexao, tabela, **argumentos)
+
+    monkeypatch.setattr(asyncpg.Connection, "copy_records_to_table", copiar)
+
+    await importar(cliente, ("itens.ndjson", ndjson(LINHAS)), pacote)
+    resposta = await importar(
+        cliente, ("itens.csv", (await exportar(cliente, "csv")).encode())
+    )
+    assert resposta.status_code == 200
+
+    assert copias == [("itens", 3), ("itens", 3)]
+
+    # As variantes reaproveitadas são gravadas como JSON pelo COPY, e as
+    # colunas geradas são calculadas
+    item = (await cliente.get("/cardapio/obter_item/4")).json()["data"]
+    assert set(item["imagens"]) == set(VARIANTES)
+    resposta = await cliente.get(
+        "/cardapio/obter_cardapio", params={"categoria": "bebidas"}
+    )
+    assert len(resposta.json()["data"]) == 4
@@ -0,0 +1,139 @@
+# Imports do sistema
+import asyncio
+
+# Imports de terceiros
+import pytest
+from sqlalchemy import text
+
+# Imports locais
+from core.database import SessionLocal
+from src.menu.crud import refresh_category_summary
+
+pytestmark = pytest.mark.anyio
+
+
+async def resumo(cliente) -> dict:
+    resposta = await cliente.get(
+        "/cardapio/obter_categorias", params={"detalhes": True}
+    )
+    if resposta.status_code == 404:
+        return {}
+
+    assert resposta.status_code == 200
+    return {
+        categoria["nome"]: (
+            categoria["quantidade_itens"],
+            categoria["preco_minimo"],
+            categoria["preco_maximo"],
+        )
+        for categoria in resposta.json()["data"]
+    }
+
+
+async def test_obter_categorias(cliente, cadastrar):
+    resposta = await cliente.get("/cardapio/obter_categorias")
+    assert resposta.status_code == 404
+
+    await cadastrar("Suco", "Bebidas", preco=8, cor="orange")
+    await cadastrar("Refrigerante", " bebidas", preco=6, cor="black")
+    await cadastrar("Pudim", "Sobremesas", preco=12, cor="yellow")
+
+    resposta = await cliente.get(
+        "/cardapio/obter_categorias", params={"detalhes": True}
+    )
+    assert resposta.status_code == 200
+    assert resposta.json()["data"] == [
+        {"nome": "BEBIDAS", "quantidade_itens": 2, "preco_minimo": 6.0,
+         "preco_maximo": 8.0},
+        {"nome": "SOBREMESAS", "quantidade_itens": 1, "preco_minimo": 12.0,
+         "preco_maximo": 12.0},
+    ]
+
+    resposta = await cliente.get("/cardapio/obter_categorias")
+    assert resposta.json()["data"] == ["BEBIDAS", "SOBREMESAS"]
+
+
+async def test_resumo_acompanha_as_escritas(cliente, cadastrar):
+    await cadastrar("Suco", "Bebidas", preco=8, cor="orange")
+    await cadastrar("Refrigerante", "Bebidas", preco=6, cor="black")
+    await cadastrar("Pudim", "Sobremesas", preco=12, cor="yellow")
+
+    # Novo preço máximo
+    await cliente.put("/cardapio/atualizar_item/1", params={"preco": 9.5})
+    assert await resumo(cliente) == {
+        "BEBIDAS": (2, 6.0, 9.5),
+        "SOBREMESAS": (1, 12.0, 12.0),
+    }
+
+    # Mudança de categoria: a antiga e a nova são recalculadas
+    await cliente.put(
+        "/cardapio/atualizar_item/2", params={"categoria": "sobremesas"}
+    )
+    assert await resumo(cliente) == {
+        "BEBIDAS": (1, 9.5, 9.5),
+        "SOBREMESAS": (2, 6.0, 12.0),
+    }
+
+    # A categoria que fica sem itens sai do resumo
+    await cliente.delete("/cardapio/deletar_item/1")
+    assert await resumo(cliente) == {"SOBREMESAS": (2, 6.0, 12.0)}
+
+    await cliente.put(
+        "/cardapio/atualizar_item/3", params={"categoria": "Doces"}
+    )
+    assert await resumo(cliente) == {
+        "DOCES": (1, 12.0, 12.0),
+        "SOBREMESAS": (1, 6.0, 6.0),
+    }
+
+    await cliente.delete("/cardapio/deletar_item/2")
+    await cliente.delete("/cardapio/deletar_item/3")
+    assert await resumo(cliente) == {}
+
+
+async def test_cadastros_simultaneos(cliente, cadastrar):
+    # Cadastros concorrentes na mesma categoria não perdem atualizações
+    await asyncio.gather(*(
+        cadastrar(f"Suco {preco}", "Bebidas", preco=preco)
+        for preco in range(1, 9)
+    ))
+
+    assert await resumo(cliente) == {"BEBIDAS": (8, 1.0, 8.0)}
+
+
+@pytest.mark.postgresql
+async def test_bloqueio_por_categoria(cliente, cadastrar):
+    await cadastrar("Suco", "Bebidas")
+
+    async with SessionLocal() as db:
+        await refresh_category_summary(db, ["Bebidas", " sobremesas"])
+
+        # Um bloqueio consultivo por categoria, mantido até o fim da
+        # transação
+        bloqueios = await db.scalar(text(
+            "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' "
+            "AND pid = pg_backend_pid()"
+        ))
+        assert bloqueios == 2
+
+        await db.commit()
+
+        bloqueios = await db.scalar(text(
+            "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' "
+            "AND pid = pg_backend_pid()"
+        ))
+        assert bloqueios == 0
+
+    # Uma segunda transação na mesma categoria espera a primeira
+    async with SessionLocal() as primeira, SessionLocal() as segunda:
+        await refresh_category_summary(primeira, ["Bebidas"])
+
+        espera = asyncio.create_task(
+            refresh_category_summary(segunda, ["BEBIDAS"])
+        )
+        await asyncio.sleep(0.2)
+        assert not espera.done()
+
+        await primeira.commit()
+        await asyncio.wait_for(espera, timeout=5)
+        await segunda.commit()
@@ -0,0 +1,74 @@
+# Imports do sistema
+import re
+
+# Imports de terceiros
+import pytest
+from sqlalchemy import select
+
+# Imports locais
+from src.menu.cache import menu_cache
+from src.menu.models import ItemModel
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["cache", "banco"])
+async def cardapio(request, cliente, cadastrar, monkeypatch):
+    """
+    Cardápio com as categorias Bebida, Bebidas quentes e Sobremesas,
+    filtrado pelo cache em memória ou, com o cache desativado, no banco.
+    """
+    await cadastrar("Suco", "Bebida", cor="orange")
+    await cadastrar("Café", "Bebidas quentes", cor="brown")
+    await cadastrar("Chá", " bebidas QUENTES", cor="green")
+    await cadastrar("Pudim", "Sobremesas", cor="yellow")
+
+    if request.param == "banco":
+        monkeypatch.setattr(menu_cache, "ttl", 0)
+
+
+async def filtrar(cliente, categoria: str):
+    resposta = await cliente.get(
+        "/cardapio/obter_cardapio", params={"categoria": categoria}
+    )
+    if resposta.status_code == 404:
+        return None
+
+    assert resposta.status_code == 200
+    # Com ou sem cache, uma única consulta
+    assert int(resposta.headers["x-query-count"]) <= 1
+    return [item["nome"] for item in resposta.json()["data"]]
+
+
+async def test_categoria_exata_e_contida(cliente, cardapio):
+    # A categoria exata não esconde as que contêm o texto
+    assert await filtrar(cliente, "bebida") == ["Suco", "Café", "Chá"]
+    assert await filtrar(cliente, " BEBIDA ") == ["Suco", "Café", "Chá"]
+
+
+async def test_categoria_aproximada(cliente, cardapio):
+    assert await filtrar(cliente, "quente") == ["Café", "Chá"]
+    assert await filtrar(cliente, "bebidas quentes") == ["Café", "Chá"]
+    assert await filtrar(cliente, "sobre") == ["Pudim"]
+
+
+async def test_categoria_inexistente(cliente, cardapio):
+    assert await filtrar(cliente, "lanches") is None
+    # Curingas do LIKE são tratados como texto
+    assert await filtrar(cliente, "%") is None
+    assert await filtrar(cliente, "beb_da") is None
+
+
+@pytest.mark.postgresql
+async def test_filtros_usam_os_indices(cadastrar, plano):
+    await cadastrar("Suco", "Bebida", cor="orange")
+    categoria = ItemModel.categoria_normalizada
+
+    # A mesma condição de get_items_by_category
+    aproximada = await plano(
+        select(ItemModel).where(categoria.contains("bebida", autoescape=True))
+    )
+    assert "ix_itens_categoria_normalizada_trgm" in aproximada
+
+    exata = await plano(select(ItemModel).where(categoria == "bebida"))
+    assert re.search(r"ix_itens_categoria_normalizada\b", exata)
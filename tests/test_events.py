@@ -0,0 +1,168 @@
+# Imports do sistema
+import asyncio
+import json
+
+# Imports de terceiros
+import pytest
+
+# Imports locais
+from src.menu.events import (FECHAMENTO_ASSINATURA, OrderEventBroker,
+                             eventos_pedidos, forward_order_events,
+                             order_event_stream)
+from src.menu.schemas import EventoPedido, TipoEventoPedido
+
+pytestmark = pytest.mark.anyio
+
+
+def evento(pedido_id: int, tipo=TipoEventoPedido.CRIADO) -> str:
+    return EventoPedido(tipo=tipo, id=pedido_id).model_dump_json()
+
+
+async def proximo(fila: asyncio.Queue):
+    """
+    Próximo item da fila, sem esperar indefinidamente.
+    """
+    return await asyncio.wait_for(fila.get(), 5)
+
+
+async def test_assinantes_por_pedido():
+    distribuidor = OrderEventBroker(limite_fila=10)
+
+    async with distribuidor.subscribe() as cozinha, \
+            distribuidor.subscribe(pedido_id=2) as cliente:
+        distribuidor.deliver(evento(1))
+        distribuidor.deliver(evento(2))
+
+        assert [cozinha.get_nowait()[0].id for _ in range(2)] == [1, 2]
+        assert cliente.get_nowait()[0].id == 2
+        assert cliente.empty()
+
+    assert not distribuidor.assinantes
+
+
+async def test_assinante_lento_encerrado():
+    distribuidor = OrderEventBroker(limite_fila=2)
+
+    async with distribuidor.subscribe() as fila:
+        for pedido_id in range(3):
+            distribuidor.deliver(evento(pedido_id))
+
+        # Os eventos pendentes são descartados e a assinatura é encerrada
+        assert fila.get_nowait() is None
+        assert not distribuidor.assinantes
+
+
+async def test_eventos_apos_o_commit(cliente, itens, fazer_pedido):
+    async with eventos_pedidos.subscribe() as fila:
+        await fazer_pedido([1])
+        await cliente.put(
+            "/cardapio/atualizar_status_pedido/1",
+            params={"status": "PENDENTE"}
+        )
+        # Pedido inválido: a transação é desfeita e nada é publicado
+        await fazer_pedido([99])
+        await cliente.put("/cardapio/atualizar_pedido/1", json={"itens": []})
+
+        eventos = [(await proximo(fila))[0] for _ in range(3)]
+        assert [(e.tipo, e.id) for e in eventos] == [
+            (TipoEventoPedido.CRIADO, 1),
+            (TipoEventoPedido.STATUS_ALTERADO, 1),
+            (TipoEventoPedido.REMOVIDO, 1),
+        ]
+        assert eventos[1].status == "PENDENTE"
+        assert fila.empty()
+
+
+async def test_fluxo_sse():
+    fluxo = order_event_stream(pedido_id=1)
+    try:
+        assert await fluxo.__anext__() == "retry: 3000\n\n"
+
+        payload = evento(1, TipoEventoPedido.ATUALIZADO)
+        eventos_pedidos.deliver(evento(2))
+        eventos_pedidos.deliver(payload)
+        assert await fluxo.__anext__() == (
+            f"event: atualizado\ndata: {payload}\n\n"
+        )
+
+        # Assinatura encerrada pelo servidor: o fluxo termina
+        eventos_pedidos.close_all()
+        with pytest.raises(StopAsyncIteration):
+            await fluxo.__anext__()
+    finally:
+        await fluxo.aclose()
+
+
+class WebSocketFalso:
+    """
+    WebSocket que registra as mensagens enviadas e o fechamento.
+    """
+    def __init__(self):
+        self.enviadas: list[str] = []
+        self.codigo_fechamento: int = None
+        self.desconexao = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, texto: str):
+        self.enviadas.append(texto)
+
+    async def receive(self):
+        await self.desconexao.wait()
+        return {"type": "websocket.disconnect"}
+
+    async def close(self, code: int):
+        self.codigo_fechamento = code
+
+
+async def aguardar(condicao):
+    while not condicao():
+        await asyncio.sleep(0)
+
+
+async def test_websocket():
+    websocket = WebSocketFalso()
+    envio = asyncio.ensure_future(forward_order_events(websocket))
+    await asyncio.wait_for(aguardar(lambda: eventos_pedidos.assinantes), 5)
+
+    eventos_pedidos.deliver(evento(1))
+    await asyncio.wait_for(aguardar(lambda: websocket.enviadas), 5)
+    eventos_pedidos.close_all()
+    await asyncio.wait_for(envio, 5)
+
+    assert [json.loads(texto)["id"] for texto in websocket.enviadas] == [1]
+    assert websocket.codigo_fechamento == FECHAMENTO_ASSINATURA
+
+    # Desconexão do cliente: a assinatura é removida sem fechamento
+    websocket = WebSocketFalso()
+    envio = asyncio.ensure_future(forward_order_events(websocket))
+    await asyncio.wait_for(aguardar(lambda: eventos_pedidos.assinantes), 5)
+
+    websocket.desconexao.set()
+    await asyncio.wait_for(envio, 5)
+    assert websocket.codigo_fechamento is None
+    assert not eventos_pedidos.assinantes
+
+
+@pytest.mark.postgresql
+async def test_notify_entre_workers(cliente, itens, fazer_pedido):
+    # No PostgreSQL o evento chega pelo LISTEN, como em outro worker
+    try:
+        async with eventos_pedidos.subscribe() as fila:
+            assert eventos_pedidos._conexao is not None
+
+            await fazer_pedido([99])
+            await fazer_pedido([1, 3])
+
+            evento_recebido, _ = await proximo(fila)
+            assert (evento_recebido.tipo, evento_recebido.id) == (
+                TipoEventoPedido.CRIADO, 1
+            )
+            assert evento_recebido.preco_total == 20.0
+            assert fila.empty()
+    finally:
+        # A conexão do LISTEN pertence ao event loop deste teste
+        if eventos_pedidos._conexao is not None:
+            await eventos_pedidos._conexao.close()
+            eventos_pedidos._conexao = None
@@ -0,0 +1,79 @@
+# Imports do sistema
+import csv
+import io
+import json
+
+# Imports de terceiros
+import pytest
+
+# Imports locais
+from src.menu import crud
+
+pytestmark = pytest.mark.anyio
+
+
+async def exportar(cliente, formato: str = "ndjson") -> str:
+    resposta = await cliente.get(
+        "/cardapio/exportar_pedidos", params={"formato": formato}
+    )
+    assert resposta.status_code == 200
+    assert resposta.headers["content-disposition"] == (
+        f'attachment; filename="pedidos.{formato}"'
+    )
+    return resposta.text
+
+
+async def test_exportar_pedidos(cliente, itens, fazer_pedido):
+    await fazer_pedido([1, 3, 1])
+    await fazer_pedido([2])
+
+    pedidos = [
+        json.loads(linha) for linha in (await exportar(cliente)).splitlines()
+    ]
+    assert pedidos == [
+        {"id": 1, "status": "PRE-PEDIDO", "preco_total": 28.0, "itens": [
+            {"item_id": 1, "nome": "Suco", "quantidade": 2,
+             "preco_unitario": 8.0},
+            {"item_id": 3, "nome": "Pudim", "quantidade": 1,
+             "preco_unitario": 12.0},
+        ]},
+        {"id": 2, "status": "PRE-PEDIDO", "preco_total": 6.0, "itens": [
+            {"item_id": 2, "nome": "Refrigerante", "quantidade": 1,
+             "preco_unitario": 6.0},
+        ]},
+    ]
+
+    linhas = list(csv.DictReader(io.StringIO(await exportar(cliente, "csv"))))
+    assert [
+        (linha["pedido_id"], linha["item_nome"], linha["quantidade"])
+        for linha in linhas
+    ] == [("1", "Suco", "2"), ("1", "Pudim", "1"), ("2", "Refrigerante", "1")]
+
+
+async def test_exportar_sem_pedidos(cliente):
+    assert await exportar(cliente) == ""
+    assert (await exportar(cliente, "csv")).splitlines() == [
+        "pedido_id,status,preco_total,item_id,item_nome,quantidade,"
+        "preco_unitario"
+    ]
+
+
+async def test_pedido_dividido_entre_lotes(
+        cliente, itens, fazer_pedido, monkeypatch
+):
+    # Lotes de duas linhas: os itens do pedido 1 chegam em dois lotes
+    monkeypatch.setattr(crud, "LOTE_EXPORTACAO", 2)
+    await fazer_pedido([2])
+    await fazer_pedido([1, 2, 3])
+    await fazer_pedido([3])
+
+    pedidos = [
+        json.loads(linha) for linha in (await exportar(cliente)).splitlines()
+    ]
+    assert [
+        (pedido["id"], [item["item_id"] for item in pedido["itens"]])
+        for pedido in pedidos
+    ] == [(1, [2]), (2, [1, 2, 3]), (3, [3])]
+
+    linhas = (await exportar(cliente, "csv")).splitlines()
+    assert len(linhas) == 6
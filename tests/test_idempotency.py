@@ -0,0 +1,186 @@
+# Imports do sistema
+import asyncio
+import uuid
+from datetime import timedelta
+
+# Imports de terceiros
+import pytest
+from sqlalchemy import func, select, update
+
+# Imports locais
+from core.config import settings
+from core.database import SessionLocal
+from core.exceptions import APIException
+from src.menu import routers
+from src.menu.crud import claim_idempotency_key, purge_idempotency_keys
+from src.menu.idempotency import IdempotencyCache
+from src.menu.models import ChaveIdempotenciaModel, utc_now
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def outro_worker(monkeypatch):
+    """
+    Troca o cache em memória por um vazio, como em outro worker: as
+    repetições passam a depender apenas da tabela chaves_idempotencia.
+    """
+    def trocar():
+        monkeypatch.setattr(
+            routers, "pedidos_idempotentes", IdempotencyCache(10, 60)
+        )
+
+    return trocar
+
+
+async def quantidade_de_pedidos(cliente) -> int:
+    resposta = await cliente.get("/cardapio/obter_pedidos")
+    if resposta.status_code == 404:
+        return 0
+    return len(resposta.json()["data"]["pedidos"])
+
+
+async def expirar(chave: str):
+    async with SessionLocal() as db:
+        await db.execute(
+            update(ChaveIdempotenciaModel)
+            .where(ChaveIdempotenciaModel.chave == chave)
+            .values(
+                criado_em=utc_now()
+                - timedelta(seconds=settings.IDEMPOTENCY_TTL + 1)
+            )
+        )
+        await db.commit()
+
+
+async def test_fazer_pedido_idempotente(cliente, itens, fazer_pedido):
+    chave = str(uuid.uuid4())
+
+    for _ in range(2):
+        resposta = await fazer_pedido([2, 1], chave=chave)
+        assert resposta.status_code == 200
+
+    pedidos = (await cliente.get("/cardapio/obter_pedidos")).json()["data"]
+    assert len(pedidos["pedidos"]) == 1
+
+    # A mesma chave com outro pedido é rejeitada
+    resposta = await fazer_pedido([3], chave=chave)
+    assert resposta.status_code == 422
+
+
+async def test_requisicoes_simultaneas(cliente, itens, fazer_pedido):
+    chave = str(uuid.uuid4())
+
+    respostas = await asyncio.gather(*(
+        fazer_pedido([1, 3], chave=chave) for _ in range(5)
+    ))
+
+    assert [resposta.status_code for resposta in respostas] == [200] * 5
+    assert await quantidade_de_pedidos(cliente) == 1
+
+
+async def test_chave_confirmada_no_banco(
+        cliente, itens, fazer_pedido, outro_worker
+):
+    chave = str(uuid.uuid4())
+    await fazer_pedido([1], chave=chave)
+
+    outro_worker()
+    resposta = await fazer_pedido([1], chave=chave)
+    assert resposta.status_code == 200
+    assert await quantidade_de_pedidos(cliente) == 1
+
+    outro_worker()
+    resposta = await fazer_pedido([1], status="PENDENTE", chave=chave)
+    assert resposta.status_code == 422
+
+
+async def test_pedido_invalido_libera_a_chave(cliente, itens, fazer_pedido):
+    chave = str(uuid.uuid4())
+
+    # A reserva é desfeita com o pedido recusado
+    resposta = await fazer_pedido([1, 99], chave=chave)
+    assert resposta.status_code == 400
+
+    async with SessionLocal() as db:
+        reservadas = await db.scalar(
+            select(func.count()).select_from(ChaveIdempotenciaModel)
+        )
+    assert reservadas == 0
+
+    # A chave pode ser usada com outro conteúdo
+    resposta = await fazer_pedido([1], chave=chave)
+    assert resposta.status_code == 200
+    assert await quantidade_de_pedidos(cliente) == 1
+
+
+async def test_chave_expirada(cliente, itens, fazer_pedido, outro_worker):
+    expirada, valida = str(uuid.uuid4()), str(uuid.uuid4())
+    await fazer_pedido([1], chave=expirada)
+    await fazer_pedido([2], chave=valida)
+
+    await expirar(expirada)
+
+    # A chave expirada é reaproveitada, inclusive com outro conteúdo
+    outro_worker()
+    resposta = await fazer_pedido([3], chave=expirada)
+    assert resposta.status_code == 200
+    assert await quantidade_de_pedidos(cliente) == 3
+
+    await expirar(expirada)
+
+    await purge_idempotency_keys()
+
+    async with SessionLocal() as db:
+        chaves = await db.scalars(select(ChaveIdempotenciaModel.chave))
+        assert list(chaves) == [valida]
+
+
+async def test_cache_em_memoria(monkeypatch):
+    cache = IdempotencyCache(tamanho=2, ttl=60)
+    execucoes = []
+
+    def pedido(pedido_id: int):
+        async def executar():
+            execucoes.append(pedido_id)
+            return "impressao", pedido_id
+
+        return executar
+
+    assert await cache.run("a", "impressao", pedido(1)) == 1
+    assert await cache.run("a", "impressao", pedido(2)) == 1
+    assert execucoes == [1]
+
+    with pytest.raises(APIException):
+        await cache.run("a", "outra", pedido(3))
+
+    # Pedidos recusados (sem ID) não são memorizados
+    assert await cache.run("b", "impressao", pedido(None)) is None
+    assert await cache.run("b", "impressao", pedido(4)) == 4
+
+    # Acima do tamanho, a chave menos usada sai do cache
+    await cache.run("c", "impressao", pedido(5))
+    assert await cache.run("a", "impressao", pedido(6)) == 6
+
+    # E após o TTL
+    monkeypatch.setattr(cache, "ttl", 0)
+    await cache.run("d", "impressao", pedido(7))
+    assert await cache.run("d", "impressao", pedido(8)) == 8
+
+
+@pytest.mark.postgresql
+async def test_reserva_simultanea_no_banco(cliente):
+    chave = str(uuid.uuid4())
+
+    async with SessionLocal() as primeira, SessionLocal() as segunda:
+        assert await claim_idempotency_key(primeira, chave, "a") is None
+
+        # A segunda transação aguarda a primeira e recebe o seu resultado
+        espera = asyncio.create_task(
+            claim_idempotency_key(segunda, chave, "b")
+        )
+        await asyncio.sleep(0.2)
+        assert not espera.done()
+
+        await primeira.commit()
+        assert await asyncio.wait_for(espera, timeout=5) == ("a", None)
@@ -0,0 +1,93 @@
+# Imports de terceiros
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+# Imports locais
+from src.menu.images import CACHE_IMUTAVEL, ImmutableStaticFiles, armazenamento
+
+pytestmark = pytest.mark.anyio
+
+
+def chaves_imagens() -> set[str]:
+    """
+    Imagens originais no armazenamento em memória (sem as variantes).
+    """
+    return {
+        chave for chave in armazenamento.objetos
+        if chave.count(".") == 1
+    }
+
+
+async def chave_do_item(cliente, item_id: int) -> str:
+    item = (await cliente.get(f"/cardapio/obter_item/{item_id}")).json()
+    return armazenamento.key_of(item["data"]["url_imagem"])
+
+
+async def test_deletar_item_imagem_compartilhada(cliente, cadastrar):
+    # Mesmo conteúdo: os dois itens usam o mesmo arquivo
+    await cadastrar("Suco", "Bebidas", cor="orange")
+    await cadastrar("Suco grande", "Bebidas", cor="orange")
+    assert len(chaves_imagens()) == 1
+
+    resposta = await cliente.delete("/cardapio/deletar_item/1")
+    assert resposta.status_code == 200
+    assert len(chaves_imagens()) == 1
+
+    # O último item remove a imagem e as suas variantes
+    resposta = await cliente.delete("/cardapio/deletar_item/2")
+    assert resposta.status_code == 200
+    assert not armazenamento.objetos
+
+    resposta = await cliente.delete("/cardapio/deletar_item/2")
+    assert resposta.status_code == 404
+
+
+async def test_trocar_imagem(cliente, cadastrar, png):
+    await cadastrar("Suco", "Bebidas", cor="orange")
+    await cadastrar("Suco grande", "Bebidas", cor="orange")
+    await cadastrar("Pudim", "Sobremesas", cor="yellow")
+    laranja = await chave_do_item(cliente, 1)
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_item/1",
+        files={"arquivo": ("novo.png", png("blue"), "image/png")},
+    )
+    assert resposta.status_code == 200
+    assert await chave_do_item(cliente, 1) != laranja
+
+    # A imagem antiga ainda é usada pelo item 2
+    assert laranja in chaves_imagens()
+    assert len(chaves_imagens()) == 3
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_item/2",
+        files={"arquivo": ("amarelo.png", png("yellow"), "image/png")},
+    )
+    assert resposta.status_code == 200
+
+    # Sem referências, a imagem antiga é removida; a nova é a mesma do
+    # item 3
+    assert laranja not in chaves_imagens()
+    assert await chave_do_item(cliente, 2) == await chave_do_item(cliente, 3)
+    assert len(chaves_imagens()) == 2
+
+
+async def test_arquivos_imutaveis(tmp_path):
+    sha256 = "0" * 64
+    (tmp_path / f"{sha256}.png").write_bytes(b"imagem")
+    (tmp_path / "logo.png").write_bytes(b"logo")
+
+    app = Starlette(routes=[
+        Mount("/static", ImmutableStaticFiles(directory=tmp_path))
+    ])
+    async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testes"
+    ) as cliente:
+        resposta = await cliente.get(f"/static/{sha256}.png")
+        assert resposta.headers["cache-control"] == CACHE_IMUTAVEL
+
+        # Arquivos que não são nomeados pelo conteúdo podem mudar
+        resposta = await cliente.get("/static/logo.png")
+        assert "cache-control" not in resposta.headers
@@ -0,0 +1,101 @@
+# Imports do sistema
+import io
+import struct
+import zlib
+
+# Imports de terceiros
+import pytest
+from PIL import Image
+
+# Imports locais
+from src.menu.images import FORMATOS, VARIANTES, render_variants
+
+pytestmark = pytest.mark.anyio
+
+
+def png_declarado(largura: int, altura: int) -> bytes:
+    """
+    PNG de 1x1 pixel com outras dimensões declaradas no cabeçalho (IHDR),
+    como em uma decompression bomb.
+    """
+    saida = io.BytesIO()
+    Image.new("RGB", (1, 1)).save(saida, "PNG")
+    conteudo = bytearray(saida.getvalue())
+
+    # Assinatura (8 bytes), tamanho e tipo do bloco IHDR (8 bytes), dados
+    # (largura, altura e mais 5 bytes) e CRC
+    dados = struct.pack(">II", largura, altura) + conteudo[24:29]
+    conteudo[16:29] = dados
+    conteudo[29:33] = struct.pack(">I", zlib.crc32(b"IHDR" + dados))
+
+    return bytes(conteudo)
+
+
+def dimensoes(conteudo: bytes) -> tuple[int, int]:
+    with Image.open(io.BytesIO(conteudo)) as imagem:
+        return imagem.size
+
+
+def test_variantes(png):
+    variantes = render_variants(png(tamanho=(800, 400)))
+
+    assert set(variantes) == set(VARIANTES)
+    for nome, formatos in variantes.items():
+        assert set(formatos) == set(FORMATOS)
+        for conteudo in formatos.values():
+            # Não amplia imagens menores que a variante
+            largura = min(VARIANTES[nome], 800)
+            assert dimensoes(conteudo) == (largura, largura // 2)
+
+
+def test_variantes_com_orientacao_exif():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Girada 90° no sentido horário
+    saida = io.BytesIO()
+    Image.new("RGB", (60, 40), "red").save(saida, "JPEG", exif=exif)
+
+    variantes = render_variants(saida.getvalue())
+
+    for conteudo in variantes["full"].values():
+        assert dimensoes(conteudo) == (40, 60)
+
+
+def test_variantes_de_imagem_gigante():
+    # Acima do dobro de MAX_IMAGE_PIXELS o Pillow levanta
+    # DecompressionBombError ao abrir a imagem
+    assert render_variants(png_declarado(50_000, 50_000)) == {}
+
+
+def test_variantes_acima_do_limite_de_pixels(png, monkeypatch):
+    # Entre MAX_IMAGE_PIXELS e o dobro o Pillow apenas avisa: a imagem é
+    # recusada antes de ser decodificada
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 2000)
+
+    assert render_variants(png(tamanho=(64, 48))) == {}
+
+
+def test_variantes_de_arquivo_invalido():
+    assert render_variants(b"nao e uma imagem") == {}
+
+
+async def test_cadastrar_item_gera_variantes(cliente, cadastrar):
+    await cadastrar("Pudim", "Sobremesas")
+
+    item = (await cliente.get("/cardapio/obter_item/1")).json()["data"]
+    assert set(item["imagens"]) == set(VARIANTES)
+
+
+async def test_cadastrar_item_com_imagem_gigante(cliente):
+    resposta = await cliente.post(
+        "/cardapio/cadastrar_item",
+        params={"nome": "Pudim", "descricao": "Doce", "preco": 12,
+                "categoria": "Sobremesas"},
+        files={"arquivo": (
+            "pudim.png", png_declarado(50_000, 50_000), "image/png"
+        )},
+    )
+    assert resposta.status_code == 200
+
+    # O item fica com a imagem original, sem variantes
+    item = (await cliente.get("/cardapio/obter_item/1")).json()["data"]
+    assert item["imagens"] is None
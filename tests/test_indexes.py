@@ -0,0 +1,55 @@
+# Imports de terceiros
+import pytest
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import IntegrityError
+
+# Imports locais
+from core.database import SessionLocal, engine
+from src.menu.models import PedidoItensModel
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_indices_das_linhas_dos_pedidos(cliente):
+    def indices(conexao):
+        inspetor = inspect(conexao)
+        return (
+            {
+                indice["name"]: indice["column_names"]
+                for indice in inspetor.get_indexes("pedido_itens")
+            },
+            {
+                restricao["name"]: restricao["column_names"]
+                for restricao in inspetor.get_unique_constraints(
+                    "pedido_itens"
+                )
+            },
+        )
+
+    async with engine.connect() as conexao:
+        simples, unicos = await conexao.run_sync(indices)
+
+    assert simples["ix_pedido_itens_item_id"] == ["item_id"]
+    assert unicos["uq_pedido_itens_pedido_item"] == ["pedido_id", "item_id"]
+
+
+async def test_item_unico_por_pedido(cliente, itens, fazer_pedido):
+    await fazer_pedido([1, 1, 2])
+
+    async with SessionLocal() as db:
+        db.add(PedidoItensModel(
+            pedido_id=1, item_id=1, nome="Suco", categoria="bebidas",
+            preco_unitario_centavos=800
+        ))
+        with pytest.raises(IntegrityError):
+            await db.commit()
+
+
+@pytest.mark.postgresql
+async def test_buscas_pelos_indices(cliente, plano):
+    assert "ix_pedido_itens_item_id" in await plano(
+        select(PedidoItensModel.id).where(PedidoItensModel.item_id == 1)
+    )
+    assert "uq_pedido_itens_pedido_item" in await plano(
+        select(PedidoItensModel.id).where(PedidoItensModel.pedido_id == 1)
+    )
@@ -0,0 +1,44 @@
+# Imports de terceiros
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_obter_item(cliente, cadastrar):
+    await cadastrar("Pudim", "Sobremesas", preco=12.5)
+
+    resposta = await cliente.get("/cardapio/obter_item/1")
+    assert resposta.status_code == 200
+    assert resposta.json()["data"]["preco"] == 12.5
+
+    resposta = await cliente.get("/cardapio/obter_item/99")
+    assert resposta.status_code == 404
+
+
+async def test_cadastrar_item_sem_imagem(cliente):
+    resposta = await cliente.post(
+        "/cardapio/cadastrar_item",
+        params={"nome": "Pudim", "descricao": "Doce", "preco": 12,
+                "categoria": "Sobremesas"},
+    )
+    assert resposta.status_code == 400
+
+
+async def test_atualizar_item(cliente, cadastrar):
+    await cadastrar("Suco", "Bebidas", cor="orange")
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_item/1",
+        params={"preco": 9.5, "categoria": "Sucos"},
+    )
+    assert resposta.status_code == 200
+
+    item = (await cliente.get("/cardapio/obter_item/1")).json()["data"]
+    assert (item["nome"], item["preco"], item["categoria"]) == (
+        "Suco", 9.5, "Sucos"
+    )
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_item/99", params={"preco": 1}
+    )
+    assert resposta.status_code == 404
@@ -0,0 +1,75 @@
+# Imports de terceiros
+import pytest
+from sqlalchemy import select
+
+# Imports locais
+from src.menu.models import STATUS_ATIVOS, PedidoModel
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def pedidos(cliente, itens, fazer_pedido):
+    """
+    Pedidos 1 a 6: PRE-PEDIDO, PENDENTE, ENTREGUE, CANCELADO, PRE-PEDIDO
+    e PENDENTE.
+    """
+    for status in ("PRE-PEDIDO", "PENDENTE", "ENTREGUE", "PRE-PEDIDO",
+                   "PRE-PEDIDO", "PENDENTE"):
+        resposta = await fazer_pedido([1], status=status)
+        assert resposta.status_code == 200
+
+    await cliente.put(
+        "/cardapio/atualizar_status_pedido/4", params={"status": "CANCELADO"}
+    )
+
+
+async def fila(cliente, **parametros) -> dict:
+    resposta = await cliente.get("/cardapio/fila_cozinha", params=parametros)
+    assert resposta.status_code == 200
+    return resposta.json()["data"]
+
+
+def ids(pagina: dict) -> list[int]:
+    return [pedido["id"] for pedido in pagina["pedidos"]]
+
+
+async def test_fila_cozinha(cliente, pedidos):
+    # Só os pedidos ativos, na ordem de chegada
+    assert ids(await fila(cliente)) == [1, 2, 5, 6]
+
+    assert ids(await fila(cliente, status="PENDENTE")) == [2, 6]
+
+    resposta = await cliente.get(
+        "/cardapio/fila_cozinha", params={"status": "ENTREGUE"}
+    )
+    assert resposta.status_code == 400
+
+
+async def test_paginas_da_fila(cliente, pedidos):
+    primeira = await fila(cliente, limite=3)
+    assert (ids(primeira), primeira["proximo_cursor"]) == ([1, 2, 5], 5)
+
+    segunda = await fila(cliente, limite=3, cursor=5)
+    assert (ids(segunda), segunda["proximo_cursor"]) == ([6], None)
+
+
+async def test_fila_vazia(cliente, pedidos):
+    for pedido_id in (1, 2, 5, 6):
+        await cliente.put(
+            f"/cardapio/atualizar_status_pedido/{pedido_id}",
+            params={"status": "ENTREGUE"}
+        )
+
+    # Uma fila vazia não é um erro
+    assert await fila(cliente) == {"pedidos": [], "proximo_cursor": None}
+
+
+@pytest.mark.postgresql
+async def test_fila_usa_o_indice_parcial(cliente, pedidos, plano):
+    assert "ix_pedidos_ativos" in await plano(
+        select(PedidoModel.id)
+        .where(PedidoModel.status.in_(STATUS_ATIVOS))
+        .order_by(PedidoModel.id)
+        .limit(101)
+    )
@@ -0,0 +1,82 @@
+# Imports de terceiros
+import pytest
+
+# Imports locais
+from core.database import SessionLocal
+from src.menu.cache import MenuCache, menu_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_leituras_servidas_do_cache(cliente, cadastrar):
+    await cadastrar("Suco", "Bebidas", cor="orange")
+    await cadastrar("Pudim", "Sobremesas", cor="yellow")
+
+    resposta = await cliente.get("/cardapio/obter_cardapio")
+    assert resposta.headers["x-query-count"] == "1"
+
+    # O cardápio, os itens e os filtros saem da mesma cópia em memória
+    for caminho, parametros in (
+            ("/cardapio/obter_cardapio", {}),
+            ("/cardapio/obter_cardapio", {"categoria": "bebidas"}),
+            ("/cardapio/obter_item/2", {}),
+    ):
+        resposta = await cliente.get(caminho, params=parametros)
+        assert resposta.status_code == 200
+        assert resposta.headers["x-query-count"] == "0"
+
+
+async def test_escritas_invalidam_o_cache(cliente, cadastrar):
+    await cadastrar("Suco", "Bebidas", cor="orange")
+    await cadastrar("Pudim", "Sobremesas", cor="yellow")
+    await cliente.get("/cardapio/obter_cardapio")
+
+    await cliente.put("/cardapio/atualizar_item/1", params={"preco": 9.5})
+    item = (await cliente.get("/cardapio/obter_item/1")).json()["data"]
+    assert item["preco"] == 9.5
+
+    await cadastrar("Refrigerante", "Bebidas", cor="black")
+    await cliente.delete("/cardapio/deletar_item/2")
+
+    cardapio = (await cliente.get("/cardapio/obter_cardapio")).json()
+    assert [item["nome"] for item in cardapio["data"]] == [
+        "Suco", "Refrigerante"
+    ]
+
+    resposta = await cliente.get("/cardapio/obter_item/2")
+    assert resposta.status_code == 404
+
+
+async def test_cache_expirado(cliente, cadastrar, monkeypatch):
+    await cadastrar("Pudim", "Sobremesas")
+    await cliente.get("/cardapio/obter_cardapio")
+
+    # Após o TTL o cardápio é recarregado do banco
+    monkeypatch.setattr(menu_cache, "ttl", 0)
+    resposta = await cliente.get("/cardapio/obter_cardapio")
+    assert resposta.headers["x-query-count"] == "1"
+
+
+async def test_carga_invalidada_durante_a_consulta(cliente, cadastrar):
+    await cadastrar("Pudim", "Sobremesas")
+    cache = MenuCache(ttl=60)
+
+    async with SessionLocal() as db:
+        execute = db.execute
+
+        # Uma escrita invalida o cardápio enquanto ele é consultado
+        async def execute_e_invalida(*args, **kwargs):
+            resultado = await execute(*args, **kwargs)
+            cache.invalidate()
+            return resultado
+
+        db.execute = execute_e_invalida
+        snapshot = await cache.get(db)
+        db.execute = execute
+
+        # A carga é usada pela requisição, mas não fica em cache
+        assert [item.nome for item in snapshot.itens] == ["Pudim"]
+        assert cache._snapshot is None
+
+        assert await cache.get(db) is not snapshot
+        assert await cache.get(db) is await cache.get(db)
@@ -0,0 +1,74 @@
+# Imports de terceiros
+import pytest
+
+# Imports locais
+from src.menu.cache import etag_match, menu_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_obter_cardapio(cliente, cadastrar):
+    await cadastrar("Suco de laranja", "Bebidas", cor="orange")
+    await cadastrar("Refrigerante", "Bebidas", cor="black")
+    await cadastrar("Pudim", "Sobremesas", cor="yellow")
+
+    resposta = await cliente.get("/cardapio/obter_cardapio")
+    assert resposta.status_code == 200
+    assert len(resposta.json()["data"]) == 3
+    assert resposta.headers["cache-control"] == "no-cache"
+
+    # Mesma versão do cardápio: 304 sem corpo
+    etag = resposta.headers["etag"]
+    resposta = await cliente.get(
+        "/cardapio/obter_cardapio", headers={"If-None-Match": etag}
+    )
+    assert resposta.status_code == 304
+    assert resposta.content == b""
+    assert resposta.headers["etag"] == etag
+
+    resposta = await cliente.get(
+        "/cardapio/obter_cardapio", params={"categoria": "bebidas"}
+    )
+    assert resposta.headers["etag"] != etag
+
+    resposta = await cliente.get(
+        "/cardapio/obter_cardapio", params={"categoria": "massas"}
+    )
+    assert resposta.status_code == 404
+
+
+async def test_etag_muda_com_o_cardapio(cliente, cadastrar):
+    await cadastrar("Pudim", "Sobremesas")
+    etag = (await cliente.get("/cardapio/obter_cardapio")).headers["etag"]
+
+    await cliente.put("/cardapio/atualizar_item/1", params={"preco": 15})
+
+    resposta = await cliente.get(
+        "/cardapio/obter_cardapio", headers={"If-None-Match": etag}
+    )
+    assert resposta.status_code == 200
+    assert resposta.headers["etag"] != etag
+    assert resposta.json()["data"][0]["preco"] == 15
+
+
+async def test_resposta_serializada_uma_vez(cliente, cadastrar):
+    await cadastrar("Pudim", "Sobremesas")
+
+    primeira = await cliente.get("/cardapio/obter_cardapio")
+    corpo, _ = menu_cache._snapshot.respostas[""]
+
+    segunda = await cliente.get("/cardapio/obter_cardapio")
+    assert menu_cache._snapshot.respostas[""][0] is corpo
+    assert primeira.content == segunda.content == corpo
+
+
+@pytest.mark.parametrize("cabecalho, corresponde", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+])
+def test_if_none_match(cabecalho, corresponde):
+    assert etag_match(cabecalho, '"abc"') is corresponde
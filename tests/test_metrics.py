@@ -0,0 +1,109 @@
+# Imports do sistema
+import os
+
+# Imports de terceiros
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY, CollectorRegistry
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+# Imports locais
+from core.metrics import (ROTA_NAO_MAPEADA, MetricsMiddleware, PoolCollector,
+                          instrument_engine, metrics, sql_operation)
+
+pytestmark = pytest.mark.anyio
+
+
+def amostra(nome: str, **rotulos) -> float:
+    return REGISTRY.get_sample_value(nome, rotulos) or 0
+
+
+@pytest.fixture
+async def cliente_metricas():
+    """
+    Cliente de uma aplicação com o middleware e o endpoint de métricas.
+    """
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics)
+
+    @app.get("/itens/{item_id}")
+    async def obter(item_id: int):
+        return {"id": item_id}
+
+    async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testes"
+    ) as cliente:
+        yield cliente
+
+
+async def test_requisicoes_rotuladas_pela_rota(cliente_metricas):
+    contagem = "http_request_duration_seconds_count"
+    rota = {"method": "GET", "route": "/itens/{item_id}", "status": "200"}
+    nao_mapeada = {"method": "GET", "route": ROTA_NAO_MAPEADA, "status": "404"}
+    antes = amostra(contagem, **rota), amostra(contagem, **nao_mapeada)
+
+    for item_id in (1, 2):
+        await cliente_metricas.get(f"/itens/{item_id}")
+    await cliente_metricas.get("/inexistente")
+
+    # Uma série por modelo de rota, e não por URL
+    assert amostra(contagem, **rota) == antes[0] + 2
+    assert amostra(contagem, **nao_mapeada) == antes[1] + 1
+    assert amostra("http_requests_in_progress", method="GET") == 0
+
+
+def test_consultas_por_operacao():
+    assert sql_operation("  select 1") == "SELECT"
+    assert sql_operation("COPY itens FROM STDIN") == "COPY"
+    assert sql_operation("PRAGMA foreign_keys=ON") == "OUTRA"
+    assert sql_operation("") == "OUTRA"
+
+    motor = create_engine("sqlite://")
+    instrument_engine(motor)
+    antes = (
+        amostra("db_query_duration_seconds_count", operation="SELECT"),
+        amostra("db_query_errors_total", operation="SELECT"),
+    )
+
+    with motor.connect() as conexao:
+        conexao.execute(text("SELECT 1"))
+        with pytest.raises(OperationalError):
+            conexao.execute(text("SELECT * FROM inexistente"))
+
+    assert amostra(
+        "db_query_duration_seconds_count", operation="SELECT"
+    ) == antes[0] + 1
+    assert amostra(
+        "db_query_errors_total", operation="SELECT"
+    ) == antes[1] + 1
+
+
+def test_estado_do_pool():
+    motor = create_engine("sqlite://", poolclass=QueuePool, pool_size=3)
+    registro = CollectorRegistry()
+    registro.register(PoolCollector(motor, {"pid": "1"}))
+
+    with motor.connect():
+        assert registro.get_sample_value(
+            "db_pool_checked_out", {"pid": "1"}
+        ) == 1
+    assert registro.get_sample_value("db_pool_size", {"pid": "1"}) == 3
+    assert registro.get_sample_value("db_pool_overflow", {"pid": "1"}) == 0
+    assert registro.get_sample_value(
+        "db_pool_checkout_wait_seconds_count", {"pid": "1"}
+    ) is not None
+
+
+async def test_metricas_de_varios_workers(
+        cliente_metricas, monkeypatch, tmp_path
+):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    resposta = await cliente_metricas.get("/metrics")
+    assert resposta.status_code == 200
+    # O pool é do worker que atendeu a coleta
+    assert f'db_pool_size{{pid="{os.getpid()}"}}' in resposta.text
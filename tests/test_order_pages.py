@@ -0,0 +1,74 @@
+# Imports de terceiros
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def pedidos(itens, fazer_pedido):
+    """
+    Pedidos 1 a 5, alternando PRE-PEDIDO e ENTREGUE.
+    """
+    for indice in range(5):
+        resposta = await fazer_pedido(
+            [1], status="ENTREGUE" if indice % 2 else "PRE-PEDIDO"
+        )
+        assert resposta.status_code == 200
+
+
+async def pagina(cliente, **parametros) -> dict:
+    resposta = await cliente.get("/cardapio/obter_pedidos", params=parametros)
+    assert resposta.status_code == 200
+    return resposta.json()["data"]
+
+
+def ids(pagina: dict) -> list[int]:
+    return [pedido["id"] for pedido in pagina["pedidos"]]
+
+
+async def test_paginas_de_pedidos(cliente, pedidos):
+    primeira = await pagina(cliente, limite=2)
+    assert (ids(primeira), primeira["proximo_cursor"]) == ([1, 2], 2)
+
+    segunda = await pagina(cliente, limite=2, cursor=2)
+    assert (ids(segunda), segunda["proximo_cursor"]) == ([3, 4], 4)
+
+    ultima = await pagina(cliente, limite=2, cursor=4)
+    assert (ids(ultima), ultima["proximo_cursor"]) == ([5], None)
+
+    resposta = await cliente.get(
+        "/cardapio/obter_pedidos", params={"cursor": 5}
+    )
+    assert resposta.status_code == 404
+
+
+async def test_filtros_de_pedidos(cliente, pedidos):
+    entregues = await pagina(cliente, status="ENTREGUE")
+    assert ids(entregues) == [2, 4]
+    assert {pedido["status"] for pedido in entregues["pedidos"]} == {
+        "ENTREGUE"
+    }
+
+    assert ids(await pagina(cliente, id_inicial=2, id_final=4)) == [2, 3, 4]
+
+    # Filtros e cursor combinados
+    filtrada = await pagina(
+        cliente, status="PRE-PEDIDO", id_inicial=2, limite=1
+    )
+    assert (ids(filtrada), filtrada["proximo_cursor"]) == ([3], 3)
+    assert ids(
+        await pagina(cliente, status="PRE-PEDIDO", id_inicial=2, cursor=3)
+    ) == [5]
+
+    resposta = await cliente.get(
+        "/cardapio/obter_pedidos", params={"status": "CANCELADO"}
+    )
+    assert resposta.status_code == 404
+
+
+async def test_limite_da_pagina(cliente, pedidos):
+    for limite in (0, 501):
+        resposta = await cliente.get(
+            "/cardapio/obter_pedidos", params={"limite": limite}
+        )
+        assert resposta.status_code == 422
@@ -0,0 +1,48 @@
+# Imports de terceiros
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_fazer_pedido(cliente, itens, fazer_pedido):
+    resposta = await fazer_pedido([1, 1, 3])
+    assert resposta.status_code == 200
+
+    resposta = await cliente.get("/cardapio/obter_detalhes_pedido/1")
+    assert resposta.status_code == 200
+    assert resposta.json()["data"] == {
+        "id": 1,
+        "itens": ["Suco", "Pudim"],
+        "quantidade": [2, 1],
+        "precos_unitario": [8.0, 12.0],
+        "subtotais": [16.0, 12.0],
+        "preco_total": 28.0,
+    }
+
+    resposta = await cliente.get("/cardapio/obter_detalhes_pedido/99")
+    assert resposta.status_code == 404
+
+
+async def test_pedido_com_item_inexistente(cliente, itens, fazer_pedido):
+    resposta = await fazer_pedido([1, 99, 3])
+    assert resposta.status_code == 400
+
+    # Nada é gravado: nem o pedido nem as vendas
+    resposta = await cliente.get("/cardapio/obter_pedidos")
+    assert resposta.status_code == 404
+
+    resposta = await cliente.get("/cardapio/vendas_por_categoria")
+    assert resposta.json()["data"] == []
+
+
+async def test_comandos_independem_dos_itens(itens, fazer_pedido):
+    # A validação e a gravação dos itens são feitas em lote: a quantidade
+    # de comandos não cresce com os itens do pedido
+    um_item = await fazer_pedido([1])
+    tres_itens = await fazer_pedido([1, 2, 3, 3])
+
+    assert tres_itens.status_code == 200
+    assert (
+        tres_itens.headers["x-query-count"]
+        == um_item.headers["x-query-count"]
+    )
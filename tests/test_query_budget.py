@@ -0,0 +1,71 @@
+# Imports do sistema
+import logging
+
+# Imports de terceiros
+import pytest
+from fastapi.routing import APIRoute
+
+# Imports locais
+from core.query_budget import (QueryBudgetExceeded, QueryCounter, check_budget,
+                               statement_shape)
+from main import app
+from src.menu import routers
+
+pytestmark = pytest.mark.anyio
+
+
+def test_rotas_declaram_orcamento():
+    sem_orcamento = [
+        rota.path for rota in app.routes
+        if isinstance(rota, APIRoute)
+        and rota.path.startswith("/cardapio")
+        and not hasattr(rota.endpoint, "orcamento_consultas")
+    ]
+    assert sem_orcamento == []
+
+
+async def test_orcamento_excedido(cliente, cadastrar, monkeypatch):
+    await cadastrar("Pudim", "Sobremesas")
+
+    # A primeira leitura do item vai ao banco (1 comando)
+    monkeypatch.setattr(routers.obter_item_id, "orcamento_consultas", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        await cliente.get("/cardapio/obter_item/1")
+
+
+def test_formato_dos_comandos():
+    # Listas de parâmetros de tamanhos diferentes têm o mesmo formato
+    assert statement_shape(
+        "SELECT * FROM itens\n  WHERE id IN (?, ?, ?)"
+    ) == statement_shape("SELECT * FROM itens WHERE id IN (?)")
+    assert statement_shape(
+        "INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)"
+    ) == "INSERT INTO t (a, b) VALUES (?)"
+    assert statement_shape(
+        "SELECT * FROM itens WHERE id = ?"
+    ) != statement_shape("SELECT * FROM pedidos WHERE id = ?")
+
+
+def test_comandos_repetidos(caplog):
+    contador = QueryCounter()
+    for _ in range(3):
+        contador.record("SELECT * FROM itens WHERE id = ?")
+    contador.record("SELECT * FROM pedidos")
+
+    assert contador.total == 4
+    assert contador.repeated() == {"SELECT * FROM itens WHERE id = ?": 3}
+
+    with caplog.at_level(logging.WARNING, logger="core.query_budget"):
+        check_budget({"method": "GET", "path": "/cardapio/x"}, contador)
+    assert "Possível N+1 em GET /cardapio/x" in caplog.text
+
+
+async def test_cabecalho_quantidade_de_comandos(cliente, cadastrar):
+    await cadastrar("Pudim", "Sobremesas")
+
+    resposta = await cliente.get("/cardapio/obter_item/1")
+    assert resposta.headers["x-query-count"] == "1"
+
+    # Item servido pelo cardápio em cache
+    resposta = await cliente.get("/cardapio/obter_item/1")
+    assert resposta.headers["x-query-count"] == "0"
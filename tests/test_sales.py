@@ -0,0 +1,188 @@
+# Imports do sistema
+import asyncio
+from datetime import date, datetime, timezone
+
+# Imports de terceiros
+import pytest
+from sqlalchemy import update
+
+# Imports locais
+from core.config import settings
+from core.database import SessionLocal
+from src.menu import sales
+from src.menu.crud import rebuild_sales, sales_day
+from src.menu.models import PedidoModel
+
+pytestmark = pytest.mark.anyio
+
+
+async def vendas_por_dia(cliente, **periodo) -> dict:
+    resposta = await cliente.get("/cardapio/vendas_diarias", params=periodo)
+    assert resposta.status_code == 200
+    return {
+        venda["dia"]: (venda["quantidade"], venda["receita"])
+        for venda in resposta.json()["data"]
+    }
+
+
+async def test_vendas(cliente, itens, fazer_pedido):
+    await fazer_pedido([1, 1, 3])
+    await fazer_pedido([2])
+    await fazer_pedido([3])
+    # Pedidos cancelados não entram nos resumos
+    await cliente.put(
+        "/cardapio/atualizar_status_pedido/3", params={"status": "CANCELADO"}
+    )
+
+    vendas = (await cliente.get("/cardapio/vendas_diarias")).json()["data"]
+    assert sum(venda["quantidade"] for venda in vendas) == 4
+    assert sum(venda["receita"] for venda in vendas) == 34.0
+
+    resposta = await cliente.get(
+        "/cardapio/itens_mais_vendidos", params={"limite": 2}
+    )
+    assert [
+        (item["nome"], item["quantidade"], item["receita"])
+        for item in resposta.json()["data"]
+    ] == [("Suco", 2, 16.0), ("Pudim", 1, 12.0)]
+
+    resposta = await cliente.get("/cardapio/vendas_por_categoria")
+    assert {
+        categoria["categoria"]: categoria["receita"]
+        for categoria in resposta.json()["data"]
+    } == {"BEBIDAS": 22.0, "SOBREMESAS": 12.0}
+
+
+def test_dia_no_fuso_das_vendas(monkeypatch):
+    criado_em = datetime(2026, 1, 1, 2, 30, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(settings, "SALES_TIMEZONE", None)
+    assert sales_day(criado_em) == date(2026, 1, 1)
+
+    # 23h30 do dia anterior em São Paulo (UTC-3)
+    monkeypatch.setattr(settings, "SALES_TIMEZONE", "America/Sao_Paulo")
+    assert sales_day(criado_em) == date(2025, 12, 31)
+
+    # Datas sem fuso (SQLite) são tratadas como UTC
+    assert sales_day(criado_em.replace(tzinfo=None)) == date(2025, 12, 31)
+
+
+async def test_periodo(cliente, itens, fazer_pedido, monkeypatch):
+    monkeypatch.setattr(settings, "SALES_TIMEZONE", "America/Sao_Paulo")
+    await fazer_pedido([1, 1])
+    await fazer_pedido([3])
+    await fazer_pedido([2])
+
+    # Os pedidos passam a ter sido feitos em dias anteriores e os resumos
+    # são recalculados no fuso das vendas
+    async with SessionLocal() as db:
+        for pedido_id, criado_em in (
+                (1, datetime(2026, 1, 1, 2, 30, tzinfo=timezone.utc)),
+                (2, datetime(2026, 1, 1, 15, 0, tzinfo=timezone.utc)),
+                (3, datetime(2026, 1, 3, 15, 0, tzinfo=timezone.utc)),
+        ):
+            await db.execute(
+                update(PedidoModel)
+                .where(PedidoModel.id == pedido_id)
+                .values(criado_em=criado_em)
+            )
+        await db.commit()
+        await rebuild_sales(db)
+
+    assert await vendas_por_dia(cliente) == {
+        "2025-12-31": (2, 16.0),
+        "2026-01-01": (1, 12.0),
+        "2026-01-03": (1, 6.0),
+    }
+
+    # Os limites do período são inclusivos
+    assert await vendas_por_dia(
+        cliente, inicio="2026-01-01", fim="2026-01-03"
+    ) == {"2026-01-01": (1, 12.0), "2026-01-03": (1, 6.0)}
+    assert await vendas_por_dia(cliente, fim="2025-12-31") == {
+        "2025-12-31": (2, 16.0)
+    }
+    assert await vendas_por_dia(cliente, inicio="2026-01-02") == {
+        "2026-01-03": (1, 6.0)
+    }
+    assert await vendas_por_dia(
+        cliente, inicio="2026-01-02", fim="2026-01-02"
+    ) == {}
+
+    resposta = await cliente.get(
+        "/cardapio/itens_mais_vendidos",
+        params={"inicio": "2026-01-01", "fim": "2026-01-01"},
+    )
+    assert [
+        (item["nome"], item["quantidade"], item["receita"])
+        for item in resposta.json()["data"]
+    ] == [("Pudim", 1, 12.0)]
+
+    resposta = await cliente.get(
+        "/cardapio/vendas_por_categoria", params={"inicio": "2026-01-01"}
+    )
+    assert {
+        venda["categoria"]: (venda["quantidade"], venda["receita"])
+        for venda in resposta.json()["data"]
+    } == {"BEBIDAS": (1, 6.0), "SOBREMESAS": (1, 12.0)}
+
+
+async def test_mudancas_de_status(
+        cliente, itens, fazer_pedido, conferir_resumos
+):
+    await fazer_pedido([1, 3])
+    await fazer_pedido([2])
+
+    # Cancelado sai dos resumos; reaberto volta a ser contado
+    for status, esperado in (
+            ("CANCELADO", {"BEBIDAS": 6.0}),
+            ("PENDENTE", {"BEBIDAS": 14.0, "SOBREMESAS": 12.0}),
+            ("ENTREGUE", {"BEBIDAS": 14.0, "SOBREMESAS": 12.0}),
+    ):
+        await cliente.put(
+            "/cardapio/atualizar_status_pedido/1", params={"status": status}
+        )
+
+        resposta = await cliente.get("/cardapio/vendas_por_categoria")
+        assert {
+            venda["categoria"]: venda["receita"]
+            for venda in resposta.json()["data"]
+        } == esperado
+
+        await conferir_resumos()
+
+
+async def test_pedidos_simultaneos(
+        cliente, itens, fazer_pedido, conferir_resumos
+):
+    # Pedidos concorrentes atualizam as mesmas linhas dos resumos
+    respostas = await asyncio.gather(*(
+        fazer_pedido([1 + indice % 3, 3]) for indice in range(12)
+    ))
+    assert all(resposta.status_code == 200 for resposta in respostas)
+
+    resposta = await cliente.get("/cardapio/vendas_por_categoria")
+    assert {
+        venda["categoria"]: (venda["quantidade"], venda["receita"])
+        for venda in resposta.json()["data"]
+    } == {"BEBIDAS": (8, 56.0), "SOBREMESAS": (16, 192.0)}
+
+    await conferir_resumos()
+
+
+async def test_recalcular_resumos(cliente, itens, fazer_pedido, capsys):
+    await fazer_pedido([1, 3])
+    await fazer_pedido([1])
+
+    await sales.main()
+
+    assert capsys.readouterr().out == (
+        "Resumos de vendas recalculados: 2 registros por dia e item e 2 "
+        "por dia e categoria.\n"
+    )
+
+    resposta = await cliente.get("/cardapio/itens_mais_vendidos")
+    assert [
+        (item["nome"], item["quantidade"])
+        for item in resposta.json()["data"]
+    ] == [("Suco", 2), ("Pudim", 1)]
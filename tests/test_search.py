@@ -0,0 +1,83 @@
+# Imports de terceiros
+import pytest
+from sqlalchemy import func, literal_column, select
+
+# Imports locais
+from src.menu.models import CONFIG_BUSCA, ItemModel
+from src.menu.search import InvertedIndex, tokenize
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def pratos(cadastrar):
+    await cadastrar(
+        "Frango grelhado", "Pratos", descricao="Peito de frango", cor="red"
+    )
+    await cadastrar(
+        "Salada", "Pratos", descricao="Alface com frango", cor="green"
+    )
+    await cadastrar(
+        "Pão de queijo", "Lanches", descricao="Assado", cor="white"
+    )
+
+
+async def buscar(cliente, texto: str, **parametros):
+    resposta = await cliente.get(
+        "/cardapio/buscar", params={"texto": texto, **parametros}
+    )
+    if resposta.status_code == 404:
+        return None
+
+    assert resposta.status_code == 200
+    assert int(resposta.headers["x-query-count"]) <= 1
+    return [item["nome"] for item in resposta.json()["data"]]
+
+
+async def test_buscar(cliente, pratos):
+    # No SQLite a busca usa o índice invertido em memória do cardápio e no
+    # PostgreSQL a coluna tsvector; o resultado é o mesmo
+
+    # O nome pesa mais que a descrição
+    assert await buscar(cliente, "frango") == ["Frango grelhado", "Salada"]
+
+    # Sem acentos e com todos os termos
+    assert await buscar(cliente, "pao queijo") == ["Pão de queijo"]
+    assert await buscar(cliente, "frango queijo") is None
+
+    assert await buscar(cliente, "frango", categoria="pratos") == [
+        "Frango grelhado", "Salada"
+    ]
+    assert await buscar(cliente, "frango", categoria="lanches") is None
+
+
+async def test_paginas_da_busca(cliente, pratos):
+    assert await buscar(cliente, "frango", limite=1) == ["Frango grelhado"]
+    assert await buscar(cliente, "frango", limite=1, pagina=2) == ["Salada"]
+    assert await buscar(cliente, "frango", limite=1, pagina=3) is None
+
+    resposta = await cliente.get("/cardapio/buscar", params={"texto": ""})
+    assert resposta.status_code == 422
+
+
+def test_indice_invertido():
+    assert tokenize("Pão-de-Queijo, ÁGUA") == ["pao", "de", "queijo", "agua"]
+
+    indice = InvertedIndex([])
+    assert indice.search("frango") == []
+    assert indice.search("!!!") == []
+
+
+@pytest.mark.postgresql
+async def test_busca_textual_no_postgresql(cliente, pratos, plano):
+    # Radicais do português: o plural encontra o singular
+    assert await buscar(cliente, "frangos grelhados") == ["Frango grelhado"]
+
+    consulta = func.websearch_to_tsquery(
+        literal_column(f"'{CONFIG_BUSCA}'::regconfig"), "frango"
+    )
+    assert "ix_itens_busca" in await plano(
+        select(ItemModel.id).where(
+            literal_column("itens.busca").op("@@")(consulta)
+        )
+    )
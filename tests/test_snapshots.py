@@ -0,0 +1,102 @@
+# Imports de terceiros
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def pedido(cliente, cadastrar):
+    """
+    Pedido 1 com o item 1 (Suco, 8,00) e o item 2 (Pudim, 12,00).
+    """
+    await cadastrar("Suco", "Bebidas", preco=8, cor="orange")
+    await cadastrar("Pudim", "Sobremesas", preco=12, cor="yellow")
+
+    resposta = await cliente.post(
+        "/cardapio/fazer_pedido",
+        params={"status": "PRE-PEDIDO"},
+        json={"itens": [1, 2]},
+    )
+    assert resposta.status_code == 200
+
+
+async def detalhes(cliente, pedido_id: int = 1) -> dict:
+    resposta = await cliente.get(
+        f"/cardapio/obter_detalhes_pedido/{pedido_id}"
+    )
+    assert resposta.status_code == 200
+    return resposta.json()["data"]
+
+
+async def test_preco_registrado_no_pedido(cliente, pedido):
+    resposta = await cliente.put(
+        "/cardapio/atualizar_item/1", params={"preco": 9.5}
+    )
+    assert resposta.status_code == 200
+
+    # O pedido mantém o preço do momento em que foi feito
+    pedido = await detalhes(cliente)
+    assert pedido["precos_unitario"] == [8.0, 12.0]
+    assert pedido["preco_total"] == 20.0
+
+
+async def test_item_removido_permanece_no_pedido(cliente, pedido):
+    resposta = await cliente.delete("/cardapio/deletar_item/2")
+    assert resposta.status_code == 200
+
+    pedido = await detalhes(cliente)
+    assert pedido["itens"] == ["Suco", "Pudim"]
+    assert pedido["precos_unitario"] == [8.0, 12.0]
+    assert pedido["preco_total"] == 20.0
+
+    # Os relatórios continuam de acordo com o pedido
+    vendas = (
+        await cliente.get("/cardapio/vendas_por_categoria")
+    ).json()["data"]
+    assert {venda["categoria"]: venda["receita"] for venda in vendas} == {
+        "BEBIDAS": 8.0, "SOBREMESAS": 12.0
+    }
+
+    linhas = (
+        await cliente.get("/cardapio/exportar_pedidos")
+    ).json()["itens"]
+    assert [(linha["item_id"], linha["nome"]) for linha in linhas] == [
+        (1, "Suco"), (None, "Pudim")
+    ]
+
+
+async def test_atualizar_pedido_com_item_removido(cliente, pedido):
+    await cliente.delete("/cardapio/deletar_item/2")
+
+    # A linha do item removido sai do pedido e das vendas da categoria
+    resposta = await cliente.put(
+        "/cardapio/atualizar_pedido/1", json={"itens": [1, 1]}
+    )
+    assert resposta.status_code == 200
+
+    pedido = await detalhes(cliente)
+    assert (pedido["itens"], pedido["preco_total"]) == (["Suco"], 16.0)
+
+    vendas = (
+        await cliente.get("/cardapio/vendas_por_categoria")
+    ).json()["data"]
+    assert [(venda["categoria"], venda["receita"]) for venda in vendas] == [
+        ("BEBIDAS", 16.0)
+    ]
+
+
+async def test_cancelar_pedido_com_item_removido(cliente, pedido):
+    await cliente.delete("/cardapio/deletar_item/2")
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_status_pedido/1", params={"status": "CANCELADO"}
+    )
+    assert resposta.status_code == 200
+
+    vendas = (
+        await cliente.get("/cardapio/vendas_por_categoria")
+    ).json()["data"]
+    assert vendas == []
+
+    resposta = await cliente.delete("/cardapio/deletar_pedido/1")
+    assert resposta.status_code == 200
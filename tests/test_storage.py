@@ -0,0 +1,161 @@
+# Imports do sistema
+import hashlib
+import os
+import stat
+import time
+
+# Imports de terceiros
+import pytest
+
+# Imports locais
+from core.config import Settings, settings
+from src.menu.images import armazenamento, create_storage
+from src.menu.storage import LocalStorage, sign_upload, verify_upload
+
+pytestmark = pytest.mark.anyio
+
+SHA256 = "0" * 64
+CHAVE = f"images/{SHA256}.png"
+
+
+def test_assinatura_valida_em_outro_worker(monkeypatch):
+    # Cada worker carrega as próprias configurações do ambiente
+    monkeypatch.setenv("STORAGE_SECRET", "segredo-compartilhado")
+    primeiro, segundo = Settings(), Settings()
+    expira = int(time.time()) + 60
+
+    assinatura = sign_upload(
+        CHAVE, SHA256, 10, expira, primeiro.STORAGE_SECRET
+    )
+    assert verify_upload(
+        CHAVE, SHA256, 10, expira, assinatura, segundo.STORAGE_SECRET
+    )
+    assert not verify_upload(
+        CHAVE, SHA256, 11, expira, assinatura, segundo.STORAGE_SECRET
+    )
+    assert not verify_upload(
+        CHAVE, SHA256, 10, expira, assinatura, "outro-segredo"
+    )
+
+
+def test_assinatura_expirada():
+    expira = int(time.time()) - 1
+    assinatura = sign_upload(CHAVE, SHA256, 10, expira)
+
+    assert not verify_upload(CHAVE, SHA256, 10, expira, assinatura)
+
+
+def test_segredo_sem_padrao(monkeypatch):
+    monkeypatch.delenv("STORAGE_SECRET", raising=False)
+
+    assert Settings().STORAGE_SECRET is None
+
+
+@pytest.mark.parametrize("backend", ["local", "memory"])
+def test_segredo_obrigatorio(monkeypatch, backend):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", backend)
+    monkeypatch.setattr(settings, "STORAGE_SECRET", None)
+
+    with pytest.raises(RuntimeError, match="STORAGE_SECRET"):
+        create_storage()
+
+    # Sem envios diretos a chave não é usada
+    monkeypatch.setattr(settings, "DIRECT_UPLOADS", False)
+    assert create_storage() is not None
+
+
+async def test_envio_direto_de_imagem(cliente, png):
+    conteudo = png("purple")
+    sha256 = hashlib.sha256(conteudo).hexdigest()
+
+    resposta = await cliente.post(
+        "/cardapio/imagens/url_envio",
+        params={"nome_arquivo": "foto.png", "sha256": sha256,
+                "tamanho": len(conteudo), "content_type": "image/png"},
+    )
+    assert resposta.status_code == 200
+    envio = resposta.json()["data"]
+    assert not envio["existente"]
+
+    # Conteúdo diferente do assinado
+    resposta = await cliente.put(
+        envio["url"], content=conteudo[:-1] + b"x",
+        headers=envio["cabecalhos"]
+    )
+    assert resposta.status_code == 400
+
+    # Assinatura adulterada
+    resposta = await cliente.put(
+        envio["url"].replace("tamanho=", "tamanho=1"), content=conteudo,
+        headers=envio["cabecalhos"]
+    )
+    assert resposta.status_code == 403
+
+    resposta = await cliente.put(
+        envio["url"], content=conteudo, headers=envio["cabecalhos"]
+    )
+    assert resposta.status_code == 200
+    assert armazenamento.objetos[envio["chave"]] == conteudo
+
+    # A imagem já armazenada dispensa o envio
+    resposta = await cliente.post(
+        "/cardapio/imagens/url_envio",
+        params={"nome_arquivo": "foto.png", "sha256": sha256,
+                "tamanho": len(conteudo)},
+    )
+    assert resposta.json()["data"]["existente"]
+
+    resposta = await cliente.post(
+        "/cardapio/cadastrar_item",
+        params={"nome": "Pudim", "descricao": "Doce", "preco": 12,
+                "categoria": "Sobremesas", "chave_imagem": envio["chave"]},
+    )
+    assert resposta.status_code == 200
+
+
+async def test_envio_direto_desativado(cliente, monkeypatch):
+    monkeypatch.setattr(settings, "DIRECT_UPLOADS", False)
+
+    resposta = await cliente.post(
+        "/cardapio/imagens/url_envio",
+        params={"nome_arquivo": "foto.png", "sha256": SHA256,
+                "tamanho": 10},
+    )
+    assert resposta.status_code == 404
+
+
+async def test_armazenamento_local(tmp_path):
+    armazenamento_local = LocalStorage(tmp_path / "static")
+
+    # O arquivo temporário fica no diretório do destino
+    descritor, temporario = armazenamento_local.staging_file("images/")
+    with os.fdopen(descritor, "wb") as arquivo:
+        arquivo.write(b"imagem")
+    assert temporario.parent == tmp_path / "static" / "images"
+
+    await armazenamento_local.put(CHAVE, temporario)
+
+    # Origem em outro diretório
+    origem = tmp_path / "enviado.png"
+    origem.write_bytes(b"outra imagem")
+    await armazenamento_local.put("images/outra.png", origem)
+    assert not origem.exists()
+
+    await armazenamento_local.put_bytes("images/bytes.png", b"bytes")
+
+    diretorio = tmp_path / "static" / "images"
+    assert sorted(caminho.name for caminho in diretorio.iterdir()) == [
+        f"{SHA256}.png", "bytes.png", "outra.png"
+    ]
+    for caminho in diretorio.iterdir():
+        assert stat.S_IMODE(caminho.stat().st_mode) == 0o644
+
+    assert await armazenamento_local.read(CHAVE) == b"imagem"
+    assert await armazenamento_local.size("images/nenhuma.png") is None
+
+    referencia = armazenamento_local.locate(CHAVE)
+    assert armazenamento_local.key_of(referencia) == CHAVE
+    assert armazenamento_local.key_of(f"/static/{CHAVE}") == CHAVE
+
+    with pytest.raises(ValueError):
+        await armazenamento_local.read("../fora.png")
@@ -0,0 +1,161 @@
+# Imports de terceiros
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def detalhes(cliente, pedido_id: int = 1) -> dict:
+    resposta = await cliente.get(
+        f"/cardapio/obter_detalhes_pedido/{pedido_id}"
+    )
+    assert resposta.status_code == 200
+    return resposta.json()["data"]
+
+
+async def test_atualizar_e_deletar_pedido(cliente, itens, fazer_pedido):
+    await fazer_pedido([1, 2])
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_status_pedido/1", params={"status": "PENDENTE"}
+    )
+    assert resposta.status_code == 200
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_pedido/1", json={"itens": [3, 3]}
+    )
+    assert resposta.status_code == 200
+
+    pedido = await detalhes(cliente)
+    assert (pedido["itens"], pedido["preco_total"]) == (["Pudim"], 24.0)
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_pedido/99", json={"itens": [1]}
+    )
+    assert resposta.status_code == 404
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_status_pedido/99", params={"status": "PENDENTE"}
+    )
+    assert resposta.status_code == 404
+
+    # Só pedidos entregues ou cancelados podem ser deletados
+    resposta = await cliente.delete("/cardapio/deletar_pedido/1")
+    assert resposta.status_code == 404
+
+    await cliente.put(
+        "/cardapio/atualizar_status_pedido/1", params={"status": "ENTREGUE"}
+    )
+    resposta = await cliente.delete("/cardapio/deletar_pedido/1")
+    assert resposta.status_code == 200
+
+    resposta = await cliente.delete("/cardapio/deletar_pedido/1")
+    assert resposta.status_code == 404
+
+
+async def test_diferenca_dos_itens(cliente, itens, fazer_pedido):
+    await fazer_pedido([1, 1, 2])
+    await cliente.put("/cardapio/atualizar_item/1", params={"preco": 9})
+
+    # Suco diminui, Refrigerante sai, Pudim entra e itens inexistentes são
+    # ignorados
+    resposta = await cliente.put(
+        "/cardapio/atualizar_pedido/1", json={"itens": [3, 1, 99, 3]}
+    )
+    assert resposta.status_code == 200
+
+    # A linha que já estava no pedido mantém o preço registrado; a nova
+    # usa o preço atual
+    pedido = await detalhes(cliente)
+    assert pedido == {
+        "id": 1,
+        "itens": ["Suco", "Pudim"],
+        "quantidade": [1, 2],
+        "precos_unitario": [8.0, 12.0],
+        "subtotais": [8.0, 24.0],
+        "preco_total": 32.0,
+    }
+
+
+async def test_variacoes_nos_resumos_de_vendas(
+        cliente, itens, fazer_pedido, conferir_resumos
+):
+    await fazer_pedido([1, 1, 2])
+    await fazer_pedido([2, 3])
+
+    await cliente.put(
+        "/cardapio/atualizar_pedido/1", json={"itens": [1, 3, 3]}
+    )
+
+    resposta = await cliente.get("/cardapio/itens_mais_vendidos")
+    assert [
+        (item["nome"], item["quantidade"], item["receita"])
+        for item in resposta.json()["data"]
+    ] == [("Pudim", 3, 36.0), ("Suco", 1, 8.0), ("Refrigerante", 1, 6.0)]
+
+    resposta = await cliente.get("/cardapio/vendas_por_categoria")
+    assert {
+        venda["categoria"]: (venda["quantidade"], venda["receita"])
+        for venda in resposta.json()["data"]
+    } == {"BEBIDAS": (2, 14.0), "SOBREMESAS": (3, 36.0)}
+
+    await conferir_resumos()
+
+
+async def test_pedido_esvaziado(
+        cliente, itens, fazer_pedido, conferir_resumos
+):
+    await fazer_pedido([1, 3])
+    await fazer_pedido([2])
+
+    # Sem itens o pedido é removido e sai dos resumos
+    resposta = await cliente.put(
+        "/cardapio/atualizar_pedido/1", json={"itens": []}
+    )
+    assert resposta.status_code == 200
+
+    resposta = await cliente.get("/cardapio/obter_detalhes_pedido/1")
+    assert resposta.status_code == 404
+
+    resposta = await cliente.get("/cardapio/vendas_por_categoria")
+    assert [
+        (venda["categoria"], venda["receita"])
+        for venda in resposta.json()["data"]
+    ] == [("BEBIDAS", 6.0)]
+
+    await conferir_resumos()
+
+
+async def test_pedido_cancelado_fora_dos_resumos(
+        cliente, itens, fazer_pedido, conferir_resumos
+):
+    await fazer_pedido([1])
+    await cliente.put(
+        "/cardapio/atualizar_status_pedido/1", params={"status": "CANCELADO"}
+    )
+
+    resposta = await cliente.put(
+        "/cardapio/atualizar_pedido/1", json={"itens": [3, 3]}
+    )
+    assert resposta.status_code == 200
+
+    resposta = await cliente.get("/cardapio/vendas_por_categoria")
+    assert resposta.json()["data"] == []
+
+    await conferir_resumos()
+
+
+async def test_comandos_independem_dos_itens(cliente, itens, fazer_pedido):
+    await fazer_pedido([1])
+    await fazer_pedido([1])
+
+    um_item = await cliente.put(
+        "/cardapio/atualizar_pedido/1", json={"itens": [2]}
+    )
+    tres_itens = await cliente.put(
+        "/cardapio/atualizar_pedido/2", json={"itens": [1, 2, 3, 3]}
+    )
+
+    assert (
+        tres_itens.headers["x-query-count"]
+        == um_item.headers["x-query-count"]
+    )
@@ -0,0 +1,139 @@
+# Imports do sistema
+import hashlib
+import io
+
+# Imports de terceiros
+import pytest
+
+# Imports locais
+from core.body_limit import MARGEM_MULTIPART
+from core.config import settings
+from src.menu.images import TAMANHO_PEDACO, buffer_limited
+from src.menu.storage import LocalStorage
+
+pytestmark = pytest.mark.anyio
+
+LIMITE = 1024
+PEDACO = 64 * 1024
+ITEM = {"nome": "Pudim", "descricao": "Doce", "preco": 12,
+        "categoria": "Sobremesas"}
+
+
+@pytest.fixture(autouse=True)
+def limite(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", LIMITE)
+    monkeypatch.setattr(settings, "IMPORT_MAX_SIZE", LIMITE)
+
+
+async def test_content_length_acima_do_limite(cliente):
+    resposta = await cliente.post(
+        "/cardapio/cadastrar_item", params=ITEM,
+        files={"arquivo": ("pudim.png", b"0" * PEDACO * 2, "image/png")},
+    )
+    assert resposta.status_code == 413
+    assert resposta.json()["description"] == (
+        f"O corpo da requisição excede o tamanho máximo de "
+        f"{LIMITE + MARGEM_MULTIPART} bytes."
+    )
+
+    resposta = await cliente.get("/cardapio/obter_item/1")
+    assert resposta.status_code == 404
+
+
+async def test_corpo_sem_content_length(cliente):
+    enviados = 0
+
+    async def corpo():
+        nonlocal enviados
+        yield (
+            b"--limite\r\nContent-Disposition: form-data; name=\"arquivo\"; "
+            b"filename=\"pudim.png\"\r\nContent-Type: image/png\r\n\r\n"
+        )
+        for _ in range(100):
+            enviados += 1
+            yield b"0" * PEDACO
+        yield b"\r\n--limite--\r\n"
+
+    resposta = await cliente.post(
+        "/cardapio/cadastrar_item", params=ITEM, content=corpo(),
+        headers={"Content-Type": "multipart/form-data; boundary=limite"},
+    )
+    assert resposta.status_code == 413
+
+    # A leitura é interrompida logo após o limite
+    assert enviados == 2
+
+
+async def test_content_length_menor_que_o_corpo(cliente):
+    resposta = await cliente.put(
+        "/cardapio/atualizar_item/1",
+        files={"arquivo": ("pudim.png", b"0" * PEDACO * 2, "image/png")},
+        headers={"Content-Length": "10"},
+    )
+    assert resposta.status_code == 413
+
+
+async def test_importacao_acima_do_limite(cliente):
+    linhas = "nome,descricao,preco,categoria,imagem\n" + (
+        "Pudim,Doce,12,Sobremesas,pudim.png\n" * 3000
+    )
+
+    resposta = await cliente.post(
+        "/cardapio/importar_itens",
+        files={"arquivo": ("itens.csv", linhas, "text/csv")},
+    )
+    assert resposta.status_code == 413
+
+
+async def test_corpo_dentro_do_limite(cliente, png):
+    # O limite das imagens continua verificado durante a cópia
+    resposta = await cliente.post(
+        "/cardapio/cadastrar_item", params=ITEM,
+        files={"arquivo": ("pudim.png", b"0" * (LIMITE + 1), "image/png")},
+    )
+    assert resposta.status_code == 413
+    assert resposta.json()["message"] == "Imagem muito grande."
+
+    resposta = await cliente.post(
+        "/cardapio/cadastrar_item", params=ITEM,
+        files={"arquivo": ("pudim.png", png(tamanho=(8, 8)), "image/png")},
+    )
+    assert resposta.status_code == 200
+
+
+class Origem(io.BytesIO):
+    """
+    Arquivo que registra o tamanho de cada leitura.
+    """
+    def __init__(self, conteudo: bytes):
+        super().__init__(conteudo)
+        self.leituras: list[int] = []
+
+    def read(self, tamanho: int = -1) -> bytes:
+        self.leituras.append(tamanho)
+        return super().read(tamanho)
+
+
+def test_copia_em_pedacos(tmp_path):
+    destino = LocalStorage(tmp_path)
+    conteudo = b"0123456789" * (TAMANHO_PEDACO // 4)
+    origem = Origem(conteudo)
+
+    temporario, sha256 = buffer_limited(origem, len(conteudo), destino)
+
+    # Lido em pedaços de tamanho fixo, nunca por inteiro
+    assert set(origem.leituras) == {TAMANHO_PEDACO}
+    assert temporario.read_bytes() == conteudo
+    assert sha256 == hashlib.sha256(conteudo).hexdigest()
+
+
+def test_copia_acima_do_limite(tmp_path):
+    destino = LocalStorage(tmp_path)
+    origem = Origem(b"0" * (TAMANHO_PEDACO * 3))
+
+    assert buffer_limited(origem, TAMANHO_PEDACO, destino) is None
+
+    # A cópia para no primeiro pedaço acima do limite e o temporário é
+    # removido
+    assert len(origem.leituras) == 2
+    assert not list(tmp_path.rglob(".upload-*"))